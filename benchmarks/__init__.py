@@ -0,0 +1 @@
+"""OC-Serve benchmarks."""
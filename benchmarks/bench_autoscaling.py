@@ -0,0 +1,321 @@
+"""Benchmark: replay a request trace against Ray's default autoscaling policy and `EngineLoadPolicy`.
+
+No cluster or GPU is involved: a simple continuous-batching engine model
+(KV-cache capacity, prefill throughput, batch-dependent decode step) runs
+in each simulated replica, requests are routed to the replica with the
+fewest ongoing requests, and every `--control-interval` seconds the policy
+under test is called with an `AutoscalingContext` built from the replicas'
+signals averaged over `--look-back`. Ray's own scaling factors and delay
+logic are applied to the policies' decisions, and new replicas only take
+traffic after `--startup` seconds.
+
+The trace is a JSONL file of `{"t": seconds, "prompt_tokens": n,
+"output_tokens": n}` lines or, by default, a synthetic one: short chats
+ramping up to a peak, then a phase of long (RAG-style) prompts with few
+concurrent requests but heavy prefill and KV-cache use.
+
+Usage:
+    python -m benchmarks.bench_autoscaling --duration 1800 --ttft-slo 2
+    python -m benchmarks.bench_autoscaling --trace traffic.jsonl --target-ongoing-requests 16
+"""
+import argparse
+import json
+import math
+import random
+from collections import deque
+from typing import Dict, List, Optional
+
+from ray.serve._private.common import DeploymentID
+from ray.serve.autoscaling_policy import (
+    _apply_delay_logic,
+    _apply_scaling_factors,
+    replica_queue_length_autoscaling_policy,
+)
+from ray.serve.config import AutoscalingConfig, AutoscalingContext
+
+from oc_serve.orchestrators.ray.autoscaling import DEFAULT_TARGETS, EngineLoadPolicy
+
+
+def synthetic_trace(duration: float, base_rps: float, peak_rps: float, long_rps: float,
+                    seed: int = 0) -> List[dict]:
+    """Poisson arrivals: base load, ramp to peak, long-prompt phase, back to base."""
+    rng = random.Random(seed)
+    trace, t = [], 0.0
+    while True:
+        phase = t / duration
+        if phase < 0.2 or phase >= 0.75:
+            rate, long_prompts = base_rps, False
+        elif phase < 0.45:
+            rate, long_prompts = base_rps + (peak_rps - base_rps) * (phase - 0.2) / 0.25, False
+        elif phase < 0.55:
+            rate, long_prompts = peak_rps, False
+        else:
+            rate, long_prompts = long_rps, True
+        t += rng.expovariate(rate)
+        if t >= duration:
+            return trace
+        if long_prompts:
+            prompt, output = int(rng.lognormvariate(math.log(6000), 0.3)), int(rng.uniform(50, 200))
+        else:
+            prompt, output = int(rng.lognormvariate(math.log(400), 0.6)), int(rng.uniform(50, 400))
+        trace.append({"t": t, "prompt_tokens": max(prompt, 1), "output_tokens": max(output, 1)})
+
+
+def load_trace(path: str) -> List[dict]:
+    with open(path, encoding="utf-8") as f:
+        trace = [json.loads(line) for line in f if line.strip()]
+    trace.sort(key=lambda entry: entry["t"])
+    start = trace[0]["t"] if trace else 0.0
+    for entry in trace:
+        entry["t"] -= start
+    return trace
+
+
+class SimRequest:
+    __slots__ = ("arrival", "enqueued", "prompt", "output", "prefilled", "decoded", "first_token")
+
+    def __init__(self, entry: dict, now: float):
+        self.arrival = entry["t"]
+        self.enqueued = now
+        self.prompt = entry["prompt_tokens"]
+        self.output = entry["output_tokens"]
+        self.prefilled = 0
+        self.decoded = 0.0
+        self.first_token: Optional[float] = None
+
+
+class SimReplica:
+    """Continuous-batching engine: FIFO admission on KV-cache room, chunked prefill, batched decode."""
+
+    def __init__(self, name: str, ready_at: float, args):
+        self.name = name
+        self.ready_at = ready_at
+        self.draining = False
+        self.args = args
+        self.waiting: deque = deque()
+        self.running: List[SimRequest] = []
+        self.kv_used = 0.0
+
+    @property
+    def ongoing(self) -> int:
+        return len(self.waiting) + len(self.running)
+
+    def step(self, now: float, dt: float, ttfts: List[float]) -> None:
+        args = self.args
+        while (self.waiting and len(self.running) < args.max_num_seqs
+               and self.kv_used + self.waiting[0].prompt <= args.kv_tokens):
+            request = self.waiting.popleft()
+            self.kv_used += request.prompt
+            self.running.append(request)
+
+        budget = args.prefill_tps * dt
+        decoding = []
+        for request in self.running:
+            if request.prefilled < request.prompt:
+                chunk = min(budget, request.prompt - request.prefilled)
+                request.prefilled += chunk
+                budget -= chunk
+                if request.prefilled >= request.prompt and request.first_token is None:
+                    request.first_token = now
+                    ttfts.append(now - request.arrival)
+            else:
+                decoding.append(request)
+
+        if decoding:
+            tokens = dt / (args.decode_step_s + args.decode_step_per_seq_s * len(decoding))
+            while len(decoding) > 1 and self.kv_used + tokens * len(decoding) > args.kv_tokens:
+                # Out of KV cache: preempt the newest sequence, to be recomputed from scratch.
+                request = decoding.pop()
+                self.running.remove(request)
+                self.kv_used -= request.prompt + request.decoded
+                request.prefilled, request.decoded = 0, 0.0
+                self.waiting.appendleft(request)
+            for request in decoding:
+                request.decoded += tokens
+            self.kv_used += tokens * len(decoding)
+
+        finished = [request for request in self.running
+                    if request.first_token is not None and request.decoded >= request.output]
+        if finished:
+            for request in finished:
+                self.kv_used -= request.prompt + request.decoded
+            self.running = [request for request in self.running if request not in finished]
+
+    def signals(self, now: float) -> Dict[str, float]:
+        queued = sum(request.prompt - request.prefilled for request in self.running
+                     if request.prefilled < request.prompt)
+        queued += sum(request.prompt for request in self.waiting)
+        return {
+            "kv_cache_utilization": min(self.kv_used / self.args.kv_tokens, 1.0),
+            "waiting_requests": float(len(self.waiting)),
+            "queued_prompt_tokens": float(queued),
+            "admission_waiting": float(len(self.waiting)),
+            "admission_wait_s": now - self.waiting[0].enqueued if self.waiting else 0.0,
+        }
+
+
+def simulate(policy, trace: List[dict], config: AutoscalingConfig, args) -> dict:
+    """Replay `trace` with `policy` deciding the number of replicas."""
+    deployment_id = DeploymentID(name="OCServe")
+    replicas = [SimReplica(f"r{i}", 0.0, args) for i in range(config.min_replicas)]
+    replica_ids = iter(range(config.min_replicas, 1 << 30))
+    history: Dict[str, deque] = {}
+    requests_history: deque = deque()
+    router_queue: deque = deque()
+    policy_state: Dict = {}
+    target = config.min_replicas
+    ttfts: List[float] = []
+    replica_seconds = 0.0
+    peak_replicas = target
+    scale_events = 0
+    timeline = []
+
+    dt, now, index = args.dt, 0.0, 0
+    next_record = next_decision = 0.0
+    end = (trace[-1]["t"] if trace else 0.0) + args.drain
+    while now < end:
+        while index < len(trace) and trace[index]["t"] <= now:
+            router_queue.append(SimRequest(trace[index], now))
+            index += 1
+        ready = [replica for replica in replicas if replica.ready_at <= now and not replica.draining]
+        while router_queue and ready:
+            replica = min(ready, key=lambda replica: replica.ongoing)
+            if replica.ongoing >= args.max_ongoing_requests:
+                break
+            request = router_queue.popleft()
+            request.enqueued = now
+            replica.waiting.append(request)
+
+        for replica in replicas:
+            if replica.ready_at <= now:
+                replica.step(now, dt, ttfts)
+        replica_seconds += len(replicas) * dt
+        replicas = [replica for replica in replicas if not (replica.draining and not replica.ongoing)]
+
+        if now >= next_record:
+            next_record += args.record_interval
+            for replica in ready:
+                history.setdefault(replica.name, deque()).append((now, replica.signals(now)))
+            requests_history.append((now, sum(replica.ongoing for replica in ready) + len(router_queue)))
+            for samples in [*history.values(), requests_history]:
+                while samples and samples[0][0] < now - config.look_back_period_s:
+                    samples.popleft()
+
+        if now >= next_decision:
+            next_decision += args.control_interval
+            running = [replica.name for replica in ready if history.get(replica.name)]
+            aggregated = {}
+            for name in running:
+                samples = history[name]
+                for signal in samples[0][1]:
+                    aggregated.setdefault(signal, {})[name] = (
+                        sum(sample[signal] for _, sample in samples) / len(samples))
+            total_requests = (sum(value for _, value in requests_history) / len(requests_history)
+                              if requests_history else 0.0)
+            ctx = AutoscalingContext(
+                deployment_id=deployment_id, deployment_name=deployment_id.name, app_name=None,
+                current_num_replicas=len(ready), target_num_replicas=target,
+                running_replicas=running, total_num_requests=total_requests,
+                total_queued_requests=len(router_queue), aggregated_metrics=aggregated,
+                raw_metrics=None, capacity_adjusted_min_replicas=config.min_replicas,
+                capacity_adjusted_max_replicas=config.max_replicas, policy_state=policy_state,
+                last_scale_up_time=None, last_scale_down_time=None, current_time=now,
+                config=config, total_pending_async_requests=0,
+            )
+            desired, _ = policy(ctx)
+            desired = _apply_scaling_factors(desired, len(ready), config)
+            decision, policy_state = _apply_delay_logic(max(0, desired), target, config,
+                                                        policy_state, _now=now)
+            decision = min(max(decision, config.min_replicas), config.max_replicas)
+            if decision != target:
+                scale_events += 1
+                serving = [replica for replica in replicas if not replica.draining]
+                if decision > len(serving):
+                    replicas.extend(SimReplica(f"r{next(replica_ids)}", now + args.startup, args)
+                                    for _ in range(decision - len(serving)))
+                else:
+                    for replica in sorted(serving, key=lambda replica: replica.ongoing)[:len(serving) - decision]:
+                        replica.draining = True
+                        history.pop(replica.name, None)
+                target = decision
+                peak_replicas = max(peak_replicas, target)
+            if args.timeline and now % args.timeline < args.control_interval:
+                timeline.append((now, target, len(router_queue) + sum(r.ongoing for r in replicas)))
+        now += dt
+
+    ttfts.sort()
+    completed = len(ttfts)
+    violations = sum(1 for ttft in ttfts if ttft > args.ttft_slo) + (len(trace) - completed)
+    return {
+        "replica_hours": replica_seconds / 3600,
+        "peak_replicas": peak_replicas,
+        "scale_events": scale_events,
+        "ttft_p50": ttfts[completed // 2] if ttfts else float("nan"),
+        "ttft_p99": ttfts[min(int(completed * 0.99), completed - 1)] if ttfts else float("nan"),
+        "slo_violations": violations / max(len(trace), 1),
+        "timeline": timeline,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trace", help="JSONL trace; a synthetic trace is generated if omitted")
+    parser.add_argument("--duration", type=float, default=1800.0)
+    parser.add_argument("--base-rps", type=float, default=2.0)
+    parser.add_argument("--peak-rps", type=float, default=12.0)
+    parser.add_argument("--long-rps", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    # Engine model, per replica.
+    parser.add_argument("--kv-tokens", type=float, default=100_000)
+    parser.add_argument("--max-num-seqs", type=int, default=256)
+    parser.add_argument("--prefill-tps", type=float, default=12_000)
+    parser.add_argument("--decode-step-s", type=float, default=0.02)
+    parser.add_argument("--decode-step-per-seq-s", type=float, default=0.0004)
+    # Serving and autoscaling.
+    parser.add_argument("--max-ongoing-requests", type=int, default=256)
+    parser.add_argument("--min-replicas", type=int, default=1)
+    parser.add_argument("--max-replicas", type=int, default=16)
+    parser.add_argument("--target-ongoing-requests", type=float, default=32)
+    parser.add_argument("--upscale-delay", type=float, default=30)
+    parser.add_argument("--downscale-delay", type=float, default=300)
+    parser.add_argument("--look-back", type=float, default=30)
+    parser.add_argument("--startup", type=float, default=60, help="replica startup time (s)")
+    for name, default in DEFAULT_TARGETS.items():
+        parser.add_argument(f"--target-{name.replace('_', '-')}", type=float, default=default)
+    # Simulation.
+    parser.add_argument("--ttft-slo", type=float, default=2.0)
+    parser.add_argument("--dt", type=float, default=0.05)
+    parser.add_argument("--record-interval", type=float, default=0.5)
+    parser.add_argument("--control-interval", type=float, default=1.0)
+    parser.add_argument("--drain", type=float, default=120.0, help="seconds simulated after the last arrival")
+    parser.add_argument("--timeline", type=float, default=0.0, help="print replicas every N seconds")
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace) if args.trace else synthetic_trace(
+        args.duration, args.base_rps, args.peak_rps, args.long_rps, args.seed)
+    config = AutoscalingConfig(
+        min_replicas=args.min_replicas, max_replicas=args.max_replicas,
+        target_ongoing_requests=args.target_ongoing_requests, upscale_delay_s=args.upscale_delay,
+        downscale_delay_s=args.downscale_delay, look_back_period_s=args.look_back,
+    )
+    targets = {name: getattr(args, f"target_{name}") for name in DEFAULT_TARGETS}
+    policies = {
+        "default": replica_queue_length_autoscaling_policy,
+        "engine_load": EngineLoadPolicy(targets=targets),
+        "engine_load+ongoing": EngineLoadPolicy(targets=targets, ongoing_requests=True),
+    }
+    print(f"{len(trace)} requests over {trace[-1]['t'] if trace else 0:.0f} s, "
+          f"TTFT SLO {args.ttft_slo:.1f} s", flush=True)
+    print(f"{'policy':<20} {'replica-h':>9} {'peak':>5} {'events':>6} "
+          f"{'TTFT p50':>9} {'TTFT p99':>9} {'SLO miss':>8}")
+    for name, policy in policies.items():
+        result = simulate(policy, trace, config, args)
+        print(f"{name:<20} {result['replica_hours']:9.2f} {result['peak_replicas']:5d} "
+              f"{result['scale_events']:6d} {result['ttft_p50']:8.2f}s {result['ttft_p99']:8.2f}s "
+              f"{result['slo_violations']:8.1%}", flush=True)
+        for t, replicas, in_flight in result["timeline"]:
+            print(f"  t={t:7.0f}s replicas={replicas:3d} in_flight={in_flight}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark: local orchestrator throughput as API worker processes are added.
+
+For each worker count, serves the `bench-echo` backend through
+`oc_serve.orchestrators.local.frontend.serve` and drives `/complete` from
+several client processes (so the load generator is not the bottleneck).
+The echo backend answers immediately, so the numbers measure the HTTP,
+parsing and serialization tier the workers scale out.
+
+Usage:
+    python -m benchmarks.bench_frontend --workers 1 2 4 8 --clients 4
+"""
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+
+from benchmarks.bench_orchestrators import closed_loop, wait_healthy
+from benchmarks.echo_backend import EchoLocalBackendServerSettings
+from configs import OrchestratorConfigs
+from oc_serve.orchestrators.local.frontend import serve
+
+
+def client(url: str, concurrency: int, seconds: float, results) -> None:
+    """Run one closed-loop client process and report its latencies."""
+    results.put(asyncio.run(closed_loop(url, concurrency, seconds)))
+
+
+def run(workers: int, port: int, args):
+    """Serve with `workers` processes and return `(rps, p50 ms, errors)`."""
+    configs = OrchestratorConfigs.get("local")
+    configs.backend_server_settings = EchoLocalBackendServerSettings()
+    configs.frontend_settings.port = port
+    configs.frontend_settings.workers = workers
+    configs.frontend_settings.log_level = "warning"
+
+    ctx = multiprocessing.get_context("spawn")
+    server = ctx.Process(target=serve, args=(configs,))
+    server.start()
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_healthy(url)
+        results = ctx.Queue()
+        clients = [ctx.Process(target=client,
+                               args=(url, args.concurrency // args.clients, args.seconds, results))
+                   for _ in range(args.clients)]
+        for process in clients:
+            process.start()
+        latencies, errors = [], 0
+        for _ in clients:
+            client_latencies, client_errors = results.get()
+            latencies.extend(client_latencies)
+            errors += client_errors
+        for process in clients:
+            process.join()
+    finally:
+        server.terminate()
+        server.join()
+    return len(latencies) / args.seconds, statistics.median(latencies) * 1e3, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=4,
+                        help="Load generator processes.")
+    parser.add_argument("--concurrency", type=int, default=64,
+                        help="Total in-flight requests across client processes.")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    baseline = None
+    for index, workers in enumerate(args.workers):
+        rps, p50, errors = run(workers, 8200 + index, args)
+        baseline = baseline or rps
+        print(f"workers={workers:<3} rps={rps:8.0f} speedup={rps / baseline:5.2f}x "
+              f"p50={p50:6.2f}ms errors={errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark: gRPC vs REST ingress on a local Ray Serve cluster.
+
+Deploys the Ray orchestrator around the `bench-echo` server with both the
+HTTP and gRPC proxies enabled, then drives `Complete` / `/complete` with a
+closed loop of concurrent clients and reports throughput and latency.
+
+Usage:
+    python -m benchmarks.bench_grpc --concurrency 32 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import grpc
+
+from benchmarks.bench_orchestrators import closed_loop, wait_healthy, BODY
+from benchmarks.echo_backend import EchoBackendServerSettings
+from configs import OrchestratorConfigs
+from oc_serve.api.rpc import oc_serve_pb2 as pb2, oc_serve_pb2_grpc as pb2_grpc
+from oc_serve.orchestrators import Ray
+
+SERVICER = "oc_serve.api.rpc.oc_serve_pb2_grpc.add_OCServeServicer_to_server"
+
+
+async def grpc_closed_loop(target: str, concurrency: int, seconds: float):
+    """Run `concurrency` gRPC clients back-to-back for `seconds`; return latencies."""
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + seconds
+    request = pb2.CompletionRequest(prompt=BODY["prompt"],
+                                    sampling=pb2.SamplingParams(max_tokens=BODY["max_tokens"]))
+
+    async with grpc.aio.insecure_channel(target) as channel:
+        stub = pb2_grpc.OCServeStub(channel)
+
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    await stub.Complete(request)
+                    latencies.append(time.perf_counter() - start)
+                except grpc.aio.AioRpcError:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def report(name: str, latencies, errors: int, seconds: float) -> None:
+    """Print one result row."""
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1e3
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1e3
+    print(f"{name:<6} rps={len(latencies) / seconds:8.0f} "
+          f"p50={p50:6.2f}ms p99={p99:6.2f}ms errors={errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--http-port", type=int, default=8102)
+    parser.add_argument("--grpc-port", type=int, default=9102)
+    args = parser.parse_args()
+
+    import ray
+    from ray import serve
+
+    ray.init(runtime_env={"working_dir": os.getcwd()})
+    serve.start(http_options={"port": args.http_port},
+                grpc_options={"port": args.grpc_port, "grpc_servicer_functions": [SERVICER]})
+    configs = OrchestratorConfigs.get("ray")
+    configs.backend_server_settings = EchoBackendServerSettings()
+    configs.deployment_settings.max_ongoing_requests = max(args.concurrency, 100)
+    serve.run(Ray.build(configs), route_prefix="/")
+    url = f"http://127.0.0.1:{args.http_port}"
+    wait_healthy(url)
+
+    try:
+        latencies, errors = asyncio.run(closed_loop(url, args.concurrency, args.seconds))
+        report("rest", latencies, errors, args.seconds)
+        latencies, errors = asyncio.run(grpc_closed_loop(f"127.0.0.1:{args.grpc_port}",
+                                                         args.concurrency, args.seconds))
+        report("grpc", latencies, errors, args.seconds)
+    finally:
+        serve.shutdown()
+        ray.shutdown()
+
+
+if __name__ == "__main__":
+    main()
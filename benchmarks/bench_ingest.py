@@ -0,0 +1,88 @@
+"""Microbenchmark: `/instruct` and `/complete` body parsing.
+
+Measures single-core requests per second for the default ingest path
+(`json.loads` + `model_validate`, as FastAPI does for a body parameter) and
+for the opt-in fast path (`RAY_INGRESS_FAST_PARSING=1`, pydantic-core
+`model_validate_json`), on multi-turn and multimodal chat payloads.
+
+Usage:
+    python -m benchmarks.bench_ingest --seconds 2
+"""
+import argparse
+import base64
+import json
+import os
+import time
+from typing import Callable
+
+from oc_serve.api.ingest import RequestParser
+from oc_serve.api.models import ChatCompletionRequest, CompletionRequest
+
+
+def multi_turn_body(turns: int) -> bytes:
+    """Chat body with a long system prompt, tools and `turns` exchanges."""
+    messages = [{"role": "system", "content": "You are a helpful agent. " * 400}]
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"question {i} " * 40})
+        messages.append({"role": "assistant", "content": f"answer {i} " * 60})
+    messages.append({"role": "user", "content": "final question"})
+    tools = [{"type": "function",
+              "function": {"name": f"tool_{i}",
+                           "description": "Does something useful. " * 10,
+                           "parameters": {"type": "object",
+                                          "properties": {"arg": {"type": "string"}},
+                                          "required": ["arg"]}}}
+             for i in range(16)]
+    return json.dumps({"model": "bench-model", "messages": messages, "tools": tools,
+                       "max_tokens": 256, "temperature": 0.2}).encode()
+
+
+def multimodal_body(images: int, image_kb: int) -> bytes:
+    """Chat body with `images` inline base64 images of `image_kb` KiB each."""
+    image = base64.b64encode(os.urandom(image_kb * 1024)).decode()
+    content = [{"type": "text", "text": "Describe these images."}]
+    content += [{"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image}"}}
+                for _ in range(images)]
+    return json.dumps({"model": "bench-model",
+                       "messages": [{"role": "user", "content": content}]}).encode()
+
+
+def completion_body() -> bytes:
+    """Completion body with a long prompt."""
+    return json.dumps({"model": "bench-model", "prompt": "lorem ipsum " * 2000,
+                       "max_tokens": 128}).encode()
+
+
+def rps(fn: Callable[[], object], seconds: float) -> float:
+    """Return calls per second of `fn` on the current core."""
+    fn()
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        fn()
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    cases = [
+        ("chat multi-turn (20 turns)", ChatCompletionRequest, multi_turn_body(20)),
+        ("chat multimodal (4 x 256KiB)", ChatCompletionRequest, multimodal_body(4, 256)),
+        ("completion long prompt", CompletionRequest, completion_body()),
+    ]
+
+    print(f"{'payload':<30} {'size':>9} {'default rps':>12} {'fast rps':>10} {'speedup':>8}")
+    for name, model_cls, body in cases:
+        default = rps(lambda m=model_cls, b=body: RequestParser.validate(m, b), args.seconds)
+        fast = rps(lambda m=model_cls, b=body: m.model_validate_json(b), args.seconds)
+        print(f"{name:<30} {len(body) / 1024:>6.0f}KiB {default:>12.0f} {fast:>10.0f} "
+              f"{fast / default:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: caller-side cost of OC-Serve logging, synchronous vs queued.
+
+Each mode runs in a fresh process (the logger is configured once per
+process from `OC_LOG_*`) and times the INFO calls a request makes on the
+event loop, e.g. `VLLM.instruct`'s "Instruct Request", from inside a
+coroutine. The difference is event loop time handed back per request.
+
+Usage:
+    python -m benchmarks.bench_logging --records 20000 --log-file /tmp/oc-bench.log
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+
+
+def run(env: dict, records: int, results) -> None:
+    """Log `records` INFO messages from a coroutine; report seconds per call."""
+    os.environ.update(env)
+    from oc_serve.utils import oc_logger
+    logger = oc_logger.get_logger("bench-logging")
+
+    async def handler(index: int):
+        logger.info("Instruct Request %d", index)
+
+    async def main():
+        for index in range(records // 10):  # warm up file and stdout buffers
+            await handler(index)
+        start = time.perf_counter()
+        for index in range(records):
+            await handler(index)
+        return (time.perf_counter() - start) / records
+
+    results.put(asyncio.run(main()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--log-file", default="/tmp/oc-serve-bench-logging.log")
+    args = parser.parse_args()
+
+    modes = {
+        "sync text": {"OC_LOG_QUEUE": "0", "OC_LOG_FORMAT": "text"},
+        "queue text": {"OC_LOG_QUEUE": "1", "OC_LOG_FORMAT": "text"},
+        "queue json": {"OC_LOG_QUEUE": "1", "OC_LOG_FORMAT": "json"},
+    }
+    ctx = multiprocessing.get_context("spawn")
+    baseline = None
+    for name, env in modes.items():
+        env = {**env, "OC_LOG_FILE": args.log_file, "OC_LOG_QUEUE_SIZE": str(args.records * 2)}
+        results = ctx.Queue()
+        process = ctx.Process(target=run, args=(env, args.records, results))
+        process.start()
+        per_call = results.get()
+        process.join()
+        baseline = baseline or per_call
+        print(f"{name:<11} {per_call * 1e6:7.2f} us/record on the event loop "
+              f"(saved {(baseline - per_call) * 1e6:6.2f} us)", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark: local vs Ray orchestrator overhead on an echo backend.
+
+Starts each orchestrator around the `bench-echo` server (which answers
+immediately), measures the import time of its module in a fresh interpreter
+and the time until `/api-health` responds, then drives
+`/complete` with a closed loop of concurrent clients and reports
+throughput and latency percentiles.
+
+Usage:
+    python -m benchmarks.bench_orchestrators --concurrency 32 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from benchmarks.echo_backend import EchoBackendServerSettings
+from configs import OrchestratorConfigs
+from oc_serve.orchestrators import Local
+
+BODY = {"prompt": "hello", "max_tokens": 1}
+
+
+def wait_healthy(url: str, timeout: float = 300.0) -> None:
+    """Block until POST `url`/api-health returns 200."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.post(f"{url}/api-health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} did not become healthy")
+
+
+def import_time(module: str) -> float:
+    """Seconds a fresh interpreter spends importing `module`, beyond its own startup."""
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        return time.perf_counter() - start
+
+    return run(f"import {module}") - run("pass")
+
+
+async def closed_loop(url: str, concurrency: int, seconds: float):
+    """Run `concurrency` clients back-to-back for `seconds`; return latencies."""
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + seconds
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                response = await client.post("/complete", json=BODY)
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def report(name: str, imported: float, startup: float, latencies, errors: int,
+           seconds: float) -> None:
+    """Print one result row."""
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1e3
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1e3
+    print(f"{name:<8} import={imported:5.2f}s startup={startup:6.2f}s rps={len(latencies) / seconds:8.0f} "
+          f"p50={p50:6.2f}ms p99={p99:6.2f}ms errors={errors}")
+
+
+def run_local(port: int, args) -> None:
+    """Serve the local orchestrator with uvicorn in a background thread."""
+    imported = import_time("oc_serve.orchestrators.local")
+    start = time.perf_counter()
+    configs = OrchestratorConfigs.get("local")
+    configs.backend_server_settings.backend_server_type = "bench-echo"
+    app = Local.build(configs)
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{port}"
+    wait_healthy(url)
+    startup = time.perf_counter() - start
+    latencies, errors = asyncio.run(closed_loop(url, args.concurrency, args.seconds))
+    report("local", imported, startup, latencies, errors, args.seconds)
+    server.should_exit = True
+    thread.join()
+
+
+def run_ray(port: int, args) -> None:
+    """Serve the Ray orchestrator on a local Ray cluster."""
+    import ray
+    from ray import serve
+    from oc_serve.orchestrators import Ray
+
+    imported = import_time("oc_serve.orchestrators.ray")
+    start = time.perf_counter()
+    ray.init(runtime_env={"working_dir": os.getcwd()})
+    serve.start(http_options={"port": port})
+    configs = OrchestratorConfigs.get("ray")
+    configs.backend_server_settings = EchoBackendServerSettings()
+    configs.deployment_settings.max_ongoing_requests = max(args.concurrency, 100)
+    serve.run(Ray.build(configs), route_prefix="/")
+    url = f"http://127.0.0.1:{port}"
+    wait_healthy(url)
+    startup = time.perf_counter() - start
+    latencies, errors = asyncio.run(closed_loop(url, args.concurrency, args.seconds))
+    report("ray", imported, startup, latencies, errors, args.seconds)
+    serve.shutdown()
+    ray.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--orchestrators", nargs="+", default=["local", "ray"],
+                        choices=["local", "ray"])
+    args = parser.parse_args()
+
+    if "local" in args.orchestrators:
+        run_local(8100, args)
+    if "ray" in args.orchestrators:
+        run_ray(8101, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Microbenchmark: JSON response rendering.
+
+Compares the previous response path,
+`JSONResponse(content=model.model_dump())`, with `FastJSONResponse(content=model)`
+on representative vLLM protocol payloads (large `n`, logprobs with top-k
+alternatives) and on streaming chunks framed as SSE events.
+
+Usage:
+    python -m benchmarks.bench_serialization --iterations 200
+"""
+import argparse
+import time
+from typing import Callable, Dict
+
+from vllm.entrypoints.openai.protocol import (
+    ChatCompletionLogProb,
+    ChatCompletionLogProbs,
+    ChatCompletionLogProbsContent,
+    ChatCompletionResponse,
+    ChatCompletionResponseChoice,
+    ChatCompletionResponseStreamChoice,
+    ChatCompletionStreamResponse,
+    ChatMessage,
+    DeltaMessage,
+    UsageInfo,
+)
+
+from oc_serve.api.models import JSONResponse
+from oc_serve.api.responses import FastJSONResponse
+from oc_serve.utils.serialization import sse_event
+
+
+def build_chat_response(n: int, tokens: int, top_logprobs: int) -> ChatCompletionResponse:
+    """Build a chat completion with `n` choices of `tokens` tokens each."""
+    choices = []
+    for i in range(n):
+        content = [
+            ChatCompletionLogProbsContent(
+                token=f"tok{t}",
+                logprob=-0.125 * t,
+                bytes=list(f"tok{t}".encode()),
+                top_logprobs=[ChatCompletionLogProb(token=f"alt{k}", logprob=-1.5 * k,
+                                                    bytes=list(f"alt{k}".encode()))
+                              for k in range(top_logprobs)],
+            )
+            for t in range(tokens)
+        ]
+        choices.append(ChatCompletionResponseChoice(
+            index=i,
+            message=ChatMessage(role="assistant", content=" ".join(f"tok{t}" for t in range(tokens))),
+            logprobs=ChatCompletionLogProbs(content=content),
+        ))
+    return ChatCompletionResponse(model="bench-model", choices=choices,
+                                  usage=UsageInfo(prompt_tokens=512,
+                                                  completion_tokens=n * tokens,
+                                                  total_tokens=512 + n * tokens))
+
+
+def build_stream_chunk() -> ChatCompletionStreamResponse:
+    """Build a single-token streaming chunk."""
+    return ChatCompletionStreamResponse(
+        model="bench-model",
+        choices=[ChatCompletionResponseStreamChoice(index=0,
+                                                    delta=DeltaMessage(content="hello"))],
+    )
+
+
+def timeit(fn: Callable[[], object], iterations: int) -> float:
+    """Return mean seconds per call."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads: Dict[str, object] = {
+        "small (n=1, 64 tok)": build_chat_response(1, 64, 0),
+        "logprobs (n=1, 512 tok, top5)": build_chat_response(1, 512, 5),
+        "n=8 logprobs (256 tok, top5)": build_chat_response(8, 256, 5),
+    }
+
+    print(f"{'payload':<32} {'model_dump+json':>16} {'fast':>12} {'speedup':>8}")
+    for name, model in payloads.items():
+        baseline = timeit(lambda m=model: JSONResponse(content=m.model_dump()).body,
+                          args.iterations)
+        fast = timeit(lambda m=model: FastJSONResponse(content=m).body, args.iterations)
+        print(f"{name:<32} {baseline * 1e3:>13.3f} ms {fast * 1e3:>9.3f} ms "
+              f"{baseline / fast:>7.1f}x")
+
+    chunk = build_stream_chunk()
+    baseline = timeit(lambda: f"data: {chunk.model_dump_json(exclude_unset=True)}\n\n".encode(),
+                      args.iterations * 50)
+    fast = timeit(lambda: sse_event(chunk, exclude_unset=True), args.iterations * 50)
+    print(f"{'sse chunk':<32} {baseline * 1e6:>13.3f} us {fast * 1e6:>9.3f} us "
+          f"{baseline / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
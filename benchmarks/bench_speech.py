@@ -0,0 +1,72 @@
+"""Benchmark: time to first audio byte of streamed vs buffered speech.
+
+Serves the local orchestrator around the `bench-echo` server, whose stub
+synthesizer produces one tone per word, and requests `/speech` with
+`stream: true` and `stream: false` for inputs of increasing length. A
+streamed response's first byte should not depend on the input length.
+
+Usage:
+    python -m benchmarks.bench_speech --words 5 20 80 --format wav
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from benchmarks.bench_orchestrators import wait_healthy
+from benchmarks.echo_backend import EchoLocalBackendServerSettings
+from configs import OrchestratorConfigs
+from oc_serve.orchestrators import Local
+
+
+def measure(client: httpx.Client, url: str, body: dict):
+    """Return `(seconds to first byte, seconds to last byte, bytes)` of one request."""
+    start = time.perf_counter()
+    first = None
+    size = 0
+    with client.stream("POST", f"{url}/speech", json=body) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            if first is None and chunk:
+                first = time.perf_counter() - start
+            size += len(chunk)
+    return first, time.perf_counter() - start, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, nargs="+", default=[5, 20, 80])
+    parser.add_argument("--format", default="wav", choices=["pcm", "wav", "opus"])
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8300)
+    args = parser.parse_args()
+
+    configs = OrchestratorConfigs.get("local")
+    configs.backend_server_settings = EchoLocalBackendServerSettings()
+    server = uvicorn.Server(uvicorn.Config(Local.build(configs), port=args.port,
+                                           log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{args.port}"
+    wait_healthy(url)
+    try:
+        with httpx.Client(timeout=300) as client:
+            for words in args.words:
+                for stream in (True, False):
+                    body = {"input": " ".join(["word"] * words),
+                            "response_format": args.format, "stream": stream}
+                    runs = [measure(client, url, body) for _ in range(args.requests)]
+                    print(f"words={words:<4} stream={str(stream):<5} "
+                          f"ttfb={statistics.median(r[0] for r in runs) * 1e3:8.1f}ms "
+                          f"total={statistics.median(r[1] for r in runs) * 1e3:8.1f}ms "
+                          f"bytes={runs[0][2]}")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
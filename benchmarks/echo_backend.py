@@ -0,0 +1,110 @@
+"""Minimal echo backend used by the orchestrator benchmarks.
+
+Importing this module registers a `bench-echo` server that answers every
+endpoint immediately, so benchmarks measure orchestrator overhead only.
+Its `/speech` endpoint is backed by `ToneSynthesizer`, a stub that streams
+a tone per word at a configurable synthesis speed.
+"""
+import asyncio
+import math
+import struct
+from dataclasses import dataclass
+
+from configs import ServerConfigs
+from configs.orchestrators_configs.LocalConfigs import LocalBackendServerSettings
+from configs.orchestrators_configs.RayConfigs import RayBackendServerSettings
+from oc_serve.servers import Server
+from oc_serve.api.models import Response
+from oc_serve.api.responses import FastJSONResponse, speech_response
+
+
+@ServerConfigs.register("bench-echo")
+@dataclass
+class EchoServerConfigs(ServerConfigs):
+    """Echo server configs (no options)."""
+
+    @classmethod
+    def build(cls):
+        return cls()
+
+
+class EchoBackendServerSettings(RayBackendServerSettings):
+    """Backend settings selecting the echo server.
+
+    Ray replicas unpickle this class, which imports this module and so
+    registers the echo server in the replica process as well.
+    """
+    backend_server_type: str = "bench-echo"
+
+
+class EchoLocalBackendServerSettings(LocalBackendServerSettings):
+    """Local backend settings selecting the echo server (see above)."""
+    backend_server_type: str = "bench-echo"
+
+
+class ToneSynthesizer:
+    """Stub synthesizer: one 16-bit PCM tone per word of input.
+
+    Each word takes `word_ms / speed` of audio and is "synthesized" in
+    `real_time_factor` times that, so streaming latency can be measured
+    without a model.
+    """
+    def __init__(self, sample_rate: int = 24000, word_ms: int = 300,
+                 real_time_factor: float = 0.2):
+        self.sample_rate = sample_rate
+        self.word_ms = word_ms
+        self.real_time_factor = real_time_factor
+
+    async def synthesize(self, text: str, speed: float = 1.0):
+        samples = int(self.sample_rate * self.word_ms / 1000 / speed)
+        for index, word in enumerate(text.split()):
+            await asyncio.sleep(samples / self.sample_rate * self.real_time_factor)
+            frequency = 220 + 40 * (len(word) % 10)
+            # Short gap at the end of every word.
+            tone = [int(8000 * math.sin(2 * math.pi * frequency * i / self.sample_rate))
+                    if i < samples * 0.8 else 0 for i in range(samples)]
+            yield struct.pack(f"<{samples}h", *tone)
+
+
+@Server.register("bench-echo")
+class EchoServer(Server):
+    """Server answering every request immediately."""
+    def __init__(self, server_configs: ServerConfigs):
+        self.server_configs = server_configs
+        self.synthesizer = ToneSynthesizer()
+
+    async def check_model_health(self, raw_request=None):
+        return Response(status_code=200, content="Model is Healthy!")
+
+    async def get_model_info(self, raw_request=None):
+        return FastJSONResponse(content={"object": "list", "data": []})
+
+    async def instruct(self, request, raw_request, preprocessed=None):
+        return FastJSONResponse(content={"choices": [{"index": 0, "message": {
+            "role": "assistant", "content": "ok"}}]})
+
+    async def complete(self, request, raw_request, preprocessed=None):
+        return FastJSONResponse(content={"choices": [{"index": 0, "text": "ok"}]})
+
+    async def transcribe(self, request, raw_request, preprocessed=None):
+        return FastJSONResponse(content={"text": ""})
+
+    async def speech(self, request, raw_request):
+        return await speech_response(
+            request, self.synthesizer.synthesize(request.input, request.speed),
+            self.synthesizer.sample_rate, model="bench-echo")
+
+    async def metrics(self, request=None):
+        return Response(content="")
+
+    async def tokenize(self, request, raw_request):
+        return FastJSONResponse(content={"tokens": [], "count": 0})
+
+    async def scoring(self, request, raw_request):
+        return FastJSONResponse(content={})
+
+    async def pooling(self, request, raw_request):
+        return FastJSONResponse(content={})
+
+    async def detokenize(self, request, raw_request):
+        return FastJSONResponse(content={"prompt": ""})
@@ -0,0 +1,398 @@
+"""Load generator: replay a JSONL workload against an OC-Serve endpoint.
+
+The workload is one or more JSONL files (optionally gzip-compressed), or
+directories of them, such as the files written by traffic capture
+(`OC_CAPTURE_*`). Each line is a request:
+
+    {"path": "/instruct", "body": {"messages": [...], "stream": true}}
+    {"path": "/complete", "body": {"prompt": "...", "max_tokens": 64}}
+    {"path": "/tokenize", "body": {"prompt": "..."}}
+    {"path": "/transcribe", "file": "clip.wav", "fields": {"language": "en"}}
+
+A line without `path` is a request body sent to `/instruct` if it has
+`messages` and to `/complete` otherwise. `file` paths are relative to the
+workload file. Captured `ts` arrival times are used by `--mode trace`.
+
+Arrivals are one of:
+    fixed    `--qps` requests per second, evenly spaced
+    poisson  `--qps` requests per second, exponential gaps
+    closed   `--concurrency` clients sending back-to-back
+    trace    the recorded `ts` gaps, divided by `--speedup`
+
+For each endpoint the report gives end-to-end latency, TTFT (time to the
+first streamed event, or the whole response when not streaming) and
+inter-token latency percentiles, output tokens per second and the error
+rate. Streamed `/instruct` and `/complete` requests ask for a final usage
+chunk so tokens are counted exactly; without one, each streamed event
+counts as one token. With `--output` the report is written as JSON, and
+`--compare` fails (exit code 1) if a latency percentile, the throughput or
+the error rate regressed by more than `--max-regression` against a
+previous report.
+
+Usage:
+    python -m benchmarks.loadgen --url http://127.0.0.1:8000 --workload /tmp/oc-serve-capture \\
+        --mode poisson --qps 5 --duration 60 --output results.json
+    python -m benchmarks.loadgen --workload workload.jsonl --mode closed --concurrency 16 \\
+        --num-requests 500 --compare baseline.json --max-regression 0.1
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from itertools import cycle, islice
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+_DATA_PREFIX = "data: "
+_USAGE_PATHS = ("/instruct", "/complete")
+_PERCENTILES = (50, 95, 99)
+
+
+class WorkItem(NamedTuple):
+    """One request of the workload."""
+    path: str
+    body: Optional[dict] = None
+    ts: Optional[float] = None
+    file: Optional[str] = None
+    fields: Optional[dict] = None
+
+
+class Result(NamedTuple):
+    """Outcome of one request; times in seconds."""
+    path: str
+    status: int
+    error: Optional[str]
+    e2e: float
+    ttft: Optional[float]
+    itl: List[float]
+    completion_tokens: int
+
+
+def _lines(path: str):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as file:
+        try:
+            yield from file
+        except EOFError:
+            # A capture file still being written ends mid-stream.
+            return
+
+
+def load_workload(paths: List[str], endpoints: Optional[List[str]] = None) -> List[WorkItem]:
+    """Read workload files (and the `*.jsonl[.gz]` files of directories), sorted by `ts`."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.endswith((".jsonl", ".jsonl.gz"))))
+        else:
+            files.append(path)
+    items = []
+    for path in files:
+        base = os.path.dirname(path)
+        for line in _lines(path):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "path" in record:
+                item = WorkItem(record["path"], record.get("body"), record.get("ts"),
+                                record.get("file"), record.get("fields"))
+            else:
+                item = WorkItem("/instruct" if "messages" in record else "/complete", record)
+            if item.file is not None:
+                item = item._replace(file=os.path.join(base, item.file))
+            if endpoints is None or item.path in endpoints:
+                items.append(item)
+    if items and all(item.ts is not None for item in items):
+        items.sort(key=lambda item: item.ts)
+    return items
+
+
+class LoadGenerator:
+    """Sends work items with an `httpx.AsyncClient` and collects `Result`s."""
+    def __init__(self, client: httpx.AsyncClient, request_usage: bool = True):
+        self.client = client
+        self.request_usage = request_usage
+        self.results: List[Result] = []
+        self.files: Dict[str, bytes] = {}
+
+    def _file(self, path: str) -> bytes:
+        if path not in self.files:
+            with open(path, "rb") as file:
+                self.files[path] = file.read()
+        return self.files[path]
+
+    async def send(self, item: WorkItem) -> Result:
+        started = time.perf_counter()
+        try:
+            if item.file is not None:
+                response = await self.client.post(
+                    item.path, data=item.fields or {},
+                    files={"file": (os.path.basename(item.file), self._file(item.file))})
+                result = self._buffered(item, response, started)
+            elif item.body and item.body.get("stream"):
+                result = await self._stream(item, started)
+            else:
+                response = await self.client.post(item.path, json=item.body or {})
+                result = self._buffered(item, response, started)
+        except httpx.HTTPError as exc:
+            result = Result(item.path, 0, type(exc).__name__, time.perf_counter() - started,
+                            None, [], 0)
+        self.results.append(result)
+        return result
+
+    @staticmethod
+    def _buffered(item: WorkItem, response: httpx.Response, started: float) -> Result:
+        e2e = time.perf_counter() - started
+        if response.status_code != 200:
+            return Result(item.path, response.status_code, f"HTTP {response.status_code}",
+                          e2e, None, [], 0)
+        tokens = 0
+        try:
+            content = response.json()
+        except ValueError:
+            content = None
+        if isinstance(content, dict):
+            usage = content.get("usage") or {}
+            tokens = usage.get("completion_tokens") or 0
+        return Result(item.path, 200, None, e2e, e2e, [], tokens)
+
+    async def _stream(self, item: WorkItem, started: float) -> Result:
+        body = item.body
+        if self.request_usage and item.path in _USAGE_PATHS and "stream_options" not in body:
+            body = {**body, "stream_options": {"include_usage": True}}
+        ttft, last, itl, events, usage = None, None, [], 0, None
+        async with self.client.stream("POST", item.path, json=body) as response:
+            if response.status_code != 200:
+                await response.aread()
+                return Result(item.path, response.status_code, f"HTTP {response.status_code}",
+                              time.perf_counter() - started, None, [], 0)
+            async for line in response.aiter_lines():
+                if not line.startswith(_DATA_PREFIX) or line == "data: [DONE]":
+                    continue
+                if '"usage"' in line:
+                    chunk = json.loads(line[len(_DATA_PREFIX):])
+                    usage = chunk.get("usage") or usage
+                    if not chunk.get("choices"):
+                        continue
+                now = time.perf_counter()
+                if ttft is None:
+                    ttft = now - started
+                else:
+                    itl.append(now - last)
+                last = now
+                events += 1
+        tokens = usage["completion_tokens"] if usage else events
+        return Result(item.path, 200, None, time.perf_counter() - started, ttft, itl, tokens)
+
+
+def requests_of(items: List[WorkItem], args) -> Iterator[WorkItem]:
+    """The workload, cycled until `--num-requests` or `--duration` if either is set."""
+    if args.mode == "trace" or not (args.num_requests or args.duration):
+        return islice(items, args.num_requests)
+    return islice(cycle(items), args.num_requests)
+
+
+def schedule(items: Iterator[WorkItem], args) -> Iterator[Tuple[float, WorkItem]]:
+    """`(offset from the start in seconds, item)` pairs of an open-loop run."""
+    rng = random.Random(args.seed)
+    t, first = 0.0, None
+    for item in items:
+        if args.mode == "trace":
+            first = item.ts if first is None else first
+            t = (item.ts - first) / args.speedup
+        if args.duration is not None and t >= args.duration:
+            return
+        yield t, item
+        if args.mode == "poisson":
+            t += rng.expovariate(args.qps)
+        elif args.mode == "fixed":
+            t += 1.0 / args.qps
+
+
+async def run_open(generator: LoadGenerator, arrivals: Iterator[Tuple[float, WorkItem]],
+                   max_inflight: int) -> None:
+    """Send each item at its offset regardless of how fast responses come back."""
+    inflight = asyncio.Semaphore(max_inflight)
+    start = time.perf_counter()
+    tasks = []
+
+    async def one(item):
+        try:
+            await generator.send(item)
+        finally:
+            inflight.release()
+
+    for offset, item in arrivals:
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await inflight.acquire()
+        tasks.append(asyncio.ensure_future(one(item)))
+    await asyncio.gather(*tasks)
+
+
+async def run_closed(generator: LoadGenerator, items: Iterator[WorkItem], concurrency: int,
+                     duration: Optional[float]) -> None:
+    """`concurrency` clients each send the next item as soon as their last one finished."""
+    deadline = None if duration is None else time.perf_counter() + duration
+
+    async def client():
+        for item in items:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            await generator.send(item)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """Nearest-rank percentiles in milliseconds."""
+    values = sorted(values)
+    summary = {}
+    for p in _PERCENTILES:
+        summary[f"p{p}_ms"] = (values[max(0, -(-len(values) * p // 100) - 1)] * 1e3
+                               if values else None)
+    return summary
+
+
+def summarize(results: List[Result], wall_s: float) -> Dict[str, dict]:
+    """Per-endpoint (and `all`) latency, throughput and error summary."""
+    by_path = defaultdict(list)
+    for result in results:
+        by_path[result.path].append(result)
+        by_path["all"].append(result)
+    report = {}
+    for path, group in sorted(by_path.items()):
+        ok = [r for r in group if r.error is None]
+        errors = defaultdict(int)
+        for r in group:
+            if r.error is not None:
+                errors[r.error] += 1
+        tokens = sum(r.completion_tokens for r in ok)
+        report[path] = {
+            "requests": len(group),
+            "errors": dict(errors),
+            "error_rate": (len(group) - len(ok)) / len(group),
+            "requests_per_s": len(ok) / wall_s,
+            "output_tokens": tokens,
+            "output_tokens_per_s": tokens / wall_s,
+            "e2e": percentiles([r.e2e for r in ok]),
+            "ttft": percentiles([r.ttft for r in ok if r.ttft is not None]),
+            "itl": percentiles([gap for r in ok for gap in r.itl]),
+        }
+    return report
+
+
+def compare(report: Dict[str, dict], baseline: Dict[str, dict], max_regression: float) -> List[str]:
+    """Regressions of `report` against `baseline` beyond `max_regression` (relative)."""
+    regressions = []
+    for path, current in report.items():
+        previous = baseline.get(path)
+        if previous is None:
+            continue
+        for metric in ("e2e", "ttft", "itl"):
+            for key, value in current[metric].items():
+                before = previous.get(metric, {}).get(key)
+                if value is not None and before and value > before * (1 + max_regression):
+                    regressions.append(f"{path} {metric} {key}: {before:.1f} -> {value:.1f}")
+        for key in ("output_tokens_per_s", "requests_per_s"):
+            before = previous.get(key)
+            if before and current[key] < before * (1 - max_regression):
+                regressions.append(f"{path} {key}: {before:.2f} -> {current[key]:.2f}")
+        if current["error_rate"] > previous.get("error_rate", 0) + max_regression / 10:
+            regressions.append(f"{path} error_rate: {previous.get('error_rate', 0):.3f} "
+                               f"-> {current['error_rate']:.3f}")
+    return regressions
+
+
+def print_report(report: Dict[str, dict]) -> None:
+    def ms(value):
+        return "-" if value is None else f"{value:.1f}"
+
+    print(f"{'endpoint':<12} {'reqs':>6} {'err%':>6} {'rps':>7} {'tok/s':>8} "
+          f"{'e2e p50/p95/p99 ms':>24} {'ttft p50/p95/p99 ms':>24} {'itl p50/p95/p99 ms':>22}")
+    for path, row in report.items():
+        columns = [" / ".join(ms(row[m][f"p{p}_ms"]) for p in _PERCENTILES)
+                   for m in ("e2e", "ttft", "itl")]
+        print(f"{path:<12} {row['requests']:>6} {row['error_rate'] * 100:>6.2f} "
+              f"{row['requests_per_s']:>7.2f} {row['output_tokens_per_s']:>8.1f} "
+              f"{columns[0]:>24} {columns[1]:>24} {columns[2]:>22}")
+
+
+async def run(args) -> Dict[str, dict]:
+    items = load_workload(args.workload, args.endpoints)
+    if not items:
+        raise SystemExit("The workload has no requests")
+    if args.mode == "trace" and any(item.ts is None for item in items):
+        raise SystemExit("--mode trace needs a `ts` on every workload line")
+    requests = requests_of(items, args)
+
+    headers = dict(header.split(":", 1) for header in args.header)
+    headers = {key.strip(): value.strip() for key, value in headers.items()}
+    limits = httpx.Limits(max_connections=args.max_inflight)
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits,
+                                 timeout=args.timeout) as client:
+        generator = LoadGenerator(client, request_usage=not args.no_usage)
+        started = time.perf_counter()
+        if args.mode == "closed":
+            await run_closed(generator, requests, args.concurrency, args.duration)
+        else:
+            await run_open(generator, schedule(requests, args), args.max_inflight)
+        wall_s = time.perf_counter() - started
+    return {"config": {key: value for key, value in vars(args).items()
+                       if key not in ("header", "compare", "output")},
+            "wall_s": wall_s,
+            "endpoints": summarize(generator.results, wall_s)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--workload", nargs="+", required=True,
+                        help="JSONL(.gz) files or directories of them")
+    parser.add_argument("--endpoints", nargs="+", default=None,
+                        help="Only replay these paths, e.g. /instruct /tokenize")
+    parser.add_argument("--mode", choices=["fixed", "poisson", "closed", "trace"], default="poisson")
+    parser.add_argument("--qps", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--speedup", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Stop sending after this many seconds")
+    parser.add_argument("--num-requests", type=int, default=None)
+    parser.add_argument("--max-inflight", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--header", action="append", default=[],
+                        help="Extra request header, e.g. 'Authorization: Bearer ...'")
+    parser.add_argument("--no-usage", action="store_true",
+                        help="Do not ask streams for a usage chunk")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    parser.add_argument("--compare", default=None, help="Previous JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.1)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report["endpoints"])
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(report["endpoints"], baseline["endpoints"], args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
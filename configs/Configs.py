@@ -2,4 +2,13 @@
 from .servers_configs import ServerConfigs
 from .orchestrators_configs import OrchestratorConfigs
 from .OCServeConfigs import OCServeConfigs
-from .logger_configs import LoggerConfigs, ColorFormatter, PlainFormatter
+from .logger_configs import LoggerConfigs, ColorFormatter, PlainFormatter, JSONFormatter
+from .artifacts_configs import ArtifactConfigs
+from .transcription_configs import LiveTranscriptionConfigs
+from .api_configs import IdempotencyConfigs, RateLimitConfigs, TrafficCaptureConfigs
+from .monitoring_configs import (
+    EventLoopMonitorConfigs,
+    ProfilerConfigs,
+    MetricsConfigs,
+    HealthProbeConfigs,
+)
@@ -6,4 +6,14 @@ from .Configs import (
     LoggerConfigs,
     ColorFormatter,
     PlainFormatter,
+    JSONFormatter,
+    ArtifactConfigs,
+    LiveTranscriptionConfigs,
+    IdempotencyConfigs,
+    RateLimitConfigs,
+    TrafficCaptureConfigs,
+    EventLoopMonitorConfigs,
+    ProfilerConfigs,
+    MetricsConfigs,
+    HealthProbeConfigs,
 )
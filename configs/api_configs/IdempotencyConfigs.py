@@ -0,0 +1,19 @@
+"""Idempotency Key Configuration Settings for OC-Serve."""
+from typing import List, Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class IdempotencyConfigs(BaseSettings):
+    """OC-Serve Idempotency Key Configuration Settings."""
+    model_config = SettingsConfigDict(env_prefix="OC_IDEMPOTENCY_", case_sensitive=False)
+
+    enabled: bool = Field(default=False)
+    paths: List[str] = Field(default_factory=lambda: ["/complete", "/instruct", "/transcribe"])
+    ttl_s: float = Field(default=600.0)
+    store: Literal["memory", "disk"] = Field(default="memory")
+    max_entries: int = Field(default=1000)
+    max_bytes: int = Field(default=256 * 1024 * 1024)
+    disk_dir: str = Field(default="/tmp/oc-serve-idempotency")
+    max_key_length: int = Field(default=255)
@@ -0,0 +1,26 @@
+"""Token Rate Limit Configuration Settings for OC-Serve."""
+from typing import Dict, Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class RateLimitConfigs(BaseSettings):
+    """OC-Serve Per-Key Token Rate Limit Configuration Settings.
+
+    `None` rates are unlimited. `overrides` maps an API key or tenant id
+    (or `sha256:<hex digest>` of one) to its own rates, e.g.
+    `{"tenant-a": {"prompt_tokens_per_minute": 1000000}}`.
+    """
+    model_config = SettingsConfigDict(env_prefix="OC_RATE_LIMIT_", case_sensitive=False)
+
+    enabled: bool = Field(default=False)
+    prompt_tokens_per_minute: Optional[float] = Field(default=None)
+    completion_tokens_per_minute: Optional[float] = Field(default=None)
+    burst_minutes: float = Field(default=1.0)
+    overrides: Dict[str, Dict[str, Optional[float]]] = Field(default_factory=dict)
+    key_header: str = Field(default="authorization")
+    tenant_header: Optional[str] = Field(default=None)
+    chars_per_token: float = Field(default=4.0)
+    default_completion_tokens: int = Field(default=1024)
+    max_keys: int = Field(default=100000)
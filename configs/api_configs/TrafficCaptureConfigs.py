@@ -0,0 +1,31 @@
+"""Traffic Capture Configuration Settings for OC-Serve."""
+from typing import Dict, List
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class TrafficCaptureConfigs(BaseSettings):
+    """OC-Serve Sampled Traffic Capture Configuration Settings.
+
+    `sample_rates` maps a path to the fraction of its requests recorded;
+    unlisted paths are not recorded. `redact_patterns` maps a name to a
+    regular expression; matches in string values are replaced by `[NAME]`.
+    """
+    model_config = SettingsConfigDict(env_prefix="OC_CAPTURE_", case_sensitive=False)
+
+    enabled: bool = Field(default=False)
+    sample_rates: Dict[str, float] = Field(
+        default_factory=lambda: {"/instruct": 0.01, "/complete": 0.01})
+    dir: str = Field(default="/tmp/oc-serve-capture")
+    max_file_bytes: int = Field(default=64 * 1024 * 1024)
+    max_file_age_s: float = Field(default=300.0)
+    max_files: int = Field(default=50)
+    max_body_bytes: int = Field(default=1024 * 1024)
+    queue_size: int = Field(default=1000)
+    redact_fields: List[str] = Field(default_factory=lambda: ["user"])
+    redact_patterns: Dict[str, str] = Field(default_factory=lambda: {
+        "email": r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+",
+        "card": r"\b(?:\d[ -]?){13,19}\b",
+        "phone": r"\+?\(?\d{1,4}\)?[ .-]?\d{2,4}[ .-]\d{3,4}[ .-]?\d{3,4}\b",
+    })
@@ -0,0 +1,3 @@
+from .IdempotencyConfigs import IdempotencyConfigs
+from .RateLimitConfigs import RateLimitConfigs
+from .TrafficCaptureConfigs import TrafficCaptureConfigs
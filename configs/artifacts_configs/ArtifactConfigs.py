@@ -0,0 +1,18 @@
+"""Model Artifact Cache Configuration Settings for OC-Serve."""
+from typing import Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ArtifactConfigs(BaseSettings):
+    """OC-Serve Model Artifact Cache Configuration Settings."""
+    model_config = SettingsConfigDict(env_prefix="OC_ARTIFACTS_", case_sensitive=False)
+
+    enabled: bool = Field(default=False)
+    source_dir: Optional[str] = Field(default=None)
+    cache_dir: str = Field(default="/home/ray/models")
+    workers: int = Field(default=8)
+    verify_checksums: bool = Field(default=True)
+    require_manifest: bool = Field(default=False)
+    lock_timeout_s: float = Field(default=3600.0)
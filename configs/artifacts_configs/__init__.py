@@ -0,0 +1 @@
+from .ArtifactConfigs import ArtifactConfigs
@@ -1,5 +1,8 @@
 """Logger Configuration Settings and Formatters for OC-Serve."""
+import json
 import logging
+from datetime import datetime, timezone
+from typing import Dict, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,6 +19,12 @@ class LoggerConfigs(BaseSettings):
     backup_count: int = Field(default=7)
     base_level: str = Field(default="DEBUG")
     propagate: bool = Field(default=False)
+    queue: bool = Field(default=True)
+    queue_size: int = Field(default=10000)
+    format: Literal["text", "json"] = Field(default="text")
+    color: bool = Field(default=True)
+    rate_limits: Dict[str, float] = Field(default_factory=dict)
+    sample_rates: Dict[str, float] = Field(default_factory=dict)
 
 
 class ColorFormatter(logging.Formatter):
@@ -48,3 +57,25 @@ class PlainFormatter(logging.Formatter):
             fmt="%(asctime)s | %(levelname)s | %(name)s | pid=%(process)d tid=%(threadName)s | %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S",
         )
+
+
+
+class JSONFormatter(logging.Formatter):
+    """Logging Formatter writing one JSON object per record."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "pid": record.process,
+            "thread": record.threadName,
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            entry["request_id"] = request_id
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
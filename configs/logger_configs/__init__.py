@@ -1 +1 @@
-from .LoggerConfigs import LoggerConfigs, ColorFormatter, PlainFormatter
\ No newline at end of file
+from .LoggerConfigs import LoggerConfigs, ColorFormatter, PlainFormatter, JSONFormatter
@@ -0,0 +1,15 @@
+"""Event Loop Monitor Configuration Settings for OC-Serve."""
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class EventLoopMonitorConfigs(BaseSettings):
+    """OC-Serve Event Loop Monitor Configuration Settings."""
+    model_config = SettingsConfigDict(env_prefix="OC_LOOP_MONITOR_", case_sensitive=False)
+
+    enabled: bool = Field(default=True)
+    interval_ms: int = Field(default=100)
+    slow_threshold_ms: int = Field(default=250)
+    window_s: float = Field(default=10.0)
+    stack_limit: int = Field(default=40)
+    report_interval_s: float = Field(default=10.0)
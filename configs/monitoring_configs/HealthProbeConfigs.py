@@ -0,0 +1,12 @@
+"""Background Health Probe Configuration Settings for OC-Serve."""
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class HealthProbeConfigs(BaseSettings):
+    """OC-Serve Background Health Probe Configuration Settings."""
+    model_config = SettingsConfigDict(env_prefix="OC_HEALTH_PROBE_", case_sensitive=False)
+
+    interval_s: float = Field(default=5.0)
+    timeout_s: float = Field(default=10.0)
+    max_staleness_s: float = Field(default=30.0)
@@ -0,0 +1,12 @@
+"""Metrics Exposition Configuration Settings for OC-Serve."""
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class MetricsConfigs(BaseSettings):
+    """OC-Serve Metrics Exposition Configuration Settings."""
+    model_config = SettingsConfigDict(env_prefix="OC_METRICS_", case_sensitive=False)
+
+    cache_ttl_ms: int = Field(default=1000)
+    gzip: bool = Field(default=True)
+    gzip_level: int = Field(default=6)
@@ -0,0 +1,17 @@
+"""Profiler Configuration Settings for OC-Serve."""
+from typing import Optional
+
+from pydantic import Field, SecretStr
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ProfilerConfigs(BaseSettings):
+    """OC-Serve Profiler Configuration Settings."""
+    model_config = SettingsConfigDict(env_prefix="OC_PROFILER_", case_sensitive=False)
+
+    admin_token: Optional[SecretStr] = Field(default=None)
+    max_seconds: float = Field(default=60.0)
+    sample_interval_ms: float = Field(default=5.0)
+    memory_frames: int = Field(default=25)
+    memory_top: int = Field(default=1000)
+    request_sample_every: int = Field(default=0)
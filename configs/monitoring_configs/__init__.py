@@ -0,0 +1,4 @@
+from .EventLoopMonitorConfigs import EventLoopMonitorConfigs
+from .ProfilerConfigs import ProfilerConfigs
+from .MetricsConfigs import MetricsConfigs
+from .HealthProbeConfigs import HealthProbeConfigs
@@ -0,0 +1,51 @@
+"""
+Local Orchestrator Configurations
+"""
+from dataclasses import dataclass, field
+
+from pydantic_settings import SettingsConfigDict, BaseSettings
+
+from configs.orchestrators_configs import OrchestratorConfigs
+
+
+class LocalBackendServerSettings(BaseSettings):
+    """Local Server Type Dataclass"""
+    backend_server_type: str = "vllm"
+
+    model_config = SettingsConfigDict(
+        env_prefix="LOCAL_",
+        extra="ignore",
+    )
+
+
+class LocalIngressSettings(BaseSettings):
+    """Local Ingress Settings Dataclass"""
+    fast_parsing: bool = False
+
+    model_config = SettingsConfigDict(
+        env_prefix="LOCAL_INGRESS_",
+        extra="ignore",
+    )
+
+
+class LocalFrontendSettings(BaseSettings):
+    """Local Frontend Settings Dataclass"""
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+    log_level: str = "info"
+
+    model_config = SettingsConfigDict(
+        env_prefix="LOCAL_FRONTEND_",
+        extra="ignore",
+    )
+
+
+@OrchestratorConfigs.register("local")
+@dataclass
+class LocalConfigs(OrchestratorConfigs):
+    """Local Orchestrator Configurations Dataclass"""
+    backend_server_settings: LocalBackendServerSettings = field(
+        default_factory=LocalBackendServerSettings)
+    ingress_settings: LocalIngressSettings = field(default_factory=LocalIngressSettings)
+    frontend_settings: LocalFrontendSettings = field(default_factory=LocalFrontendSettings)
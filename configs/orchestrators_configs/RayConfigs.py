@@ -76,9 +76,70 @@ class RayBackendServerSettings(BaseSettings):
     )
 
 
+class RayIngressSettings(BaseSettings):
+    """Ray Ingress Settings Dataclass"""
+    fast_parsing: bool = False
+
+    model_config = SettingsConfigDict(
+        env_prefix="RAY_INGRESS_",
+        extra="ignore",
+    )
+
+
+class RayAutoscalingPolicySettings(BaseSettings):
+    """Ray Engine Load Autoscaling Policy Settings Dataclass
+
+    Per-replica targets of the engine load signals; `None` ignores a signal.
+    """
+    enabled: bool = False
+    kv_cache_utilization: Optional[float] = 0.6
+    waiting_requests: Optional[float] = 2.0
+    queued_prompt_tokens: Optional[float] = 16384.0
+    admission_wait_s: Optional[float] = 1.0
+    admission_waiting: Optional[float] = None
+    event_loop_lag_s: Optional[float] = None
+    ongoing_requests: bool = False
+    max_scale_up_ratio: float = 2.0
+
+    model_config = SettingsConfigDict(
+        env_prefix="RAY_AUTOSCALING_POLICY_",
+        extra="ignore",
+    )
+
+    def policy(self) -> Dict[str, Any]:
+        """`policy` entry of a Ray Serve `autoscaling_config`."""
+        targets = self.model_dump(exclude={"enabled", "ongoing_requests", "max_scale_up_ratio"},
+                                  exclude_none=True)
+        return {
+            "policy_function": "oc_serve.orchestrators.ray.autoscaling:EngineLoadPolicy",
+            "policy_kwargs": {"targets": targets, "ongoing_requests": self.ongoing_requests,
+                              "max_scale_up_ratio": self.max_scale_up_ratio},
+        }
+
+
+class RayPreprocessingSettings(RayDeploymentSettings):
+    """Ray CPU Preprocessing Deployment Settings Dataclass"""
+    enabled: bool = False
+    name: Optional[str] = "OCPreprocessor"
+    ray_actor_options: Optional[Dict[str, Any]] = {"num_cpus": 1, "num_gpus": 0}
+
+    model_config = SettingsConfigDict(
+        env_prefix="RAY_PREPROCESSING_",
+        extra="ignore",
+    )
+
+    def deployment_options(self) -> Dict[str, Any]:
+        """Keyword arguments for `serve.deployment`."""
+        return self.model_dump(exclude_none=True, exclude={"enabled"})
+
+
 @OrchestratorConfigs.register("ray")
 @dataclass
 class RayConfigs(OrchestratorConfigs):
     """Ray Orchestrator Configurations Dataclass"""
     backend_server_settings: RayBackendServerSettings = field(default_factory=RayBackendServerSettings)
     deployment_settings: RayDeploymentSettings = field(default_factory=RayDeploymentSettings)
+    ingress_settings: RayIngressSettings = field(default_factory=RayIngressSettings)
+    preprocessing_settings: RayPreprocessingSettings = field(default_factory=RayPreprocessingSettings)
+    autoscaling_policy_settings: RayAutoscalingPolicySettings = field(
+        default_factory=RayAutoscalingPolicySettings)
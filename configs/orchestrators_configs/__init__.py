@@ -2,4 +2,5 @@
 Orchestrator Configurations Package
 """
 from .OrchestratorConfigs import OrchestratorConfigs
-from .RayConfigs import RayConfigs
\ No newline at end of file
+from .RayConfigs import RayConfigs
+from .LocalConfigs import LocalConfigs
@@ -5,6 +5,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, is_dataclass
 from typing import Callable, ClassVar, Dict, Type, TypeVar
+import importlib
 import inspect
 
 C = TypeVar("C", bound="ServerConfigs")
@@ -18,6 +19,9 @@ class ServerConfigs:
     Get instance via ServerConfigs.get("name")
     """
     _REGISTRY: ClassVar[Dict[str, Type["ServerConfigs"]]] = {}
+    # Built-in configs whose module imports their engine: the name they are
+    # exported under by this package, which imports them on first access.
+    _LAZY_CONFIGS: ClassVar[Dict[str, str]] = {"vllm": "VLLMAsyncEngineArgs"}
 
     @classmethod
     def register(cls, name: str) -> Callable[[Type[C]], Type[C]]:
@@ -46,6 +50,8 @@ class ServerConfigs:
 
     @classmethod
     def _get_class(cls, server_type: str) -> Type["ServerConfigs"]:
+        if server_type not in cls._REGISTRY and server_type in cls._LAZY_CONFIGS:
+            getattr(importlib.import_module(__package__), cls._LAZY_CONFIGS[server_type])
         try:
             return cls._REGISTRY[server_type]
         except KeyError as exc:
@@ -0,0 +1,47 @@
+"""
+Simulated Engine Server Configurations
+"""
+from dataclasses import dataclass, field
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from .ServerConfigs import ServerConfigs
+
+
+class SimEngineSettings(BaseSettings):
+    """Simulated Engine Settings Dataclass
+
+    One engine step takes `step_overhead_s`, plus `prefill_s_per_token` per
+    prompt token prefilled in the step, plus, when sequences are decoding,
+    `decode_s_per_token * (1 + batch_slowdown * (decoding sequences - 1))`.
+    """
+    served_model_name: str = "oc-serve-sim"
+    max_model_len: int = 8192
+    kv_capacity_tokens: int = 131072
+    max_num_seqs: int = 256
+    max_num_batched_tokens: int = 8192
+    prefill_s_per_token: float = 0.00005
+    decode_s_per_token: float = 0.015
+    batch_slowdown: float = 0.005
+    step_overhead_s: float = 0.001
+    chars_per_token: float = 4.0
+    default_max_tokens: int = 256
+    max_concurrent_calls: int = 1024
+    stream_flush_interval_ms: float = 0
+    stream_flush_max_chunks: int = 0
+
+    model_config = SettingsConfigDict(
+        env_prefix="SIM_",
+        extra="ignore",
+    )
+
+
+@ServerConfigs.register("sim")
+@dataclass
+class SimConfigs(ServerConfigs):
+    """Simulated Engine Server Configurations Dataclass"""
+    engine_settings: SimEngineSettings = field(default_factory=SimEngineSettings)
+
+    @classmethod
+    def build(cls):
+        return cls()
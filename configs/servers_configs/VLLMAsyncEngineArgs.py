@@ -31,6 +31,14 @@ _DEFAULT_EXTRA_ARGS: Dict[str, Any] = {
     "vllm_enable_pooling": False,
     "vllm_enable_scoring": False,
     "use_transcribe_server": False,
+    "stream_flush_interval_ms": 0,
+    "stream_flush_max_chunks": 0,
+    "prompt_prefix_cache_max_tokens": 0,
+    "prompt_prefix_cache_max_splits": 4,
+    "warmup_file": None,
+    "warmup_max_tokens": 1,
+    "warmup_concurrency": 4,
+    "preload_servers": [],
 }
 
 @ServerConfigs.register("vllm")
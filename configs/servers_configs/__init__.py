@@ -1,5 +1,19 @@
 """
 Server Configurations Package
+
+`VLLMAsyncEngineArgs` extends vLLM's engine args, so it is imported on first
+access (or by `ServerConfigs.get("vllm")`) rather than with this package.
 """
+import importlib
+
 from .ServerConfigs import ServerConfigs
-from .VLLMAsyncEngineArgs import VLLMAsyncEngineArgs
+from .SimConfigs import SimConfigs, SimEngineSettings
+
+
+def __getattr__(name: str):
+    if name in ServerConfigs._LAZY_CONFIGS.values():
+        value = getattr(importlib.import_module(f"{__name__}.{name}"), name)
+        # Importing the submodule bound its name here; export the class instead.
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
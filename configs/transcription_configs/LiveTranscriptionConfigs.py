@@ -0,0 +1,16 @@
+"""Live (WebSocket) Transcription Configuration Settings for OC-Serve."""
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class LiveTranscriptionConfigs(BaseSettings):
+    """OC-Serve Live Transcription Configuration Settings."""
+    model_config = SettingsConfigDict(env_prefix="OC_LIVE_TRANSCRIPTION_", case_sensitive=False)
+
+    sample_rate: int = Field(default=16000)
+    step_ms: int = Field(default=1000)
+    max_window_ms: int = Field(default=15000)
+    silence_ms: int = Field(default=600)
+    silence_threshold: float = Field(default=0.01)
+    latency_budget_ms: int = Field(default=1500)
+    ffmpeg_path: str = Field(default="ffmpeg")
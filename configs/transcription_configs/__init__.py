@@ -0,0 +1 @@
+from .LiveTranscriptionConfigs import LiveTranscriptionConfigs
@@ -1,2 +1,9 @@
 """Main module for OC Serve."""
+import time
+
+_import_started = time.perf_counter()
+
 from .OCServe import OCServe
+from .utils import startup_timer
+
+startup_timer.record("import", time.perf_counter() - _import_started)
@@ -1,6 +1,9 @@
 """OC-Serve API Package"""
 from .api import RootAPI
 from .models import *
+from .responses import FastJSONResponse, SSEResponse, AudioStreamResponse, speech_response
+from .ingest import RequestParser, json_body, parsed_body
+from .admin import ProfilerAdmin
 
 root_api_app = RootAPI(
     api_kwargs={
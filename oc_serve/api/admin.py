@@ -0,0 +1,62 @@
+"""Authenticated admin endpoints for OC-Serve replicas."""
+import hmac
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+
+from oc_serve.api.responses import FastJSONResponse
+from oc_serve.utils.profiler import Profiler
+
+
+def _error(message: str, status_code: int) -> Response:
+    return FastJSONResponse(content={"error": {"message": message, "type": "admin_error"}},
+                            status_code=status_code)
+
+
+class ProfilerAdmin:
+    """
+    Handlers of the `/admin/profile` endpoints.
+
+    Requests must carry `Authorization: Bearer <OC_PROFILER_ADMIN_TOKEN>`;
+    without a configured token the endpoints answer 404.
+    """
+    def __init__(self, profiler: Optional[Profiler] = None):
+        self.profiler = profiler or Profiler()
+        token = self.profiler.configs.admin_token
+        self.token = token.get_secret_value().encode("utf-8") if token is not None else None
+
+    def _check(self, raw_request: Request) -> Optional[Response]:
+        if self.token is None:
+            return _error("Admin endpoints are disabled on this server.", 404)
+        scheme, _, credentials = raw_request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(
+                credentials.strip().encode("utf-8"), self.token):
+            return _error("Invalid admin token.", 401)
+        return None
+
+    async def profile(self, raw_request: Request) -> Response:
+        """`POST /admin/profile?kind=cpu|memory|tasks&seconds=10`"""
+        error = self._check(raw_request)
+        if error is not None:
+            return error
+        kind = raw_request.query_params.get("kind", "cpu")
+        try:
+            seconds = float(raw_request.query_params.get("seconds", 10))
+        except ValueError:
+            return _error("seconds must be a number.", 400)
+        if self.profiler.busy:
+            return _error("A profile is already running on this replica.", 409)
+        try:
+            output = await self.profiler.profile(kind, seconds)
+        except ValueError as exc:
+            return _error(str(exc), 400)
+        return PlainTextResponse(output)
+
+    async def request_profile(self, raw_request: Request) -> Response:
+        """`GET /admin/profile/requests?reset=1`: stacks of sampled `/instruct` requests."""
+        error = self._check(raw_request)
+        if error is not None:
+            return error
+        reset = raw_request.query_params.get("reset", "0").lower() in ("1", "true")
+        return PlainTextResponse(self.profiler.request_profile(reset=reset))
@@ -1,6 +1,11 @@
 """Root API Application for OC-Serve"""
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+
+from oc_serve.api.middleware import RequestIdMiddleware
+from oc_serve.api.idempotency import IdempotencyMiddleware
+from oc_serve.api.capture import TrafficCaptureMiddleware
+from oc_serve.api.ingest import body_schemas
 from typing import Dict, Any
 
 
@@ -28,3 +33,14 @@ class RootAPI(FastAPI):
                             allow_methods=["*"],
                             allow_headers=["*"],
                             allow_credentials=True)
+        self.add_middleware(IdempotencyMiddleware)
+        self.add_middleware(TrafficCaptureMiddleware)
+        self.add_middleware(RequestIdMiddleware)
+
+    def openapi(self) -> Dict[str, Any]:
+        """OpenAPI schema, with the bodies documented by `ingest.json_body` in its components."""
+        if self.openapi_schema is None:
+            schemas = super().openapi().setdefault("components", {}).setdefault("schemas", {})
+            for name, schema in body_schemas.items():
+                schemas.setdefault(name, schema)
+        return self.openapi_schema
@@ -0,0 +1,255 @@
+"""Sampled traffic capture to rotating, gzip-compressed JSONL files.
+
+A sampled request is recorded once its response has been sent, as one
+JSON line:
+
+    {"ts": 1760000000.123, "method": "POST", "path": "/instruct",
+     "request_id": "...", "body": {...}, "status": 200, "stream": true,
+     "first_byte_s": 0.212, "latency_s": 3.87, "response_bytes": 10240}
+
+`ts` is the arrival time (`time.time()`), `first_byte_s` the time to the
+first response body byte (the time to first token of a stream) and
+`latency_s` the time to the last one. Only JSON bodies are recorded, after
+redaction. The middleware only copies the body and hands the record to a
+queue; redaction, serialization, compression and file I/O run on a
+background thread, and records are dropped when its queue is full.
+
+The active file is written as `*.jsonl.gz.part` and renamed to
+`*.jsonl.gz` when it is rotated, so every `*.jsonl.gz` file is complete.
+"""
+import atexit
+import gzip
+import os
+import queue
+import random
+import re
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from prometheus_client import Counter
+
+from configs import TrafficCaptureConfigs
+from oc_serve.utils import oc_logger, json_dumps, json_loads
+from oc_serve.utils.logger import REQUEST_ID
+
+CAPTURED_REQUESTS = Counter(
+    "oc_serve_traffic_capture_records",
+    "Sampled requests by capture outcome (written, dropped on a full queue, "
+    "skipped for a non-JSON or oversized body, failed to write).",
+    ["outcome"],
+)
+
+_CONTENT_TYPE_HEADER = b"content-type"
+_EVENT_STREAM = b"text/event-stream"
+_REDACTED = "[REDACTED]"
+_SUFFIX = ".jsonl.gz"
+
+
+class Redactor:
+    """Replaces the values of `fields` and the matches of `patterns` in a JSON document."""
+    def __init__(self, fields, patterns: Dict[str, str]):
+        self.fields = frozenset(fields)
+        self.patterns = [(re.compile(pattern), f"[{name.upper()}]")
+                         for name, pattern in patterns.items()]
+
+    def __call__(self, value: Any) -> Any:
+        if isinstance(value, str):
+            for pattern, replacement in self.patterns:
+                value = pattern.sub(replacement, value)
+            return value
+        if isinstance(value, dict):
+            return {key: _REDACTED if key in self.fields else self(item)
+                    for key, item in value.items()}
+        if isinstance(value, list):
+            return [self(item) for item in value]
+        return value
+
+
+class TrafficRecorder:
+    """
+    Writes records to rotating gzip JSONL files from a background thread.
+
+    A file is rotated once it holds `max_file_bytes` compressed bytes or is
+    `max_file_age_s` old; only the newest `max_files` complete files in
+    `dir` are kept. The thread starts with the first record.
+    """
+    def __init__(self, configs: Optional[TrafficCaptureConfigs] = None):
+        self.configs = configs or TrafficCaptureConfigs()
+        self.logger = oc_logger.get_logger("capture")
+        self.redact = Redactor(self.configs.redact_fields, self.configs.redact_patterns)
+        self.queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(self.configs.queue_size)
+        self.prefix = f"capture-{socket.gethostname()}-{os.getpid()}"
+        self.sequence = 0
+        self.path: Optional[str] = None
+        self.file = None
+        self.opened_at = 0.0
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def record(self, record: Dict[str, Any]) -> None:
+        """Queue `record` (with its raw `body` bytes) for writing; never blocks."""
+        if self.thread is None:
+            self._start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            CAPTURED_REQUESTS.labels("dropped").inc()
+
+    def _start(self) -> None:
+        with self.lock:
+            if self.thread is not None:
+                return
+            os.makedirs(self.configs.dir, exist_ok=True)
+            self.thread = threading.Thread(target=self._run, name="oc-traffic-capture", daemon=True)
+            self.thread.start()
+            atexit.register(self.close)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write what is queued, finish the active file and stop the thread."""
+        if self.thread is None or not self.thread.is_alive():
+            return
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            timeout = None
+            if self.file is not None:
+                timeout = max(0.0, self.opened_at + self.configs.max_file_age_s - time.monotonic())
+            try:
+                record = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                self._rotate()
+                continue
+            if record is None:
+                self._rotate()
+                return
+            try:
+                self._write(record)
+            except Exception:  # pylint: disable=broad-except
+                CAPTURED_REQUESTS.labels("failed").inc()
+                self.logger.exception("Failed to write a captured request")
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        try:
+            record["body"] = self.redact(json_loads(record["body"]))
+        except ValueError:
+            CAPTURED_REQUESTS.labels("skipped").inc()
+            return
+        if self.file is None:
+            self._open()
+        self.file.write(json_dumps(record) + b"\n")
+        CAPTURED_REQUESTS.labels("written").inc()
+        if self.file.fileobj.tell() >= self.configs.max_file_bytes:
+            self._rotate()
+
+    def _open(self) -> None:
+        self.sequence += 1
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        self.path = os.path.join(self.configs.dir,
+                                 f"{self.prefix}-{stamp}-{self.sequence:05d}{_SUFFIX}")
+        self.file = gzip.open(self.path + ".part", "wb")
+        self.opened_at = time.monotonic()
+
+    def _rotate(self) -> None:
+        if self.file is None:
+            return
+        self.file.close()
+        os.replace(self.path + ".part", self.path)
+        self.file = None
+        self._prune()
+
+    def _prune(self) -> None:
+        paths = [os.path.join(self.configs.dir, name) for name in os.listdir(self.configs.dir)
+                 if name.startswith("capture-") and name.endswith(_SUFFIX)]
+        if len(paths) <= self.configs.max_files:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.configs.max_files]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class TrafficCaptureMiddleware:
+    """
+    Record a sample of requests, per path, with their latencies.
+
+    Unsampled requests pass straight through. Sampled ones have their body
+    copied as it is received, and the response's status, time to first
+    byte and time to last byte observed as it is sent.
+    """
+    def __init__(self, app, configs: Optional[TrafficCaptureConfigs] = None,
+                 recorder: Optional[TrafficRecorder] = None):
+        self.app = app
+        self.configs = configs or TrafficCaptureConfigs()
+        self.sample_rates = self.configs.sample_rates if self.configs.enabled else {}
+        self.recorder = recorder
+        if self.recorder is None and self.sample_rates:
+            self.recorder = TrafficRecorder(self.configs)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rate = self.sample_rates.get(scope["path"])
+        if not rate or random.random() >= rate:
+            await self.app(scope, receive, send)
+            return
+
+        arrival = time.time()
+        started = time.perf_counter()
+        chunks = []
+        body_size = 0
+        status = None
+        stream = False
+        first_byte = None
+        response_bytes = 0
+
+        async def capture_receive():
+            nonlocal body_size
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                body_size += len(body)
+                if body and body_size <= self.configs.max_body_bytes:
+                    chunks.append(body)
+            return message
+
+        async def capture_send(message):
+            nonlocal status, stream, first_byte, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for key, value in message.get("headers", ()):
+                    if key == _CONTENT_TYPE_HEADER:
+                        stream = value.startswith(_EVENT_STREAM)
+                        break
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                if body and first_byte is None:
+                    first_byte = time.perf_counter()
+                response_bytes += len(body)
+            await send(message)
+
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            finished = time.perf_counter()
+            if body_size > self.configs.max_body_bytes:
+                CAPTURED_REQUESTS.labels("skipped").inc()
+            else:
+                self.recorder.record({
+                    "ts": arrival,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "request_id": REQUEST_ID.get(),
+                    "body": b"".join(chunks),
+                    "status": status,
+                    "stream": stream,
+                    "first_byte_s": None if first_byte is None else first_byte - started,
+                    "latency_s": finished - started,
+                    "response_bytes": response_bytes,
+                })
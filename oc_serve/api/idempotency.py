@@ -0,0 +1,386 @@
+"""Idempotency keys: at most one execution per `Idempotency-Key`.
+
+A request carrying an `Idempotency-Key` header runs detached from its
+client. Retries with the same key attach to the in-flight execution
+(receiving everything produced so far, then the rest as it is produced)
+or, once it has finished, replay the stored response until `ttl_s`
+expires. Keys are scoped by path and `Authorization` header; reusing a key
+with a different body is answered with 422.
+
+Executions and stores are per replica: a retry routed to another replica
+only finds the result with a `disk` store on a directory shared by both.
+"""
+import asyncio
+import hashlib
+import os
+import struct
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, ClassVar, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from prometheus_client import Counter
+
+from configs import IdempotencyConfigs
+from oc_serve.utils import oc_logger, json_dumps, json_loads
+
+IDEMPOTENT_REQUESTS = Counter(
+    "oc_serve_idempotent_requests",
+    "Requests with an Idempotency-Key, by outcome "
+    "(executed, attached to an in-flight execution, replayed from the store, conflict).",
+    ["outcome"],
+)
+
+_IDEMPOTENCY_KEY_HEADER = b"idempotency-key"
+_AUTHORIZATION_HEADER = b"authorization"
+_REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+
+
+class StoredResponse(NamedTuple):
+    """A finished response; `expires_at` is a `time.time()` timestamp."""
+    fingerprint: str
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(key) + len(value) for key, value in self.headers)
+
+
+class IdempotencyStore(ABC):
+    """Bounded, expiring store of finished responses, by key."""
+
+    _REGISTRY: ClassVar[Dict[str, Type["IdempotencyStore"]]] = {}
+
+    @classmethod
+    def register(cls, name: str) -> Callable[[Type["IdempotencyStore"]], Type["IdempotencyStore"]]:
+        """Register a concrete store under `name` (the `OC_IDEMPOTENCY_STORE` value)."""
+        def deco(store_cls):
+            if name in cls._REGISTRY:
+                raise KeyError(f"Idempotency store '{name}' already registered")
+            cls._REGISTRY[name] = store_cls
+            return store_cls
+        return deco
+
+    @classmethod
+    def get(cls, configs: IdempotencyConfigs) -> "IdempotencyStore":
+        try:
+            store_cls = cls._REGISTRY[configs.store]
+        except KeyError as exc:
+            raise ValueError(f"Unsupported idempotency store: {configs.store}. "
+                             f"Available: {sorted(cls._REGISTRY.keys())}") from exc
+        return store_cls(configs)
+
+    @abstractmethod
+    def __init__(self, configs: IdempotencyConfigs):
+        pass
+
+    @abstractmethod
+    async def load(self, key: str) -> Optional[StoredResponse]:
+        """The unexpired response stored under `key`, if any."""
+
+    @abstractmethod
+    async def save(self, key: str, response: StoredResponse) -> None:
+        """Store `response`, evicting the oldest entries beyond the store's bounds."""
+
+
+@IdempotencyStore.register("memory")
+class MemoryIdempotencyStore(IdempotencyStore):
+    """In-process LRU bounded by `max_entries` and `max_bytes`."""
+    def __init__(self, configs: IdempotencyConfigs):
+        self.configs = configs
+        self.entries: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self.size = 0
+
+    async def load(self, key: str) -> Optional[StoredResponse]:
+        response = self.entries.get(key)
+        if response is None:
+            return None
+        if response.expires_at <= time.time():
+            self._pop(key)
+            return None
+        self.entries.move_to_end(key)
+        return response
+
+    async def save(self, key: str, response: StoredResponse) -> None:
+        if response.size > self.configs.max_bytes:
+            return
+        if key in self.entries:
+            self._pop(key)
+        self.entries[key] = response
+        self.size += response.size
+        while self.entries and (len(self.entries) > self.configs.max_entries
+                                or self.size > self.configs.max_bytes):
+            self._pop(next(iter(self.entries)))
+
+    def _pop(self, key: str) -> None:
+        self.size -= self.entries.pop(key).size
+
+
+@IdempotencyStore.register("disk")
+class DiskIdempotencyStore(IdempotencyStore):
+    """
+    One file per key in `disk_dir`, bounded by `max_entries` and `max_bytes`.
+
+    Entries survive replica restarts and can be shared by replicas that
+    mount the same directory. The directory is the index: every save
+    rescans it, so the bounds cover entries written by all of them. File
+    I/O runs in worker threads.
+    """
+    _HEADER = struct.Struct("!I")
+
+    def __init__(self, configs: IdempotencyConfigs):
+        self.configs = configs
+        os.makedirs(configs.disk_dir, exist_ok=True)
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        """`(mtime, key, size)` of the stored entries, oldest first."""
+        entries = []
+        for entry in os.scandir(self.configs.disk_dir):
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, entry.name, stat.st_size))
+        return sorted(entries)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.configs.disk_dir, key)
+
+    def _read(self, key: str) -> Optional[StoredResponse]:
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        (meta_length,) = self._HEADER.unpack_from(data)
+        meta_end = self._HEADER.size + meta_length
+        fingerprint, status, expires_at, headers = _decode_meta(data[self._HEADER.size:meta_end])
+        return StoredResponse(fingerprint, status, headers, data[meta_end:], expires_at)
+
+    def _write(self, key: str, response: StoredResponse) -> None:
+        meta = _encode_meta(response)
+        path = self._path(key)
+        with open(path + ".tmp", "wb") as f:
+            f.write(self._HEADER.pack(len(meta)))
+            f.write(meta)
+            f.write(response.body)
+        os.replace(path + ".tmp", path)
+
+    def _save(self, key: str, response: StoredResponse) -> None:
+        self._write(key, response)
+        entries = self._scan()
+        count, size = len(entries), sum(entry_size for _, _, entry_size in entries)
+        for _, name, entry_size in entries:
+            if count <= self.configs.max_entries and size <= self.configs.max_bytes:
+                break
+            self._unlink(name)
+            count, size = count - 1, size - entry_size
+
+    def _unlink(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    async def load(self, key: str) -> Optional[StoredResponse]:
+        response = await asyncio.to_thread(self._read, key)
+        if response is not None and response.expires_at <= time.time():
+            await asyncio.to_thread(self._unlink, key)
+            return None
+        return response
+
+    async def save(self, key: str, response: StoredResponse) -> None:
+        if response.size > self.configs.max_bytes:
+            return
+        await asyncio.to_thread(self._save, key, response)
+
+
+def _encode_meta(response: StoredResponse) -> bytes:
+    return json_dumps({
+        "fingerprint": response.fingerprint,
+        "status": response.status,
+        "expires_at": response.expires_at,
+        "headers": [[key.decode("latin-1"), value.decode("latin-1")]
+                    for key, value in response.headers],
+    })
+
+
+def _decode_meta(data: bytes):
+    meta = json_loads(data)
+    headers = [(key.encode("latin-1"), value.encode("latin-1")) for key, value in meta["headers"]]
+    return meta["fingerprint"], meta["status"], meta["expires_at"], headers
+
+
+class _Execution:
+    """Messages sent by one detached execution, replayable to any number of clients."""
+    __slots__ = ("fingerprint", "messages", "done", "changed", "task")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.messages: List[dict] = []
+        self.done = False
+        self.changed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    async def record(self, message: dict) -> None:
+        self.messages.append(message)
+        self.wake()
+
+    def wake(self) -> None:
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    async def replay(self, send, replayed: bool) -> None:
+        index = 0
+        while True:
+            changed = self.changed
+            while index < len(self.messages):
+                message = self.messages[index]
+                index += 1
+                if replayed and message["type"] == "http.response.start":
+                    message = {**message, "headers": [*message.get("headers", []), _REPLAYED_HEADER]}
+                await send(message)
+            if self.done:
+                return
+            await changed.wait()
+
+    def response(self, expires_at: float) -> Optional[StoredResponse]:
+        """The finished response, if it completed."""
+        if not self.messages or self.messages[0]["type"] != "http.response.start":
+            return None
+        if self.messages[-1].get("more_body", False):
+            return None
+        start = self.messages[0]
+        body = b"".join(message.get("body", b"") for message in self.messages[1:])
+        return StoredResponse(self.fingerprint, start["status"], list(start.get("headers", [])),
+                              body, expires_at)
+
+
+async def _send_json(send, status: int, content: dict, headers=()) -> None:
+    body = json_dumps(content)
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode("latin-1")), *headers]})
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware deduplicating requests that carry an `Idempotency-Key`.
+
+    Only POST requests to `OC_IDEMPOTENCY_PATHS` are considered. A keyed
+    request runs in its own task and keeps running if its client goes
+    away, so a retry after a client timeout attaches to it instead of
+    starting over. Responses with a 5xx status are not stored.
+    """
+    def __init__(self, app, configs: Optional[IdempotencyConfigs] = None):
+        self.app = app
+        self.configs = configs or IdempotencyConfigs()
+        self.paths = frozenset(self.configs.paths)
+        self.logger = oc_logger.get_logger("idempotency")
+        self.store = IdempotencyStore.get(self.configs) if self.configs.enabled else None
+        self.inflight: Dict[str, _Execution] = {}
+
+    async def __call__(self, scope, receive, send):
+        if (self.store is None or scope["type"] != "http" or scope["method"] != "POST"
+                or scope["path"] not in self.paths):
+            await self.app(scope, receive, send)
+            return
+        idempotency_key = authorization = None
+        for name, value in scope["headers"]:
+            if name == _IDEMPOTENCY_KEY_HEADER:
+                idempotency_key = value
+            elif name == _AUTHORIZATION_HEADER:
+                authorization = value
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > self.configs.max_key_length:
+            await _send_json(send, 400, {"error": {
+                "message": f"Idempotency-Key must be 1 to {self.configs.max_key_length} characters.",
+                "type": "invalid_idempotency_key"}})
+            return
+
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+        body = bytes(body)
+        key = hashlib.sha256(b"\0".join(
+            (scope["path"].encode("utf-8"), idempotency_key, authorization or b""))).hexdigest()
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        execution = self.inflight.get(key)
+        if execution is None:
+            stored = await self.store.load(key)
+            if stored is not None:
+                if stored.fingerprint != fingerprint:
+                    await self._conflict(send)
+                    return
+                IDEMPOTENT_REQUESTS.labels("replayed").inc()
+                await send({"type": "http.response.start", "status": stored.status,
+                            "headers": [*stored.headers, _REPLAYED_HEADER]})
+                await send({"type": "http.response.body", "body": stored.body})
+                return
+            execution = self.inflight.get(key)
+        if execution is not None:
+            if execution.fingerprint != fingerprint:
+                await self._conflict(send)
+                return
+            IDEMPOTENT_REQUESTS.labels("attached").inc()
+            await execution.replay(send, replayed=True)
+            return
+
+        IDEMPOTENT_REQUESTS.labels("executed").inc()
+        execution = self.inflight[key] = _Execution(fingerprint)
+        execution.task = asyncio.get_running_loop().create_task(
+            self._execute(scope, body, key, execution))
+        await execution.replay(send, replayed=False)
+
+    async def _conflict(self, send) -> None:
+        IDEMPOTENT_REQUESTS.labels("conflict").inc()
+        await _send_json(send, 422, {"error": {
+            "message": "Idempotency-Key was already used with a different request body.",
+            "type": "idempotency_key_reused"}})
+
+    async def _execute(self, scope, body: bytes, key: str, execution: _Execution) -> None:
+        """Run the request to completion, whether or not any client is still listening."""
+        delivered = False
+
+        async def receive():
+            nonlocal delivered
+            if delivered:
+                # Never report a disconnect: the execution outlives its clients.
+                await asyncio.get_running_loop().create_future()
+            delivered = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        try:
+            await self.app(scope, receive, execution.record)
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception("Idempotent request failed")
+            if not execution.messages:
+                await _send_json(execution.record, 500, {"error": {
+                    "message": "Internal server error.", "type": "internal_error"}})
+            elif execution.messages[-1].get("more_body", False):
+                await execution.record({"type": "http.response.body", "body": b"",
+                                        "more_body": False})
+        finally:
+            try:
+                response = execution.response(time.time() + self.configs.ttl_s)
+                if response is not None and response.status < 500:
+                    await self.store.save(key, response)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception("Could not store idempotent response")
+            execution.done = True
+            execution.wake()
+            self.inflight.pop(key, None)
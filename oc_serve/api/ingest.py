@@ -0,0 +1,113 @@
+"""Request body parsing for OC-Serve ingress routes."""
+import json
+from typing import Any, Callable, Dict, Optional, Type, TypeVar
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from starlette.requests import Request
+
+from oc_serve.utils import request_timer
+
+M = TypeVar("M", bound=BaseModel)
+
+_REF_TEMPLATE = "#/components/schemas/{model}"
+
+# Schemas of the bodies documented by `json_body`, merged into the OpenAPI
+# `components/schemas` by `RootAPI.openapi`.
+body_schemas: Dict[str, Dict[str, Any]] = {}
+
+
+def json_body(model_cls: Type[BaseModel], fast: bool = True) -> Optional[Dict[str, Any]]:
+    """OpenAPI `openapi_extra` documenting the body of a `parsed_body(model_cls, fast)` route.
+
+    Returns `None` when `fast` is off, as FastAPI then documents the typed body itself.
+    """
+    if not fast:
+        return None
+    if model_cls.__name__ not in body_schemas:
+        schema = model_cls.model_json_schema(ref_template=_REF_TEMPLATE)
+        body_schemas.update(schema.pop("$defs", {}))
+        body_schemas[model_cls.__name__] = schema
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": _REF_TEMPLATE.format(model=model_cls.__name__)},
+                },
+            },
+        },
+    }
+
+
+def parsed_body(model_cls: Type[BaseModel], fast: bool) -> Callable:
+    """
+    Route decorator for an `(self, request, raw_request)` endpoint taking a `model_cls` body.
+
+    Without `fast` the endpoint is left as is and FastAPI validates the typed
+    `request` body. With `fast` the route only takes `raw_request`, whose body
+    is parsed with `RequestParser(fast=True)` before calling the endpoint;
+    register it with `openapi_extra=json_body(model_cls, fast)`.
+    """
+    def deco(endpoint: Callable) -> Callable:
+        if not fast:
+            return endpoint
+        parser = RequestParser(fast=True)
+
+        async def route(self, raw_request: Request):
+            with request_timer.stage(endpoint.__name__, "parse"):
+                request = await parser.parse(model_cls, raw_request)
+            return await endpoint(self, request, raw_request)
+
+        route.__name__ = endpoint.__name__
+        route.__qualname__ = endpoint.__qualname__
+        route.__doc__ = endpoint.__doc__
+        return route
+    return deco
+
+
+class RequestParser:
+    """
+    Parses raw JSON request bodies into protocol models.
+
+    With `fast=False` the body is decoded with `json.loads` and validated with
+    `model_validate`, which is what FastAPI does for a body parameter. With
+    `fast=True` the raw bytes go straight through pydantic-core's compiled
+    JSON decoder and validator (`model_validate_json`), so no intermediate
+    Python dict tree is built. If the fast path rejects a body it is re-run
+    through full validation, so clients get the same 422 errors either way.
+    """
+    def __init__(self, fast: bool = False):
+        self.fast = fast
+
+    async def parse(self, model_cls: Type[M], raw_request: Request) -> M:
+        """Read and validate the body of `raw_request` as `model_cls`."""
+        body = await raw_request.body()
+        if self.fast:
+            try:
+                return model_cls.model_validate_json(body)
+            except (ValidationError, ValueError):
+                pass
+        return self.validate(model_cls, body)
+
+    @staticmethod
+    def validate(model_cls: Type[M], body: bytes) -> M:
+        """Full validation path, raising FastAPI-compatible validation errors."""
+        try:
+            data = json.loads(body)
+        except ValueError as exc:
+            # `json.JSONDecodeError`, or `UnicodeDecodeError` for a body that is not UTF-8.
+            raise RequestValidationError(
+                [{"type": "json_invalid",
+                  "loc": ("body", getattr(exc, "pos", getattr(exc, "start", 0))),
+                  "msg": "JSON decode error",
+                  "input": {},
+                  "ctx": {"error": getattr(exc, "msg", getattr(exc, "reason", str(exc)))}}],
+                body=body,
+            ) from exc
+        try:
+            return model_cls.model_validate(data)
+        except ValidationError as exc:
+            errors = [{**err, "loc": ("body", *err["loc"])}
+                      for err in exc.errors(include_url=False)]
+            raise RequestValidationError(errors, body=data) from exc
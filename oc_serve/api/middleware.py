@@ -0,0 +1,44 @@
+"""ASGI middlewares of the OC-Serve API."""
+import uuid
+
+from oc_serve.utils.logger import REQUEST_ID
+
+_REQUEST_ID_HEADER = b"x-request-id"
+
+
+class RequestIdMiddleware:
+    """
+    Bind each request's id to `REQUEST_ID` so log records carry it.
+
+    The id is taken from the `X-Request-Id` header (set by the Ray Serve
+    proxy, or by the client) or generated, in which case it is also
+    returned in the response's `X-Request-Id` header.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        request_id = None
+        for key, value in scope["headers"]:
+            if key == _REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")[:128]
+                break
+        send_with_id = send
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+            async def send_with_id(message):
+                if message["type"] == "http.response.start":
+                    message.setdefault("headers", [])
+                    message["headers"] = [*message["headers"],
+                                          (_REQUEST_ID_HEADER, request_id.encode("latin-1"))]
+                await send(message)
+
+        token = REQUEST_ID.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            REQUEST_ID.reset(token)
@@ -1,39 +1,74 @@
-"""OC-Serve API Models Module."""
+"""OC-Serve API Models Module.
+
+The vLLM protocol models re-exported here are imported on first access, so
+importing this module does not pull in vLLM. Without vLLM installed they are
+the models of `oc_serve.api.openai_protocol` instead.
+"""
+import importlib
 import time
+import uuid
 from typing import Union, List, Literal, Optional
 
 from starlette.requests import Request
 from starlette.responses import Response, StreamingResponse, JSONResponse
+from starlette.websockets import WebSocket
 from fastapi import Form
-from pydantic import Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict
 from openai._types import NOT_GIVEN
-from vllm.entrypoints.openai.protocol import (
-    OpenAIBaseModel,
-    ChatCompletionRequest,
-    ChatCompletionResponse,
-    CompletionRequest,
-    CompletionResponse,
-    DetokenizeRequest,
-    DetokenizeResponse,
-    ErrorResponse,
-    TokenizeRequest,
-    TokenizeResponse,
-    ScoreRequest,
-    ScoreResponse,
-    PoolingRequest,
-    PoolingResponse,
-    TranscriptionRequest,
-)
-from vllm.utils import random_uuid
-
-
-class UsageInfoTranscriptionModels(OpenAIBaseModel):
+
+_PROTOCOL_MODULE = "vllm.entrypoints.openai.protocol"
+_FALLBACK_PROTOCOL_MODULE = "oc_serve.api.openai_protocol"
+_PROTOCOL_NAMES = {
+    "OpenAIBaseModel",
+    "ChatCompletionRequest",
+    "ChatCompletionResponse",
+    "CompletionRequest",
+    "CompletionResponse",
+    "DetokenizeRequest",
+    "DetokenizeResponse",
+    "ErrorResponse",
+    "TokenizeRequest",
+    "TokenizeResponse",
+    "ScoreRequest",
+    "ScoreResponse",
+    "StreamOptions",
+    "PoolingRequest",
+    "PoolingResponse",
+    "TranscriptionRequest",
+}
+
+
+def __getattr__(name: str):
+    if name in _PROTOCOL_NAMES:
+        try:
+            protocol = importlib.import_module(_PROTOCOL_MODULE)
+        except ModuleNotFoundError as exc:
+            if exc.name != "vllm":
+                raise
+            protocol = importlib.import_module(_FALLBACK_PROTOCOL_MODULE)
+        value = getattr(protocol, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def random_uuid() -> str:
+    """Random hex id, as used by vLLM for response ids."""
+    return uuid.uuid4().hex
+
+
+class OCBaseModel(BaseModel):
+    """Base model for OC-Serve API models; like vLLM's, extra fields are allowed."""
+    model_config = ConfigDict(extra="allow")
+
+
+class UsageInfoTranscriptionModels(OCBaseModel):
     """Usage information for transcription models."""
     transcription_tokens: int = 0
     input_audio_duration: float = 0
 
 
-class TranscribeResponseData(OpenAIBaseModel):
+class TranscribeResponseData(OCBaseModel):
     """Response data for transcription models."""
     index: int
     object: str = "text"
@@ -48,13 +83,13 @@ class TranscribeResponseData(OpenAIBaseModel):
     no_speech_prob: Optional[float] = None
 
 
-class UsageInfoSpeechModels(OpenAIBaseModel):
+class UsageInfoSpeechModels(OCBaseModel):
     """Usage information for speech synthesis models."""
     prompt_tokens: int = 0
     synthesis_duration: float = 0
 
 
-class SpeechResponseData(OpenAIBaseModel):
+class SpeechResponseData(OCBaseModel):
     """Response data for speech synthesis models."""
     model_config = ConfigDict(extra="ignore")
 
@@ -64,7 +99,7 @@ class SpeechResponseData(OpenAIBaseModel):
     url: str = None
 
 
-class SpeechResponse(OpenAIBaseModel):
+class SpeechResponse(OCBaseModel):
     """Response model for speech synthesis models."""
     id: str = Field(default_factory=lambda: f"aud-{random_uuid()}")
     object: str = "list"
@@ -72,3 +107,14 @@ class SpeechResponse(OpenAIBaseModel):
     model: str
     data: Union[List[SpeechResponseData], List[TranscribeResponseData]]
     usage: Union[UsageInfoSpeechModels, UsageInfoTranscriptionModels] = NOT_GIVEN
+
+
+class SpeechRequest(OCBaseModel):
+    """Speech synthesis request, following OpenAI's `audio.speech.create`."""
+    model: Optional[str] = None
+    input: str = Field(min_length=1)
+    voice: Optional[str] = None
+    instructions: Optional[str] = None
+    response_format: Literal["pcm", "wav", "opus"] = "wav"
+    speed: float = Field(default=1.0, ge=0.25, le=4.0)
+    stream: bool = True
@@ -0,0 +1,154 @@
+"""OpenAI protocol models used when vLLM is not installed.
+
+`oc_serve.api.models` re-exports vLLM's protocol models when vLLM is
+available and these otherwise, so CPU-only backends (`sim`) and the
+orchestrators run without vLLM and torch. They cover the fields OC-Serve
+reads; like vLLM's models they accept any other field.
+"""
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import UploadFile
+from pydantic import BaseModel, ConfigDict, Field
+
+
+def _random_id() -> str:
+    return uuid.uuid4().hex
+
+
+class OpenAIBaseModel(BaseModel):
+    """Base of the OpenAI protocol models; extra fields are allowed."""
+    model_config = ConfigDict(extra="allow")
+
+
+class StreamOptions(OpenAIBaseModel):
+    include_usage: Optional[bool] = True
+    continuous_usage_stats: Optional[bool] = False
+
+
+class ChatCompletionRequest(OpenAIBaseModel):
+    messages: List[Dict[str, Any]]
+    model: Optional[str] = None
+    max_tokens: Optional[int] = Field(default=None, ge=1)
+    max_completion_tokens: Optional[int] = Field(default=None, ge=1)
+    n: Optional[int] = Field(default=1, ge=1)
+    temperature: Optional[float] = None
+    top_p: Optional[float] = None
+    stop: Optional[Union[str, List[str]]] = None
+    seed: Optional[int] = None
+    stream: Optional[bool] = False
+    stream_options: Optional[StreamOptions] = None
+    tools: Optional[List[Dict[str, Any]]] = None
+    tool_choice: Optional[Union[str, Dict[str, Any]]] = "none"
+
+
+class CompletionRequest(OpenAIBaseModel):
+    prompt: Optional[Union[List[int], List[List[int]], str, List[str]]] = None
+    model: Optional[str] = None
+    max_tokens: Optional[int] = Field(default=16, ge=1)
+    n: Optional[int] = Field(default=1, ge=1)
+    temperature: Optional[float] = None
+    top_p: Optional[float] = None
+    stop: Optional[Union[str, List[str]]] = None
+    seed: Optional[int] = None
+    echo: Optional[bool] = False
+    stream: Optional[bool] = False
+    stream_options: Optional[StreamOptions] = None
+
+
+class TokenizeRequest(OpenAIBaseModel):
+    model: Optional[str] = None
+    prompt: Optional[str] = None
+    messages: Optional[List[Dict[str, Any]]] = None
+    add_special_tokens: bool = True
+
+
+class DetokenizeRequest(OpenAIBaseModel):
+    model: Optional[str] = None
+    tokens: List[int]
+
+
+class ScoreRequest(OpenAIBaseModel):
+    model: Optional[str] = None
+    text_1: Union[str, List[str]]
+    text_2: Union[str, List[str]]
+
+
+class PoolingRequest(OpenAIBaseModel):
+    model: Optional[str] = None
+    input: Union[str, List[str], List[int], List[List[int]]]
+    encoding_format: str = "float"
+    dimensions: Optional[int] = None
+
+
+class TranscriptionRequest(OpenAIBaseModel):
+    file: UploadFile
+    model: Optional[str] = None
+    language: Optional[str] = None
+    prompt: str = ""
+    response_format: str = "json"
+    temperature: float = 0.0
+
+
+class ErrorInfo(OpenAIBaseModel):
+    message: str
+    type: str
+    param: Optional[str] = None
+    code: int
+
+
+class ErrorResponse(OpenAIBaseModel):
+    error: ErrorInfo
+
+
+class UsageInfo(OpenAIBaseModel):
+    prompt_tokens: int = 0
+    completion_tokens: Optional[int] = 0
+    total_tokens: int = 0
+
+
+class ChatCompletionResponse(OpenAIBaseModel):
+    id: str = Field(default_factory=lambda: f"chatcmpl-{_random_id()}")
+    object: str = "chat.completion"
+    created: int = Field(default_factory=lambda: int(time.time()))
+    model: str
+    choices: List[Dict[str, Any]]
+    usage: UsageInfo
+
+
+class CompletionResponse(OpenAIBaseModel):
+    id: str = Field(default_factory=lambda: f"cmpl-{_random_id()}")
+    object: str = "text_completion"
+    created: int = Field(default_factory=lambda: int(time.time()))
+    model: str
+    choices: List[Dict[str, Any]]
+    usage: UsageInfo
+
+
+class TokenizeResponse(OpenAIBaseModel):
+    count: int
+    max_model_len: int
+    tokens: List[int]
+
+
+class DetokenizeResponse(OpenAIBaseModel):
+    prompt: str
+
+
+class ScoreResponse(OpenAIBaseModel):
+    id: str = Field(default_factory=lambda: f"score-{_random_id()}")
+    object: str = "list"
+    created: int = Field(default_factory=lambda: int(time.time()))
+    model: str
+    data: List[Dict[str, Any]]
+    usage: UsageInfo
+
+
+class PoolingResponse(OpenAIBaseModel):
+    id: str = Field(default_factory=lambda: f"pool-{_random_id()}")
+    object: str = "list"
+    created: int = Field(default_factory=lambda: int(time.time()))
+    model: str
+    data: List[Dict[str, Any]]
+    usage: UsageInfo
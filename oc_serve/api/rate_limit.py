@@ -0,0 +1,244 @@
+"""Per-API-key token-bucket rate limits on prompt and completion tokens.
+
+Every API key (or tenant, with `tenant_header`) gets one bucket per limited
+token kind, refilled at `<kind>_tokens_per_minute` up to `burst_minutes`
+worth of tokens. Before the engine is called a request reserves its
+estimated prompt tokens (from the body size) and completion tokens (from
+`max_tokens`, or `default_completion_tokens`); it is answered with 429 and
+`Retry-After` when a bucket cannot cover it. Once the engine reports usage
+the reservation is reconciled against the tokens actually consumed.
+
+Buckets are per replica, so a deployment of N replicas admits up to N
+times the configured rates for a key spread across all of them.
+"""
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Mapping, NamedTuple, Optional
+
+from prometheus_client import Counter
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from configs import RateLimitConfigs
+from oc_serve.api.responses import FastJSONResponse
+from oc_serve.utils import json_loads
+
+RATE_LIMITED_REQUESTS = Counter(
+    "oc_serve_rate_limited_requests",
+    "Requests rejected by the per-key token rate limits, by endpoint.",
+    ["endpoint"],
+)
+
+_KINDS = ("prompt", "completion")
+_USAGE_KEYS = {"prompt": "prompt_tokens", "completion": "completion_tokens"}
+_DATA_PREFIX = b"data: "
+
+
+def _digest(identity: str) -> str:
+    return "sha256:" + hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class TokenBucket:
+    """Token bucket refilled continuously; `level` may go negative (debt)."""
+    __slots__ = ("rate", "capacity", "level", "updated")
+
+    def __init__(self, tokens_per_minute: float, burst_minutes: float):
+        self.rate = tokens_per_minute / 60.0
+        self.capacity = tokens_per_minute * burst_minutes
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.level
+
+    def wait_s(self, tokens: float) -> float:
+        """Seconds until `tokens` (capped at the capacity) are available."""
+        missing = min(tokens, self.capacity) - self.level
+        return max(0.0, missing / self.rate) if self.rate > 0 else math.inf
+
+
+class Reservation(NamedTuple):
+    """Tokens taken from a key's buckets for one request."""
+    buckets: Dict[str, TokenBucket]
+    reserved: Dict[str, float]
+
+
+class TokenRateLimiter:
+    """
+    Admits requests against per-key prompt and completion token buckets.
+
+    `run` wraps one engine call: it reserves the request's estimated tokens,
+    calls the engine, and settles the reservation with the `usage` of the
+    response. Responses carry `X-RateLimit-Limit-<Kind>-Tokens` (per minute)
+    and `X-RateLimit-Remaining-<Kind>-Tokens` headers for each limited kind.
+
+    Streams are settled from their final usage chunk: `include_usage` is
+    turned on for the engine and the usage chunk is dropped again unless the
+    client asked for it. A stream that ends without usage (the client went
+    away) keeps its whole reservation.
+    """
+    def __init__(self, configs: Optional[RateLimitConfigs] = None):
+        self.configs = configs or RateLimitConfigs()
+        self.default_rates = {f"{kind}_tokens_per_minute":
+                              getattr(self.configs, f"{kind}_tokens_per_minute")
+                              for kind in _KINDS}
+        self.overrides = {
+            identity if identity.startswith("sha256:") else _digest(identity): rates
+            for identity, rates in self.configs.overrides.items()
+        }
+        self.key_header = self.configs.key_header.lower()
+        self.tenant_header = (self.configs.tenant_header.lower()
+                              if self.configs.tenant_header else None)
+        self.buckets: "OrderedDict[str, Dict[str, TokenBucket]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.configs.enabled
+
+    def identity(self, headers: Mapping[str, str]) -> str:
+        """Digest of the tenant id or API key in `headers`; anonymous requests share one.
+
+        `headers` are the HTTP headers of a request or the metadata of a gRPC call.
+        """
+        value = None
+        if self.tenant_header is not None:
+            value = headers.get(self.tenant_header)
+        if not value:
+            value = headers.get(self.key_header, "")
+            scheme, _, credentials = value.partition(" ")
+            if scheme.lower() == "bearer":
+                value = credentials.strip()
+        return _digest(value)
+
+    def _buckets(self, identity: str) -> Dict[str, TokenBucket]:
+        buckets = self.buckets.get(identity)
+        if buckets is not None:
+            self.buckets.move_to_end(identity)
+            return buckets
+        rates = {**self.default_rates, **self.overrides.get(identity, {})}
+        buckets = {}
+        for kind in _KINDS:
+            tokens_per_minute = rates.get(f"{kind}_tokens_per_minute")
+            if tokens_per_minute is not None:
+                buckets[kind] = TokenBucket(tokens_per_minute, self.configs.burst_minutes)
+        self.buckets[identity] = buckets
+        if len(self.buckets) > self.configs.max_keys:
+            self.buckets.popitem(last=False)
+        return buckets
+
+    def estimate(self, request: Any, body: bytes) -> Dict[str, float]:
+        """Prompt and completion tokens `request` may consume, before tokenization."""
+        max_tokens = (getattr(request, "max_completion_tokens", None)
+                      or getattr(request, "max_tokens", None)
+                      or self.configs.default_completion_tokens)
+        choices = getattr(request, "n", None) or 1
+        prompt = getattr(request, "prompt", None)
+        if isinstance(prompt, list) and prompt and not isinstance(prompt[0], int):
+            choices *= len(prompt)
+        return {"prompt": len(body) / self.configs.chars_per_token,
+                "completion": float(max_tokens * choices)}
+
+    @staticmethod
+    def _headers(buckets: Dict[str, TokenBucket]) -> Dict[str, str]:
+        headers = {}
+        for kind, bucket in buckets.items():
+            name = kind.capitalize()
+            headers[f"X-RateLimit-Limit-{name}-Tokens"] = str(int(bucket.rate * 60))
+            headers[f"X-RateLimit-Remaining-{name}-Tokens"] = str(max(0, int(bucket.level)))
+        return headers
+
+    def _reject(self, endpoint: str, buckets: Dict[str, TokenBucket],
+                wait_s: float) -> Response:
+        RATE_LIMITED_REQUESTS.labels(endpoint).inc()
+        headers = self._headers(buckets)
+        headers["Retry-After"] = str(math.ceil(wait_s)) if math.isfinite(wait_s) else "3600"
+        return FastJSONResponse(
+            content={"error": {"message": "Token rate limit exceeded for this API key.",
+                               "type": "rate_limit_error", "code": 429}},
+            status_code=429, headers=headers)
+
+    @staticmethod
+    def _settle(reservation: Reservation, usage: Optional[Dict[str, Any]]) -> None:
+        """Return what was reserved but not consumed (or take what was consumed beyond it)."""
+        usage = usage or {}
+        now = time.monotonic()
+        for kind, bucket in reservation.buckets.items():
+            used = usage.get(_USAGE_KEYS[kind]) or 0
+            bucket.refill(now)
+            bucket.level = min(bucket.capacity, bucket.level + reservation.reserved[kind] - used)
+
+    async def run(self, endpoint: str, request: Any, raw_request: Request,
+                  call: Callable[[], Awaitable[Response]]) -> Response:
+        """Call the engine through `call` if the key of `raw_request` has the tokens for it."""
+        if not self.enabled:
+            return await call()
+        return await self.run_for(endpoint, request, raw_request.headers,
+                                  await raw_request.body(), call)
+
+    async def run_for(self, endpoint: str, request: Any, headers: Mapping[str, str], body: bytes,
+                      call: Callable[[], Awaitable[Response]]) -> Response:
+        """`run` for a request identified by `headers` whose encoded body is `body`, e.g. a gRPC call."""
+        if not self.enabled:
+            return await call()
+        buckets = self._buckets(self.identity(headers))
+        if not buckets:
+            return await call()
+
+        now = time.monotonic()
+        estimate = self.estimate(request, body)
+        wait_s = 0.0
+        for kind, bucket in buckets.items():
+            bucket.refill(now)
+            wait_s = max(wait_s, bucket.wait_s(estimate[kind]))
+        if wait_s > 0:
+            return self._reject(endpoint, buckets, wait_s)
+        for kind, bucket in buckets.items():
+            bucket.level -= estimate[kind]
+        reservation = Reservation(buckets, {kind: estimate[kind] for kind in buckets})
+
+        strip_usage = False
+        if getattr(request, "stream", False):
+            options = request.stream_options
+            if options is None or not options.include_usage:
+                from oc_serve.api.models import StreamOptions
+                request.stream_options = StreamOptions(include_usage=True)
+                strip_usage = True
+
+        try:
+            response = await call()
+        except BaseException:
+            self._settle(reservation, None)
+            raise
+
+        if isinstance(response, StreamingResponse) and response.status_code == 200:
+            response.body_iterator = self._observe(reservation, response.body_iterator,
+                                                   strip_usage)
+        elif response.status_code == 200:
+            self._settle(reservation, json_loads(response.body).get("usage"))
+        else:
+            self._settle(reservation, None)
+        response.headers.update(self._headers(buckets))
+        return response
+
+    async def _observe(self, reservation: Reservation, frames, strip_usage: bool):
+        """Forward SSE frames, settling `reservation` from the final usage chunk."""
+        usage = None
+        try:
+            async for frame in frames:
+                if b'"usage"' in frame and frame.startswith(_DATA_PREFIX):
+                    try:
+                        chunk = json_loads(frame[len(_DATA_PREFIX):])
+                    except ValueError:
+                        chunk = {}
+                    if chunk.get("usage"):
+                        usage = chunk["usage"]
+                        if strip_usage and not chunk.get("choices"):
+                            continue
+                yield frame
+        finally:
+            if usage is not None:
+                self._settle(reservation, usage)
@@ -0,0 +1,109 @@
+"""OC-Serve API Response Classes."""
+import base64
+import time
+from typing import Any, AsyncIterator, Mapping, Optional
+
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, StreamingResponse
+
+from oc_serve.api.models import (
+    SpeechRequest,
+    SpeechResponse,
+    SpeechResponseData,
+    UsageInfoSpeechModels,
+)
+from oc_serve.utils.serialization import json_dumps, encode_sse_stream
+from oc_serve.utils.speech import SPEECH_MEDIA_TYPES, measure_speech
+from oc_serve.utils.timing import request_timer
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that serializes pydantic models directly to bytes.
+
+    Drop-in replacement for `JSONResponse(content=model.model_dump())`:
+    pass the model itself as `content` and it is rendered by pydantic-core
+    without building an intermediate dict. Dicts and lists are rendered with
+    orjson when it is installed. With `endpoint` set, rendering time is
+    recorded as that endpoint's `serialize` stage.
+    """
+
+    def __init__(self,
+                 content: Any,
+                 status_code: int = 200,
+                 headers: Optional[Mapping[str, str]] = None,
+                 media_type: Optional[str] = None,
+                 background: Optional[BackgroundTask] = None,
+                 exclude_none: bool = False,
+                 endpoint: Optional[str] = None):
+        self.exclude_none = exclude_none
+        self.endpoint = endpoint
+        super().__init__(content, status_code=status_code, headers=headers,
+                         media_type=media_type, background=background)
+
+    def render(self, content: Any) -> bytes:
+        if self.endpoint is None:
+            return json_dumps(content, exclude_none=self.exclude_none)
+        with request_timer.stage(self.endpoint, "serialize"):
+            return json_dumps(content, exclude_none=self.exclude_none)
+
+
+class SSEResponse(StreamingResponse):
+    """Server-sent events response that writes pre-encoded byte frames."""
+
+    media_type = "text/event-stream"
+
+    def __init__(self,
+                 content: Any,
+                 status_code: int = 200,
+                 headers: Optional[Mapping[str, str]] = None,
+                 background: Optional[BackgroundTask] = None):
+        super().__init__(encode_sse_stream(content), status_code=status_code,
+                         headers=headers, media_type=self.media_type,
+                         background=background)
+
+
+class AudioStreamResponse(StreamingResponse):
+    """Streams synthesized PCM chunks encoded as `response_format` as they are produced.
+
+    `started` is the `time.perf_counter()` at which the request reached the
+    server; it is the reference for the time-to-first-audio-byte metric.
+    """
+
+    def __init__(self,
+                 pcm: AsyncIterator[bytes],
+                 response_format: str,
+                 sample_rate: int,
+                 started: float,
+                 status_code: int = 200,
+                 headers: Optional[Mapping[str, str]] = None,
+                 background: Optional[BackgroundTask] = None,
+                 ffmpeg_path: str = "ffmpeg"):
+        headers = dict(headers or {})
+        headers.setdefault("X-Sample-Rate", str(sample_rate))
+        super().__init__(measure_speech(pcm, response_format, sample_rate, started, ffmpeg_path),
+                         status_code=status_code, headers=headers,
+                         media_type=SPEECH_MEDIA_TYPES[response_format], background=background)
+
+
+async def speech_response(request: SpeechRequest,
+                          pcm: AsyncIterator[bytes],
+                          sample_rate: int,
+                          model: str,
+                          started: Optional[float] = None,
+                          ffmpeg_path: str = "ffmpeg"):
+    """Respond to a speech request with an audio stream, or a base64 `SpeechResponse`
+    when the request sets `stream: false`."""
+    started = time.perf_counter() if started is None else started
+    if request.stream:
+        return AudioStreamResponse(pcm, request.response_format, sample_rate, started,
+                                   ffmpeg_path=ffmpeg_path)
+    audio = bytearray()
+    async for chunk in measure_speech(pcm, request.response_format, sample_rate, started,
+                                      ffmpeg_path):
+        audio += chunk
+    return FastJSONResponse(content=SpeechResponse(
+        model=model,
+        data=[SpeechResponseData(index=0, type="audio",
+                                 audio=base64.b64encode(audio).decode("ascii"))],
+        usage=UsageInfoSpeechModels(synthesis_duration=time.perf_counter() - started),
+    ), exclude_none=True)
@@ -0,0 +1,81 @@
+"""Route declarations for orchestrator classes.
+
+Orchestrator methods are declared as routes with `route` and
+`websocket_route`, and added to a FastAPI app by `mount_routes` when the
+orchestrator is built. FastAPI resolves endpoint signatures only then, so
+importing an orchestrator does not import the vLLM protocol models its
+request bodies are typed with.
+"""
+import types
+import typing
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import FastAPI
+
+from oc_serve.api.ingest import json_body, parsed_body
+
+_ROUTE_ATTR = "__oc_serve_route__"
+
+
+class RouteSpec(NamedTuple):
+    """Route declared on an orchestrator method; `methods` is None for a WebSocket route."""
+    path: str
+    methods: Optional[List[str]]
+    parsed_body: bool
+    kwargs: Dict[str, Any]
+
+
+def route(path: str, methods: Tuple[str, ...] = ("POST",), parsed_body: bool = False,
+          **kwargs) -> Callable:
+    """Declare an HTTP route; `kwargs` are passed to `FastAPI.add_api_route`.
+
+    A `parsed_body` route takes an `(self, request, raw_request)` body that
+    fast parsing reads with `ingest.parsed_body`.
+    """
+    def deco(func: Callable) -> Callable:
+        setattr(func, _ROUTE_ATTR, RouteSpec(path, list(methods), parsed_body, kwargs))
+        return func
+    return deco
+
+
+def websocket_route(path: str) -> Callable:
+    """Declare a WebSocket route."""
+    def deco(func: Callable) -> Callable:
+        setattr(func, _ROUTE_ATTR, RouteSpec(path, None, False, {}))
+        return func
+    return deco
+
+
+def declared_routes(cls: type) -> List[Tuple[str, RouteSpec]]:
+    """`(method name, spec)` of the routes declared on `cls` and its bases, in declaration order."""
+    routes: Dict[str, RouteSpec] = {}
+    for base in reversed(cls.__mro__):
+        for name, value in vars(base).items():
+            spec = getattr(value, _ROUTE_ATTR, None)
+            if spec is not None:
+                routes[name] = spec
+    return list(routes.items())
+
+
+def mount_routes(app: FastAPI, owner: Any, fast_parsing: bool = False) -> None:
+    """Add the routes declared on `owner` to `app`.
+
+    `owner` is an orchestrator class, whose methods are bound to the replica
+    by Ray Serve's `serve.ingress`, or an orchestrator instance.
+    """
+    cls = owner if isinstance(owner, type) else type(owner)
+    for name, spec in declared_routes(cls):
+        endpoint = vars(next(base for base in cls.__mro__ if name in vars(base)))[name]
+        if spec.methods is None:
+            app.add_api_websocket_route(spec.path, _bind(endpoint, owner))
+            continue
+        kwargs = dict(spec.kwargs)
+        if spec.parsed_body and fast_parsing:
+            model_cls = typing.get_type_hints(endpoint)["request"]
+            endpoint = parsed_body(model_cls, True)(endpoint)
+            kwargs["openapi_extra"] = json_body(model_cls)
+        app.add_api_route(spec.path, _bind(endpoint, owner), methods=spec.methods, **kwargs)
+
+
+def _bind(endpoint: Callable, owner: Any) -> Callable:
+    return endpoint if isinstance(owner, type) else types.MethodType(endpoint, owner)
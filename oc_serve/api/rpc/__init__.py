@@ -0,0 +1,2 @@
+"""OC-Serve gRPC API: protobuf definitions and ingress methods."""
+from .service import GRPCIngress, GRPCError
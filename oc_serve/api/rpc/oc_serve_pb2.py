@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: oc_serve/api/rpc/oc_serve.proto
+# Protobuf Python Version: 4.25.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1foc_serve/api/rpc/oc_serve.proto\x12\x07ocserve\"O\n\x05Usage\x12\x15\n\rprompt_tokens\x18\x01 \x01(\r\x12\x19\n\x11\x63ompletion_tokens\x18\x02 \x01(\r\x12\x14\n\x0ctotal_tokens\x18\x03 \x01(\r\"\xde\x01\n\x0eSamplingParams\x12\x17\n\nmax_tokens\x18\x01 \x01(\rH\x00\x88\x01\x01\x12\x18\n\x0btemperature\x18\x02 \x01(\x02H\x01\x88\x01\x01\x12\x12\n\x05top_p\x18\x03 \x01(\x02H\x02\x88\x01\x01\x12\x12\n\x05top_k\x18\x04 \x01(\x05H\x03\x88\x01\x01\x12\x0e\n\x01n\x18\x05 \x01(\rH\x04\x88\x01\x01\x12\x11\n\x04seed\x18\x06 \x01(\x03H\x05\x88\x01\x01\x12\x0c\n\x04stop\x18\x07 \x03(\tB\r\n\x0b_max_tokensB\x0e\n\x0c_temperatureB\x08\n\x06_top_pB\x08\n\x06_top_kB\x04\n\x02_nB\x07\n\x05_seed\"\x8c\x01\n\x11\x43ompletionRequest\x12\r\n\x05model\x18\x01 \x01(\t\x12\x0e\n\x06prompt\x18\x02 \x01(\t\x12\x18\n\x10prompt_token_ids\x18\x03 \x03(\r\x12)\n\x08sampling\x18\x04 \x01(\x0b\x32\x17.ocserve.SamplingParams\x12\x13\n\x0bparams_json\x18\x0f \x01(\t\"F\n\x10\x43ompletionChoice\x12\r\n\x05index\x18\x01 \x01(\r\x12\x0c\n\x04text\x18\x02 \x01(\t\x12\x15\n\rfinish_reason\x18\x03 \x01(\t\"z\n\x12\x43ompletionResponse\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05model\x18\x02 \x01(\t\x12*\n\x07\x63hoices\x18\x03 \x03(\x0b\x32\x19.ocserve.CompletionChoice\x12\x1d\n\x05usage\x18\x04 \x01(\x0b\x32\x0e.ocserve.Usage\",\n\x0b\x43hatMessage\x12\x0c\n\x04role\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\t\"\x84\x01\n\x0b\x43hatRequest\x12\r\n\x05model\x18\x01 \x01(\t\x12&\n\x08messages\x18\x02 \x03(\x0b\x32\x14.ocserve.ChatMessage\x12)\n\x08sampling\x18\x03 \x01(\x0b\x32\x17.ocserve.SamplingParams\x12\x13\n\x0bparams_json\x18\x0f \x01(\t\"P\n\tChatDelta\x12\r\n\x05index\x18\x01 \x01(\r\x12\x0c\n\x04role\x18\x02 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\x12\x15\n\rfinish_reason\x18\x04 \x01(\t\"j\n\tChatChunk\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05model\x18\x02 \x01(\t\x12#\n\x07\x63hoices\x18\x03 \x03(\x0b\x32\x12.ocserve.ChatDelta\x12\x1d\n\x05usage\x18\x04 \x01(\x0b\x32\x0e.ocserve.Usage\"\x90\x01\n\x0fTokenizeRequest\x12\r\n\x05model\x18\x01 \x01(\t\x12\x0e\n\x06prompt\x18\x02 \x01(\t\x12&\n\x08messages\x18\x03 \x03(\x0b\x32\x14.ocserve.ChatMessage\x12\x1f\n\x12\x61\x64\x64_special_tokens\x18\x04 \x01(\x08H\x00\x88\x01\x01\x42\x15\n\x13_add_special_tokens\"H\n\x10TokenizeResponse\x12\x0e\n\x06tokens\x18\x01 \x03(\r\x12\r\n\x05\x63ount\x18\x02 \x01(\r\x12\x15\n\rmax_model_len\x18\x03 \x01(\r\"2\n\x11\x44\x65tokenizeRequest\x12\r\n\x05model\x18\x01 \x01(\t\x12\x0e\n\x06tokens\x18\x02 \x03(\r\"$\n\x12\x44\x65tokenizeResponse\x12\x0e\n\x06prompt\x18\x01 \x01(\t\"T\n\x0c\x45mbedRequest\x12\r\n\x05model\x18\x01 \x01(\t\x12\r\n\x05input\x18\x02 \x03(\t\x12\x17\n\ndimensions\x18\x03 \x01(\rH\x00\x88\x01\x01\x42\r\n\x0b_dimensions\"-\n\tEmbedding\x12\r\n\x05index\x18\x01 \x01(\r\x12\x11\n\tembedding\x18\x02 \x03(\x02\"_\n\rEmbedResponse\x12\r\n\x05model\x18\x01 \x01(\t\x12 \n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x12.ocserve.Embedding\x12\x1d\n\x05usage\x18\x03 \x01(\x0b\x32\x0e.ocserve.Usage2\xc6\x02\n\x07OCServe\x12\x43\n\x08\x43omplete\x12\x1a.ocserve.CompletionRequest\x1a\x1b.ocserve.CompletionResponse\x12\x36\n\x08Instruct\x12\x14.ocserve.ChatRequest\x1a\x12.ocserve.ChatChunk0\x01\x12?\n\x08Tokenize\x12\x18.ocserve.TokenizeRequest\x1a\x19.ocserve.TokenizeResponse\x12\x45\n\nDetokenize\x12\x1a.ocserve.DetokenizeRequest\x1a\x1b.ocserve.DetokenizeResponse\x12\x36\n\x05\x45mbed\x12\x15.ocserve.EmbedRequest\x1a\x16.ocserve.EmbedResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'oc_serve.api.rpc.oc_serve_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_USAGE']._serialized_start=44
+  _globals['_USAGE']._serialized_end=123
+  _globals['_SAMPLINGPARAMS']._serialized_start=126
+  _globals['_SAMPLINGPARAMS']._serialized_end=348
+  _globals['_COMPLETIONREQUEST']._serialized_start=351
+  _globals['_COMPLETIONREQUEST']._serialized_end=491
+  _globals['_COMPLETIONCHOICE']._serialized_start=493
+  _globals['_COMPLETIONCHOICE']._serialized_end=563
+  _globals['_COMPLETIONRESPONSE']._serialized_start=565
+  _globals['_COMPLETIONRESPONSE']._serialized_end=687
+  _globals['_CHATMESSAGE']._serialized_start=689
+  _globals['_CHATMESSAGE']._serialized_end=733
+  _globals['_CHATREQUEST']._serialized_start=736
+  _globals['_CHATREQUEST']._serialized_end=868
+  _globals['_CHATDELTA']._serialized_start=870
+  _globals['_CHATDELTA']._serialized_end=950
+  _globals['_CHATCHUNK']._serialized_start=952
+  _globals['_CHATCHUNK']._serialized_end=1058
+  _globals['_TOKENIZEREQUEST']._serialized_start=1061
+  _globals['_TOKENIZEREQUEST']._serialized_end=1205
+  _globals['_TOKENIZERESPONSE']._serialized_start=1207
+  _globals['_TOKENIZERESPONSE']._serialized_end=1279
+  _globals['_DETOKENIZEREQUEST']._serialized_start=1281
+  _globals['_DETOKENIZEREQUEST']._serialized_end=1331
+  _globals['_DETOKENIZERESPONSE']._serialized_start=1333
+  _globals['_DETOKENIZERESPONSE']._serialized_end=1369
+  _globals['_EMBEDREQUEST']._serialized_start=1371
+  _globals['_EMBEDREQUEST']._serialized_end=1455
+  _globals['_EMBEDDING']._serialized_start=1457
+  _globals['_EMBEDDING']._serialized_end=1502
+  _globals['_EMBEDRESPONSE']._serialized_start=1504
+  _globals['_EMBEDRESPONSE']._serialized_end=1599
+  _globals['_OCSERVE']._serialized_start=1602
+  _globals['_OCSERVE']._serialized_end=1928
+# @@protoc_insertion_point(module_scope)
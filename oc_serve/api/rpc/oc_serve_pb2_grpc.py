@@ -0,0 +1,198 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from oc_serve.api.rpc import oc_serve_pb2 as oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2
+
+
+class OCServeStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Complete = channel.unary_unary(
+                '/ocserve.OCServe/Complete',
+                request_serializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.CompletionRequest.SerializeToString,
+                response_deserializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.CompletionResponse.FromString,
+                )
+        self.Instruct = channel.unary_stream(
+                '/ocserve.OCServe/Instruct',
+                request_serializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.ChatRequest.SerializeToString,
+                response_deserializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.ChatChunk.FromString,
+                )
+        self.Tokenize = channel.unary_unary(
+                '/ocserve.OCServe/Tokenize',
+                request_serializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.TokenizeRequest.SerializeToString,
+                response_deserializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.TokenizeResponse.FromString,
+                )
+        self.Detokenize = channel.unary_unary(
+                '/ocserve.OCServe/Detokenize',
+                request_serializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.DetokenizeRequest.SerializeToString,
+                response_deserializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.DetokenizeResponse.FromString,
+                )
+        self.Embed = channel.unary_unary(
+                '/ocserve.OCServe/Embed',
+                request_serializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.EmbedRequest.SerializeToString,
+                response_deserializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.EmbedResponse.FromString,
+                )
+
+
+class OCServeServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def Complete(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Instruct(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Tokenize(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Detokenize(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Embed(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_OCServeServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Complete': grpc.unary_unary_rpc_method_handler(
+                    servicer.Complete,
+                    request_deserializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.CompletionRequest.FromString,
+                    response_serializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.CompletionResponse.SerializeToString,
+            ),
+            'Instruct': grpc.unary_stream_rpc_method_handler(
+                    servicer.Instruct,
+                    request_deserializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.ChatRequest.FromString,
+                    response_serializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.ChatChunk.SerializeToString,
+            ),
+            'Tokenize': grpc.unary_unary_rpc_method_handler(
+                    servicer.Tokenize,
+                    request_deserializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.TokenizeRequest.FromString,
+                    response_serializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.TokenizeResponse.SerializeToString,
+            ),
+            'Detokenize': grpc.unary_unary_rpc_method_handler(
+                    servicer.Detokenize,
+                    request_deserializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.DetokenizeRequest.FromString,
+                    response_serializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.DetokenizeResponse.SerializeToString,
+            ),
+            'Embed': grpc.unary_unary_rpc_method_handler(
+                    servicer.Embed,
+                    request_deserializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.EmbedRequest.FromString,
+                    response_serializer=oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.EmbedResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'ocserve.OCServe', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class OCServe(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def Complete(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ocserve.OCServe/Complete',
+            oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.CompletionRequest.SerializeToString,
+            oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.CompletionResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Instruct(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/ocserve.OCServe/Instruct',
+            oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.ChatRequest.SerializeToString,
+            oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.ChatChunk.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Tokenize(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ocserve.OCServe/Tokenize',
+            oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.TokenizeRequest.SerializeToString,
+            oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.TokenizeResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Detokenize(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ocserve.OCServe/Detokenize',
+            oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.DetokenizeRequest.SerializeToString,
+            oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.DetokenizeResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Embed(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/ocserve.OCServe/Embed',
+            oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.EmbedRequest.SerializeToString,
+            oc__serve_dot_api_dot_rpc_dot_oc__serve__pb2.EmbedResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,236 @@
+"""gRPC ingress methods mapped onto the `Server` interface.
+
+Ray Serve's gRPC proxy calls deployment methods named after the RPCs in
+`oc_serve.proto`. `GRPCIngress` implements them by building the same
+OpenAI-compatible requests the REST API validates, calling the server and
+converting its JSON (or SSE) response into protobuf messages.
+"""
+import json
+from typing import Any, Dict, Optional
+
+import grpc
+from pydantic import TypeAdapter, ValidationError
+
+from oc_serve.api.rpc import oc_serve_pb2 as pb2
+from oc_serve.utils import json_loads
+
+_STATUS_CODES = {
+    400: grpc.StatusCode.INVALID_ARGUMENT,
+    401: grpc.StatusCode.UNAUTHENTICATED,
+    403: grpc.StatusCode.PERMISSION_DENIED,
+    404: grpc.StatusCode.UNIMPLEMENTED,
+    422: grpc.StatusCode.INVALID_ARGUMENT,
+    429: grpc.StatusCode.RESOURCE_EXHAUSTED,
+    503: grpc.StatusCode.UNAVAILABLE,
+}
+
+
+class GRPCError(Exception):
+    """Error to be reported to the gRPC client with `code`."""
+    def __init__(self, code: grpc.StatusCode, details: str):
+        super().__init__(details)
+        self.code = code
+        self.details = details
+
+
+def _abort(grpc_context, error: GRPCError) -> None:
+    if grpc_context is not None:
+        grpc_context.set_code(error.code)
+        grpc_context.set_details(error.details)
+
+
+def _validate(model_cls, body: Dict[str, Any]):
+    """Validate `body` into `model_cls` (a model or a union of models)."""
+    try:
+        return TypeAdapter(model_cls).validate_python(body)
+    except ValidationError as exc:
+        raise GRPCError(grpc.StatusCode.INVALID_ARGUMENT, str(exc)) from exc
+
+
+def _request_body(message, **fields) -> Dict[str, Any]:
+    """OpenAI request body from the common fields of `message` and `fields`.
+
+    `params_json` may set any other request field, but not the keys of
+    `fields`, which the RPC itself determines (prompt, messages, stream).
+    """
+    body = {key: value for key, value in fields.items() if value is not None}
+    if message.model:
+        body["model"] = message.model
+    if message.HasField("sampling"):
+        sampling = message.sampling
+        for name in ("max_tokens", "temperature", "top_p", "top_k", "n", "seed"):
+            if sampling.HasField(name):
+                body[name] = getattr(sampling, name)
+        if sampling.stop:
+            body["stop"] = list(sampling.stop)
+    if message.params_json:
+        try:
+            params = json.loads(message.params_json)
+        except ValueError as exc:
+            raise GRPCError(grpc.StatusCode.INVALID_ARGUMENT,
+                            f"params_json is not valid JSON: {exc}") from exc
+        if not isinstance(params, dict):
+            raise GRPCError(grpc.StatusCode.INVALID_ARGUMENT, "params_json must be a JSON object")
+        fixed = sorted(params.keys() & fields.keys())
+        if fixed:
+            raise GRPCError(grpc.StatusCode.INVALID_ARGUMENT,
+                            f"params_json cannot set {', '.join(fixed)}")
+        body.update(params)
+    return body
+
+
+def _metadata(grpc_context) -> Dict[str, str]:
+    """Invocation metadata of a call, which carries its API key like HTTP headers do."""
+    return dict(grpc_context.invocation_metadata()) if grpc_context is not None else {}
+
+
+def _messages(messages):
+    return [{"role": message.role, "content": message.content} for message in messages]
+
+
+def _json_content(response) -> Dict[str, Any]:
+    """Decode a server JSON response, raising `GRPCError` for error statuses."""
+    content = json_loads(response.body)
+    if response.status_code >= 400:
+        error = content.get("error", content) if isinstance(content, dict) else content
+        details = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+        raise GRPCError(_STATUS_CODES.get(response.status_code, grpc.StatusCode.INTERNAL), details)
+    return content
+
+
+def _usage(usage: Optional[Dict[str, Any]]) -> Optional[pb2.Usage]:
+    if not usage:
+        return None
+    return pb2.Usage(prompt_tokens=usage.get("prompt_tokens") or 0,
+                     completion_tokens=usage.get("completion_tokens") or 0,
+                     total_tokens=usage.get("total_tokens") or 0)
+
+
+async def _sse_events(response):
+    """Yield the decoded `data:` payloads of an SSE response until `[DONE]`."""
+    buffer = b""
+    async for chunk in response.body_iterator:
+        buffer += chunk if isinstance(chunk, bytes) else chunk.encode("utf-8")
+        *frames, buffer = buffer.split(b"\n\n")
+        for frame in frames:
+            if not frame.startswith(b"data: "):
+                continue
+            data = frame[len(b"data: "):]
+            if data == b"[DONE]":
+                return
+            yield json_loads(data)
+
+
+class GRPCIngress:
+    """
+    gRPC service `ocserve.OCServe`, served by Ray Serve's gRPC proxy.
+
+    Mixed into an orchestrator that holds the backend `Server` as
+    `self.server` and its `TokenRateLimiter` as `self.rate_limiter`.
+    Requests are validated like their REST counterparts, and `Complete` and
+    `Instruct` are rate limited by the API key in the call's metadata;
+    invalid requests, rate limits and server errors are reported as gRPC
+    status codes.
+    """
+    async def Complete(self, request: pb2.CompletionRequest, grpc_context=None):
+        from oc_serve.api.models import CompletionRequest
+        try:
+            prompt = list(request.prompt_token_ids) or request.prompt
+            completion_request = _validate(CompletionRequest,
+                                           _request_body(request, prompt=prompt, stream=False))
+            content = _json_content(await self.rate_limiter.run_for(
+                "complete", completion_request, _metadata(grpc_context), request.SerializeToString(),
+                lambda: self.server.complete(completion_request, None)))
+        except GRPCError as error:
+            _abort(grpc_context, error)
+            return pb2.CompletionResponse()
+        return pb2.CompletionResponse(
+            id=content.get("id", ""),
+            model=content.get("model", ""),
+            choices=[pb2.CompletionChoice(index=choice.get("index", 0),
+                                          text=choice.get("text") or "",
+                                          finish_reason=choice.get("finish_reason") or "")
+                     for choice in content.get("choices", [])],
+            usage=_usage(content.get("usage")),
+        )
+
+    async def Instruct(self, request: pb2.ChatRequest, grpc_context=None):
+        from oc_serve.api.models import ChatCompletionRequest
+        try:
+            chat_request = _validate(ChatCompletionRequest, _request_body(
+                request, messages=_messages(request.messages), stream=True))
+            response = await self.rate_limiter.run_for(
+                "instruct", chat_request, _metadata(grpc_context), request.SerializeToString(),
+                lambda: self.server.instruct(chat_request, None))
+            if not hasattr(response, "body_iterator"):
+                _json_content(response)
+                raise GRPCError(grpc.StatusCode.INTERNAL, "Server returned a non-streaming response")
+        except GRPCError as error:
+            _abort(grpc_context, error)
+            return
+
+        async for chunk in _sse_events(response):
+            if "error" in chunk:
+                _abort(grpc_context, GRPCError(grpc.StatusCode.INTERNAL,
+                                               chunk["error"].get("message", "")))
+                return
+            yield pb2.ChatChunk(
+                id=chunk.get("id", ""),
+                model=chunk.get("model", ""),
+                choices=[pb2.ChatDelta(index=choice.get("index", 0),
+                                       role=choice.get("delta", {}).get("role") or "",
+                                       content=choice.get("delta", {}).get("content") or "",
+                                       finish_reason=choice.get("finish_reason") or "")
+                         for choice in chunk.get("choices", [])],
+                usage=_usage(chunk.get("usage")),
+            )
+
+    async def Tokenize(self, request: pb2.TokenizeRequest, grpc_context=None):
+        from oc_serve.api.models import TokenizeRequest
+        body = {"model": request.model} if request.model else {}
+        if request.messages:
+            body["messages"] = _messages(request.messages)
+        else:
+            body["prompt"] = request.prompt
+        if request.HasField("add_special_tokens"):
+            body["add_special_tokens"] = request.add_special_tokens
+        try:
+            content = _json_content(await self.server.tokenize(_validate(TokenizeRequest, body), None))
+        except GRPCError as error:
+            _abort(grpc_context, error)
+            return pb2.TokenizeResponse()
+        return pb2.TokenizeResponse(tokens=content.get("tokens", []),
+                                    count=content.get("count", 0),
+                                    max_model_len=content.get("max_model_len", 0))
+
+    async def Detokenize(self, request: pb2.DetokenizeRequest, grpc_context=None):
+        from oc_serve.api.models import DetokenizeRequest
+        body = {"tokens": list(request.tokens)}
+        if request.model:
+            body["model"] = request.model
+        try:
+            content = _json_content(await self.server.detokenize(_validate(DetokenizeRequest, body),
+                                                                 None))
+        except GRPCError as error:
+            _abort(grpc_context, error)
+            return pb2.DetokenizeResponse()
+        return pb2.DetokenizeResponse(prompt=content.get("prompt", ""))
+
+    async def Embed(self, request: pb2.EmbedRequest, grpc_context=None):
+        from oc_serve.api.models import PoolingRequest
+        body = {"input": list(request.input), "encoding_format": "float"}
+        if request.model:
+            body["model"] = request.model
+        if request.HasField("dimensions"):
+            body["dimensions"] = request.dimensions
+        try:
+            content = _json_content(await self.server.pooling(_validate(PoolingRequest, body), None))
+        except GRPCError as error:
+            _abort(grpc_context, error)
+            return pb2.EmbedResponse()
+        return pb2.EmbedResponse(
+            model=content.get("model", ""),
+            data=[pb2.Embedding(index=item.get("index", 0), embedding=item.get("data", []))
+                  for item in content.get("data", [])],
+            usage=_usage(content.get("usage")),
+        )
@@ -1,22 +1,28 @@
 """Abstract Orchestrator Class"""
 from __future__ import annotations
 
+import importlib
 import inspect
 from abc import ABC, abstractmethod
-from typing import Callable, ClassVar, Dict, Type, TypeVar, Annotated
+from typing import TYPE_CHECKING, Callable, ClassVar, Dict, Type, TypeVar, Annotated
 
 from configs import OrchestratorConfigs
+from oc_serve.utils import startup_timer
 from oc_serve.api.models import (
     Form,
-    ChatCompletionRequest,
-    CompletionRequest,
-    DetokenizeRequest,
     Request,
     Response,
-    TokenizeRequest,
-    TranscriptionRequest,
 )
 
+if TYPE_CHECKING:
+    from oc_serve.api.models import (
+        ChatCompletionRequest,
+        CompletionRequest,
+        DetokenizeRequest,
+        TokenizeRequest,
+        TranscriptionRequest,
+    )
+
 O = TypeVar("O", bound="Orchestrator")
 
 
@@ -54,6 +60,14 @@ class Orchestrator(ABC):
 
     @classmethod
     def _get_class(cls, orchestrator_type: str) -> Type["Orchestrator"]:
+        if orchestrator_type not in cls._REGISTRY:
+            # Built-in orchestrators register themselves when their package is imported.
+            module = f"{__package__}.{orchestrator_type}"
+            try:
+                importlib.import_module(module)
+            except ModuleNotFoundError as exc:
+                if exc.name != module:
+                    raise
         try:
             return cls._REGISTRY[orchestrator_type]
         except KeyError as exc:
@@ -64,7 +78,8 @@ class Orchestrator(ABC):
     def get(cls, orchestrator_type: str):
         """Return an instance of the registered orchestrator class."""
         orch_cls = cls._get_class(orchestrator_type)
-        orchestrator_configs = OrchestratorConfigs.get(orchestrator_type)
+        with startup_timer.phase("config"):
+            orchestrator_configs = OrchestratorConfigs.get(orchestrator_type)
         return orch_cls.build(orchestrator_configs)
 
     @classmethod
@@ -1,3 +1,19 @@
-"""Orchestrators Package"""
+"""Orchestrators Package
+
+Orchestrators are imported on first use: `Orchestrator.get` imports the
+`oc_serve.orchestrators.<orchestrator_type>` package of an orchestrator type
+that is not registered yet, so the local orchestrator does not import Ray.
+"""
+import importlib
+
 from .Orchestrator import Orchestrator
-from .ray import Ray
+
+_ORCHESTRATORS = {"Ray": "ray", "Local": "local"}
+
+
+def __getattr__(name: str):
+    if name in _ORCHESTRATORS:
+        value = getattr(importlib.import_module(f"{__name__}.{_ORCHESTRATORS[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,144 @@
+"""Local Orchestrator Class
+
+Serves the OC-Serve API straight from an ASGI server (e.g. uvicorn) around a
+single in-process `Server`, without a Ray cluster, proxy actor or extra hop.
+"""
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import Annotated, Any, Dict, Optional
+
+from oc_serve.orchestrators import Orchestrator
+from oc_serve.servers import Server
+from oc_serve.api import models, RootAPI, root_api_app, ProfilerAdmin
+from oc_serve.api.routes import route, websocket_route, mount_routes
+from oc_serve.api.models import (
+    Form,
+    Request,
+    Response,
+    SpeechRequest,
+    WebSocket,
+)
+from oc_serve.utils import oc_logger, startup_timer, LiveTranscriber, EventLoopMonitor
+from configs import OrchestratorConfigs
+
+@Orchestrator.register("local")
+class Local(Orchestrator):
+    """
+    Local Orchestrator Class.
+
+    The instance is an ASGI application exposing the same routes as the Ray
+    orchestrator, bound to this orchestrator's methods. The backend server
+    is built in the application lifespan, once the event loop is running:
+
+        OC_SERVE_ORCHESTRATOR_TYPE=local uvicorn app:application --port 8000
+    """
+    def __init__(self, orchestrator_configs: OrchestratorConfigs,
+                 client_config: Optional[Dict[str, Any]] = None):
+        self.logger = oc_logger.get_logger("local")
+        self.orchestrator_configs = orchestrator_configs
+        self.client_config = client_config
+        self.server = None
+        self.profiler_admin = ProfilerAdmin()
+        self.app = RootAPI(api_kwargs={
+            "title": root_api_app.title,
+            "summary": root_api_app.summary,
+            "description": root_api_app.description,
+            "version": root_api_app.version,
+            "lifespan": self._lifespan,
+        })
+        mount_routes(self.app, self, self.orchestrator_configs.ingress_settings.fast_parsing)
+
+    @classmethod
+    def build(cls, orchestrator_configs: OrchestratorConfigs,
+              client_config: Optional[Dict[str, Any]] = None):
+        """Factory method to build a local ASGI application.
+
+        `client_config` connects the backend server to a shared engine, see
+        `oc_serve.orchestrators.local.frontend`.
+        """
+        return cls(orchestrator_configs, client_config)
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+
+    @asynccontextmanager
+    async def _lifespan(self, app):
+        self.server = Server.get(
+            self.orchestrator_configs.backend_server_settings.backend_server_type,
+            client_config=self.client_config,
+            )
+        self.logger.info("Server ready: %s", startup_timer.report())
+        loop_monitor = EventLoopMonitor()
+        loop_monitor.start()
+        try:
+            yield
+        finally:
+            loop_monitor.stop()
+
+
+    @route("/api-health")
+    async def check_api_health(self, raw_request: Request = None):
+        return Response(status_code=200, content="API is Healthy!")
+
+
+    @route("/model-health")
+    async def check_model_health(self, raw_request: Request = None):
+        return await self.server.check_model_health(raw_request)
+
+
+    @route("/model-info")
+    async def get_model_info(self, raw_request: Request = None):
+        return await self.server.get_model_info(raw_request)
+
+
+    @route("/instruct", parsed_body=True)
+    async def instruct(self, request: models.ChatCompletionRequest, raw_request: Request):
+        return await self.profiler_admin.profiler.profile_request(
+            lambda: self.server.instruct(request, raw_request))
+
+
+    @route("/complete", parsed_body=True)
+    async def complete(self, request: models.CompletionRequest, raw_request: Request):
+        return await self.server.complete(request, raw_request)
+
+
+    @route("/transcribe")
+    async def transcribe(self, request: Annotated[models.TranscriptionRequest, Form()],
+                       raw_request: Request):
+        return await self.server.transcribe(request, raw_request)
+
+
+    @websocket_route("/transcribe/stream")
+    async def transcribe_stream(self, websocket: WebSocket):
+        await LiveTranscriber(self.server).run(websocket)
+
+
+    @route("/speech")
+    async def speech(self, request: SpeechRequest, raw_request: Request):
+        return await self.server.speech(request, raw_request)
+
+
+    @route("/tokenize")
+    async def tokenize(self, request: models.TokenizeRequest, raw_request: Request):
+        return await self.server.tokenize(request, raw_request)
+
+
+    @route("/detokenize")
+    async def detokenize(self, request: models.DetokenizeRequest, raw_request: Request):
+        return await self.server.detokenize(request, raw_request)
+
+
+    @route("/admin/profile", include_in_schema=False)
+    async def profile(self, raw_request: Request):
+        return await self.profiler_admin.profile(raw_request)
+
+
+    @route("/admin/profile/requests", methods=("GET",), include_in_schema=False)
+    async def request_profile(self, raw_request: Request):
+        return await self.profiler_admin.request_profile(raw_request)
+
+
+    @route("/metrics", methods=("GET",))
+    async def get_metrics(self, raw_request: Request):
+        return await self.server.metrics(request=raw_request)
@@ -0,0 +1,2 @@
+"""Local Orchestrator Package"""
+from .Local import Local
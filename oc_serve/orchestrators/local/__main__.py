@@ -0,0 +1,4 @@
+"""Run the local orchestrator: python -m oc_serve.orchestrators.local"""
+from oc_serve.orchestrators.local.frontend import main
+
+main()
@@ -0,0 +1,89 @@
+"""Multi-process frontend for the local orchestrator.
+
+One Python event loop handles HTTP parsing, validation, serialization and SSE
+framing for every request, which caps a single-process frontend at one core.
+With `workers > 1` this launcher starts the backend engine once through
+`Server.shared_engine` and spawns that many API worker processes. The workers
+share one listening socket (the kernel spreads connections between them) and
+each one talks to the engine over the backend's IPC channel.
+
+    python -m oc_serve.orchestrators.local --workers 4 --port 8000
+"""
+import argparse
+import asyncio
+import multiprocessing
+import signal
+import socket
+from multiprocessing.connection import wait
+from typing import Any, Dict, Optional
+
+import uvicorn
+
+from oc_serve.orchestrators.local.Local import Local
+from oc_serve.servers import Server
+from oc_serve.utils import oc_logger
+from configs import OrchestratorConfigs
+
+logger = oc_logger.get_logger("local.frontend")
+
+
+def _run_worker(orchestrator_configs: OrchestratorConfigs, sock: socket.socket,
+                client_config: Optional[Dict[str, Any]]) -> None:
+    """Entrypoint of one API worker process."""
+    app = Local.build(orchestrator_configs, client_config=client_config)
+    config = uvicorn.Config(app, log_level=orchestrator_configs.frontend_settings.log_level)
+    asyncio.run(uvicorn.Server(config).serve(sockets=[sock]))
+
+
+def serve(orchestrator_configs: OrchestratorConfigs) -> None:
+    """Serve the local orchestrator with `frontend_settings.workers` processes."""
+    settings = orchestrator_configs.frontend_settings
+    if settings.workers <= 1:
+        uvicorn.run(Local.build(orchestrator_configs), host=settings.host,
+                    port=settings.port, log_level=settings.log_level)
+        return
+
+    server_cls = Server.get_class(orchestrator_configs.backend_server_settings.backend_server_type)
+    sock = socket.create_server((settings.host, settings.port), backlog=2048)
+    ctx = multiprocessing.get_context("spawn")
+
+    def terminate(signum, frame):
+        raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, terminate)
+    workers = []
+    try:
+        with server_cls.shared_engine(settings.workers) as client_configs:
+            for index, client_config in enumerate(client_configs):
+                worker = ctx.Process(target=_run_worker, name=f"oc-serve-api-{index}",
+                                     args=(orchestrator_configs, sock, client_config))
+                worker.start()
+                workers.append(worker)
+            logger.info("Started %d API workers on %s:%d", len(workers),
+                        settings.host, settings.port)
+            finished = wait([worker.sentinel for worker in workers])
+            for worker in workers:
+                if worker.sentinel in finished:
+                    logger.error("API worker %s exited with code %s", worker.name, worker.exitcode)
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join(timeout=30)
+            if worker.is_alive():
+                worker.kill()
+        sock.close()
+
+
+def main():
+    configs = OrchestratorConfigs.get("local")
+    settings = configs.frontend_settings
+    parser = argparse.ArgumentParser(description="Serve OC-Serve with the local orchestrator.")
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--workers", type=int, default=settings.workers,
+                        help="API worker processes sharing one engine.")
+    args = parser.parse_args()
+    settings.host, settings.port, settings.workers = args.host, args.port, args.workers
+    serve(configs)
@@ -0,0 +1,40 @@
+"""Ray CPU Preprocessing Deployment
+
+Runs the backend server's engine-free preprocessing (chat template rendering,
+tokenization, audio decoding) in CPU-only replicas that autoscale separately
+from the GPU replicas.
+"""
+import asyncio
+
+from oc_serve.servers import Server
+from oc_serve.utils import oc_logger
+
+
+class Preprocessor:
+    """CPU-only deployment wrapping `Server.build_preprocessor()`.
+
+    Results are returned to the GPU ingress replica through Ray's object
+    store, so large payloads (token ids, PCM audio) are not re-encoded as
+    HTTP bodies. Work runs in a thread to keep the replica's event loop
+    free to accept requests.
+    """
+    def __init__(self, backend_server_settings):
+        self.logger = oc_logger.get_logger("ray.preprocessor")
+        server_type = backend_server_settings.backend_server_type
+        self.preprocessor = Server.get_class(server_type).build_preprocessor()
+        self.logger.info("Preprocessor ready for %s", server_type)
+
+    async def chat(self, request):
+        if self.preprocessor is None:
+            return None
+        return await asyncio.to_thread(self.preprocessor.chat, request)
+
+    async def completion(self, request):
+        if self.preprocessor is None:
+            return None
+        return await asyncio.to_thread(self.preprocessor.completion, request)
+
+    async def audio(self, audio_bytes: bytes):
+        if self.preprocessor is None:
+            return None
+        return await asyncio.to_thread(self.preprocessor.audio, audio_bytes)
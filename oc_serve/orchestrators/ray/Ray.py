@@ -1,83 +1,190 @@
 """Ray Orchestrator Class
 """
-from typing import Annotated
+from __future__ import annotations
+
+from typing import Annotated, Dict, Optional
 
 from ray import serve
+from ray.serve.handle import DeploymentHandle
 
 from oc_serve.orchestrators import Orchestrator
+from oc_serve.orchestrators.ray.Preprocessor import Preprocessor
 from oc_serve.servers import Server
-from oc_serve.api import root_api_app
+from oc_serve.api import models, root_api_app, ProfilerAdmin
+from oc_serve.api.routes import route, websocket_route, mount_routes
+from oc_serve.api.rpc import GRPCIngress
+from oc_serve.api.rate_limit import TokenRateLimiter
+from oc_serve.utils import oc_logger, startup_timer, request_timer, LiveTranscriber, EventLoopMonitor
 from oc_serve.api.models import (
     Form,
     Request,
     Response,
-    ChatCompletionRequest,
-    CompletionRequest,
-    DetokenizeRequest,
-    TokenizeRequest,
-    TranscriptionRequest,
+    SpeechRequest,
+    WebSocket,
 )
 from configs import OrchestratorConfigs
 
 @Orchestrator.register("ray")
-class Ray(Orchestrator):
-    """Ray Orchestrator Class"""
-    def __init__(self, orchestrator_configs: OrchestratorConfigs):
+class Ray(GRPCIngress, Orchestrator):
+    """
+    Ray Orchestrator Class.
+
+    Serves the REST API through the Serve HTTP proxy and, when the Serve
+    gRPC proxy is configured with
+    `oc_serve.api.rpc.oc_serve_pb2_grpc.add_OCServeServicer_to_server`,
+    the `ocserve.OCServe` gRPC service (see `GRPCIngress`).
+
+    `/instruct` and `/complete` are subject to the per-key token rate limits
+    of `TokenRateLimiter` (`OC_RATE_LIMIT_*`).
+
+    Routes are mounted on `root_api_app` by `build`; request bodies are typed
+    with `models.*` so the vLLM protocol models are only imported then.
+    """
+    _routes_mounted = False
+
+    def __init__(self, orchestrator_configs: OrchestratorConfigs,
+                 preprocessor: Optional[DeploymentHandle] = None):
+        self.logger = oc_logger.get_logger("ray")
         self.orchestrator_configs = orchestrator_configs
+        self.preprocessor = preprocessor
         self.server = Server.get(
             self.orchestrator_configs.backend_server_settings.backend_server_type
             )
+        self.profiler_admin = ProfilerAdmin()
+        self.rate_limiter = TokenRateLimiter()
+        self.loop_monitor = EventLoopMonitor()
+        try:
+            self.loop_monitor.start()
+        except RuntimeError:
+            self.logger.info("No running event loop, event loop monitor is disabled")
+        self.logger.info("Replica ready: %s", startup_timer.report())
 
     @classmethod
     def build(cls, orchestrator_configs: OrchestratorConfigs):
         """Factory method to build a Ray Serve deployment."""
         deployment_settings = orchestrator_configs.deployment_settings.model_dump(exclude_none=True)
+        autoscaling_policy_settings = orchestrator_configs.autoscaling_policy_settings
+        if autoscaling_policy_settings.enabled:
+            autoscaling_config = dict(deployment_settings.get("autoscaling_config") or {})
+            autoscaling_config.setdefault("policy", autoscaling_policy_settings.policy())
+            deployment_settings["autoscaling_config"] = autoscaling_config
+        if not cls._routes_mounted:
+            mount_routes(root_api_app, cls, orchestrator_configs.ingress_settings.fast_parsing)
+            cls._routes_mounted = True
         ingressed_cls = serve.ingress(root_api_app)(cls)
         deployment_cls = serve.deployment(**deployment_settings)(ingressed_cls)
-        return deployment_cls.bind(orchestrator_configs)
+        preprocessing_settings = orchestrator_configs.preprocessing_settings
+        if not preprocessing_settings.enabled:
+            return deployment_cls.bind(orchestrator_configs)
+        server_type = orchestrator_configs.backend_server_settings.backend_server_type
+        if Server.get_class(server_type).build_preprocessor.__func__ is Server.build_preprocessor.__func__:
+            # Without a preprocessor every request would make a round trip for nothing.
+            oc_logger.get_logger("ray").warning(
+                "Server %s has no preprocessor, the preprocessing tier is not deployed", server_type)
+            return deployment_cls.bind(orchestrator_configs)
+        preprocessor = serve.deployment(**preprocessing_settings.deployment_options())(Preprocessor).bind(
+            orchestrator_configs.backend_server_settings
+            )
+        return deployment_cls.bind(orchestrator_configs, preprocessor)
+
+    async def check_health(self):
+        """Ray Serve replica health check, answered from the server's cached engine health."""
+        await self.server.check_health()
+
+
+    async def record_autoscaling_stats(self) -> Dict[str, float]:
+        """Per-replica load signals for the autoscaler, see `oc_serve.orchestrators.ray.autoscaling`."""
+        stats = self.server.load_signals()
+        if self.loop_monitor.task is not None:
+            stats["event_loop_lag_s"] = self.loop_monitor.lag_max
+        return stats
 
 
-    @root_api_app.post(f"/api-health")
+    @route("/api-health")
     async def check_api_health(self, raw_request: Request = None):
         return Response(status_code=200, content="API is Healthy!")
 
 
-    @root_api_app.post(f"/model-health")
+    @route("/model-health")
     async def check_model_health(self, raw_request: Request = None):
         return await self.server.check_model_health(raw_request)
 
 
-    @root_api_app.post(f"/model-info")
+    @route("/model-info")
     async def get_model_info(self, raw_request: Request = None):
         return await self.server.get_model_info(raw_request)
 
 
-    @root_api_app.post(f"/instruct")
-    async def instruct(self, request: ChatCompletionRequest, raw_request: Request):
-        return await self.server.instruct(request, raw_request)
+    @route("/instruct", parsed_body=True)
+    async def instruct(self, request: models.ChatCompletionRequest, raw_request: Request):
+        return await self.profiler_admin.profiler.profile_request(
+            lambda: self.rate_limiter.run("instruct", request, raw_request,
+                                          lambda: self._instruct(request, raw_request)))
+
+
+    async def _instruct(self, request: models.ChatCompletionRequest, raw_request: Request):
+        if self.preprocessor is None:
+            return await self.server.instruct(request, raw_request)
+        with request_timer.stage("instruct", "preprocess"):
+            preprocessed = await self.preprocessor.chat.remote(request)
+        return await self.server.instruct(request, raw_request, preprocessed=preprocessed)
+
+
+    @route("/complete", parsed_body=True)
+    async def complete(self, request: models.CompletionRequest, raw_request: Request):
+        return await self.rate_limiter.run("complete", request, raw_request,
+                                           lambda: self._complete(request, raw_request))
 
 
-    @root_api_app.post(f"/complete")
-    async def complete(self, request: CompletionRequest, raw_request: Request):
-        return await self.server.complete(request, raw_request)
+    async def _complete(self, request: models.CompletionRequest, raw_request: Request):
+        if self.preprocessor is None:
+            return await self.server.complete(request, raw_request)
+        with request_timer.stage("complete", "preprocess"):
+            preprocessed = await self.preprocessor.completion.remote(request)
+        return await self.server.complete(request, raw_request, preprocessed=preprocessed)
 
 
-    @root_api_app.post(f"/transcribe")
-    async def transcribe(self, request: Annotated[TranscriptionRequest, Form()],
+    @route("/transcribe")
+    async def transcribe(self, request: Annotated[models.TranscriptionRequest, Form()],
                        raw_request: Request):
-        return await self.server.transcribe(request, raw_request)
+        if self.preprocessor is None:
+            return await self.server.transcribe(request, raw_request)
+        audio = await request.file.read()
+        with request_timer.stage("transcribe", "preprocess"):
+            preprocessed = await self.preprocessor.audio.remote(audio)
+        return await self.server.transcribe(request, raw_request, preprocessed=preprocessed)
 
 
-    @root_api_app.post(f"/tokenize")
-    async def tokenize(self, request: TokenizeRequest, raw_request: Request):
+    @websocket_route("/transcribe/stream")
+    async def transcribe_stream(self, websocket: WebSocket):
+        await LiveTranscriber(self.server).run(websocket)
+
+
+    @route("/speech")
+    async def speech(self, request: SpeechRequest, raw_request: Request):
+        return await self.server.speech(request, raw_request)
+
+
+    @route("/tokenize")
+    async def tokenize(self, request: models.TokenizeRequest, raw_request: Request):
         return await self.server.tokenize(request, raw_request)
 
 
-    @root_api_app.post(f"/detokenize")
-    async def detokenize(self, request: DetokenizeRequest, raw_request: Request):
+    @route("/detokenize")
+    async def detokenize(self, request: models.DetokenizeRequest, raw_request: Request):
         return await self.server.detokenize(request, raw_request)
 
 
-    @root_api_app.get(f"/metrics")
+    @route("/admin/profile", include_in_schema=False)
+    async def profile(self, raw_request: Request):
+        return await self.profiler_admin.profile(raw_request)
+
+
+    @route("/admin/profile/requests", methods=("GET",), include_in_schema=False)
+    async def request_profile(self, raw_request: Request):
+        return await self.profiler_admin.request_profile(raw_request)
+
+
+    @route("/metrics", methods=("GET",))
     async def get_metrics(self, raw_request: Request):
-        return self.server.metrics(request=raw_request)
+        return await self.server.metrics(request=raw_request)
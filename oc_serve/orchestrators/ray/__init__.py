@@ -1,2 +1,3 @@
 """Ray Orchestrator Package"""
 from .Ray import Ray
+from .Preprocessor import Preprocessor
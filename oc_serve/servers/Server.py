@@ -3,23 +3,35 @@ Abstract Model Server Class
 """
 from __future__ import annotations
 
+import asyncio
+import importlib
 import inspect
+import itertools
+import time
 from abc import ABC, abstractmethod
-from typing import Callable, ClassVar, Dict, Type, TypeVar, Annotated
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Dict, Optional, Type, TypeVar, Union, Annotated
 
 from configs import ServerConfigs
+from oc_serve.utils import startup_timer, request_timer, coalesce_sse, measure_sse, time_stream
 from oc_serve.api.models import (
     Form,
-    ChatCompletionRequest,
-    CompletionRequest,
-    DetokenizeRequest,
-    PoolingRequest,
     Request,
     Response,
-    ScoreRequest,
-    TokenizeRequest,
-    TranscriptionRequest,
 )
+from oc_serve.api.responses import FastJSONResponse
+
+if TYPE_CHECKING:
+    from oc_serve.api.models import (
+        ChatCompletionRequest,
+        CompletionRequest,
+        DetokenizeRequest,
+        PoolingRequest,
+        ScoreRequest,
+        SpeechRequest,
+        TokenizeRequest,
+        TranscriptionRequest,
+    )
 
 
 S = TypeVar("S", bound="Server")
@@ -30,6 +42,10 @@ class Server(ABC):
 
     _REGISTRY: ClassVar[Dict[str, Type["Server"]]] = {}
 
+    # SSE coalescing of `_stream`; servers set them from their settings.
+    stream_flush_interval_s: float = 0.0
+    stream_flush_max_chunks: int = 0
+
     @classmethod
     def register(cls, name: str) -> Callable[[Type[S]], Type[S]]:
         """
@@ -59,7 +75,16 @@ class Server(ABC):
         return deco
 
     @classmethod
-    def _get_class(cls, server_type: str) -> Type["Server"]:
+    def get_class(cls, server_type: str) -> Type["Server"]:
+        """Registered Server class of `server_type`."""
+        if server_type not in cls._REGISTRY:
+            # Built-in backends register themselves when their package is imported.
+            module = f"{__package__}.{server_type}"
+            try:
+                importlib.import_module(module)
+            except ModuleNotFoundError as exc:
+                if exc.name != module:
+                    raise
         try:
             return cls._REGISTRY[server_type]
         except KeyError as exc:
@@ -67,16 +92,107 @@ class Server(ABC):
                              f"Available: {sorted(cls._REGISTRY.keys())}") from exc
 
     @classmethod
-    def get(cls, server_type: str) -> "Server":
-        """Factory method to build a Server instance based on server_type."""
-        server_cls = cls._get_class(server_type)
-        server_configs = ServerConfigs.get(server_type)
+    def get(cls, server_type: str, client_config: Optional[Dict[str, Any]] = None) -> "Server":
+        """Factory method to build a Server instance based on server_type.
+
+        `client_config` is one of the configs yielded by `shared_engine`, when
+        the server is a frontend to an engine running in another process.
+        """
+        server_cls = cls.get_class(server_type)
+        with startup_timer.phase("config"):
+            server_configs = ServerConfigs.get(server_type)
+        if client_config is not None:
+            return server_cls(server_configs=server_configs, client_config=client_config)
         return server_cls(server_configs=server_configs)
 
+    @classmethod
+    @contextmanager
+    def shared_engine(cls, num_clients: int):
+        """Start one engine shared by `num_clients` frontend processes.
+
+        Yields one picklable client config per frontend, to be passed to
+        `Server.get` in that frontend's process. The engine is stopped when
+        the context exits. By default there is no engine to share and every
+        frontend gets `None`, so each one runs its own.
+        """
+        yield [None] * num_clients
+
+    @classmethod
+    def build_preprocessor(cls):
+        """Build this backend's engine-free request preprocessor.
+
+        The preprocessor runs in a separate CPU-only deployment and exposes
+        `chat(request)`, `completion(request)` and `audio(audio_bytes)`. Their
+        results are passed back as the `preprocessed` argument of `instruct`,
+        `complete` and `transcribe`; `None` means "process on the server".
+        Servers without a preprocessor return `None`.
+        """
+        return None
+
     @abstractmethod
     def __init__(self, server_configs: ServerConfigs):
         pass
 
+    def _init_admission(self, max_concurrent_calls: int) -> None:
+        """Set up the concurrency semaphore of `_admit`."""
+        self.semaphore = asyncio.Semaphore(max_concurrent_calls)
+        self._admission_ids = itertools.count()
+        self._admission_waiting: Dict[int, float] = {}
+        self._admission_wait_total = 0.0
+        self._admission_count = 0
+
+    @asynccontextmanager
+    async def _admit(self, endpoint: str):
+        """Hold the concurrency semaphore, timing the wait as the `admission` stage."""
+        admission_id = next(self._admission_ids)
+        started = self._admission_waiting[admission_id] = time.monotonic()
+        try:
+            with request_timer.stage(endpoint, "admission"):
+                await self.semaphore.acquire()
+        finally:
+            del self._admission_waiting[admission_id]
+        self._admission_wait_total += time.monotonic() - started
+        self._admission_count += 1
+        try:
+            yield
+        finally:
+            self.semaphore.release()
+
+    def _admission_signals(self) -> Dict[str, float]:
+        """
+        `admission_waiting` / `admission_wait_s` load signals: requests waiting
+        for the concurrency semaphore and the longest of their waits, or the
+        mean wait of requests admitted since the last call if none is waiting.
+        """
+        signals = {"admission_waiting": float(len(self._admission_waiting))}
+        if self._admission_waiting:
+            signals["admission_wait_s"] = time.monotonic() - min(self._admission_waiting.values())
+        elif self._admission_count:
+            signals["admission_wait_s"] = self._admission_wait_total / self._admission_count
+        else:
+            signals["admission_wait_s"] = 0.0
+        self._admission_wait_total = 0.0
+        self._admission_count = 0
+        return signals
+
+    def _stream(self, generator, endpoint: str):
+        """Wrap an SSE generator with stage timing, optional chunk coalescing and stream metrics."""
+        generator = time_stream(generator, endpoint)
+        if self.stream_flush_interval_s > 0:
+            generator = coalesce_sse(generator,
+                                     flush_interval_s=self.stream_flush_interval_s,
+                                     max_chunks=self.stream_flush_max_chunks,
+                                     endpoint=endpoint)
+        return measure_sse(generator, endpoint)
+
+    async def check_health(self) -> None:
+        """Raise if the engine is unhealthy.
+
+        Called by the orchestrator's own liveness check (Ray Serve's replica
+        health check), so it must not wait on inference, except for a startup
+        warmup: Ray Serve runs the check once before routing to a new replica.
+        """
+
     @abstractmethod
     async def check_model_health(self, raw_request: Request):
         """Check Model Health Endpoint"""
@@ -88,21 +204,70 @@ class Server(ABC):
         pass
 
     @abstractmethod
-    async def instruct(self, request: ChatCompletionRequest, raw_request: Request):
-        """Instruct Endpoint"""
+    async def instruct(self, request: ChatCompletionRequest, raw_request: Request,
+                       preprocessed=None):
+        """Instruct Endpoint
+
+        `preprocessed` is the result of the preprocessor's `chat(request)`, if any.
+        """
         pass
 
     @abstractmethod
-    async def complete(self, request: CompletionRequest, raw_request: Request):
-        """Complete Endpoint"""
+    async def complete(self, request: CompletionRequest, raw_request: Request,
+                       preprocessed=None):
+        """Complete Endpoint
+
+        `preprocessed` is the result of the preprocessor's `completion(request)`, if any.
+        """
         pass
 
     @abstractmethod
     async def transcribe(self, request: Annotated[TranscriptionRequest, Form()],
-                       raw_request: Request) -> Response:
-        """Transcribe Endpoint"""
+                       raw_request: Request, preprocessed=None) -> Response:
+        """Transcribe Endpoint
+
+        `preprocessed` is the result of the preprocessor's `audio(audio_bytes)`, if any.
+        """
         pass
 
+    @property
+    def supports_live_transcription(self) -> bool:
+        """Whether `transcribe_audio` transcribes; checked by `LiveTranscriber` before it
+        accepts a WebSocket. Servers that override `transcribe_audio` return True when enabled.
+        """
+        return False
+
+    async def transcribe_audio(self, audio: bytes, language: Optional[str] = None,
+                               prompt: Optional[str] = None) -> Union[str, Response]:
+        """Transcribe a short WAV clip and return its text (used by live transcription).
+
+        Servers without `supports_live_transcription` return the `disabled_feature` response.
+        """
+        return FastJSONResponse(content={"error": {"message": "This server does not "
+                                         "support live transcription.",
+                                         "type": "disabled_feature"}},
+                                status_code=404)
+
+    async def speech(self, request: SpeechRequest, raw_request: Request) -> Response:
+        """Speech Endpoint
+
+        Servers with a speech synthesis model stream its audio with
+        `oc_serve.api.responses.speech_response` as it is synthesized.
+        """
+        return FastJSONResponse(content={"error": {"message": "This server does not "
+                                         "support speech synthesis.",
+                                         "type": "disabled_feature"}},
+                                status_code=404)
+
+    def load_signals(self) -> Dict[str, float]:
+        """Current engine load of this server, by signal name.
+
+        Reported to the autoscaler by the Ray orchestrator, see
+        `oc_serve.orchestrators.ray.autoscaling`. Servers without engine
+        load information report nothing.
+        """
+        return {}
+
     @abstractmethod
     async def metrics(self, request: Request) -> Response:
         """Get Metrics Endpoint"""
@@ -1,3 +1,19 @@
-"""Server Package"""
+"""Server Package
+
+Backends are imported on first use: `Server.get` imports the
+`oc_serve.servers.<server_type>` package of a server type that is not
+registered yet, so importing this package does not import vLLM.
+"""
+import importlib
+
 from .Server import Server
-from .vllm import VLLM
+
+_BACKENDS = {"VLLM": "vllm", "Sim": "sim"}
+
+
+def __getattr__(name: str):
+    if name in _BACKENDS:
+        value = getattr(importlib.import_module(f"{__name__}.{_BACKENDS[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,321 @@
+"""Simulated engine Server for CPU-only performance testing.
+
+Answers `/instruct`, `/complete`, `/tokenize` and `/detokenize` with
+OpenAI-format payloads shaped like vLLM's, streamed through the same SSE
+pipeline as `VLLM`, while `SimEngine` models the engine's prefill, decode,
+batching and KV cache timing. Admission, routing, caching and serialization
+overhead can then be measured without a GPU or a model. Text is generated,
+not predicted: every request produces exactly `max_tokens` tokens.
+
+Payloads are built as plain dicts, so the simulator runs without vLLM.
+"""
+from __future__ import annotations
+
+import time
+import zlib
+from typing import TYPE_CHECKING, Annotated, Any, Dict, List, Optional, Union
+
+import asyncio
+
+from oc_serve.servers import Server
+from oc_serve.servers.sim.engine import SimEngine
+from oc_serve.utils import (
+    oc_logger,
+    get_metrics_registry,
+    MetricsExporter,
+    json_dumps,
+)
+from oc_serve.api.models import (
+    Form,
+    Request,
+    Response,
+    random_uuid,
+)
+from oc_serve.api.responses import FastJSONResponse, SSEResponse
+from configs import ServerConfigs
+
+if TYPE_CHECKING:
+    from oc_serve.api.models import (
+        ChatCompletionRequest,
+        CompletionRequest,
+        DetokenizeRequest,
+        TokenizeRequest,
+        ScoreRequest,
+        PoolingRequest,
+        TranscriptionRequest,
+    )
+
+_WORDS = ("the", " model", " is", " serving", " a", " simulated", " response", ".")
+_VOCAB_SIZE = 32000
+# Template tokens around each chat message, as added by a typical chat template.
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def _error(message: str, status_code: int, error_type: str = "BadRequestError") -> Response:
+    return FastJSONResponse(content={"error": {"message": message, "type": error_type,
+                                               "code": status_code}},
+                            status_code=status_code)
+
+
+@Server.register("sim")
+class Sim(Server):
+    """
+    Simulated engine Server, selected with `RAY_BACKEND_SERVER_TYPE=sim`
+    (or `LOCAL_BACKEND_SERVER_TYPE=sim`) and configured by `SIM_*`.
+    """
+    def __init__(self, server_configs: ServerConfigs):
+        self.logger = oc_logger.get_logger("sim")
+        self.settings = server_configs.engine_settings
+        self.logger.info("Starting simulated engine with settings: %s", self.settings)
+        self.engine = SimEngine(self.settings)
+        self.model = self.settings.served_model_name
+        self.stream_flush_interval_s = float(self.settings.stream_flush_interval_ms) / 1000
+        self.stream_flush_max_chunks = int(self.settings.stream_flush_max_chunks)
+        self._init_admission(self.settings.max_concurrent_calls)
+        self.metrics_exporter = MetricsExporter(get_metrics_registry())
+
+
+    def _tokens(self, text: str) -> List[int]:
+        """Simulated tokenizer: one token id per `chars_per_token` characters."""
+        step = max(1, int(self.settings.chars_per_token))
+        data = text.encode("utf-8")
+        return [zlib.crc32(data[i:i + step]) % _VOCAB_SIZE for i in range(0, len(data), step)]
+
+    def _prompt_len(self, prompt: Union[str, List[int]]) -> int:
+        if isinstance(prompt, str):
+            return max(1, round(len(prompt) / self.settings.chars_per_token))
+        return len(prompt)
+
+    def _chat_prompt_len(self, messages) -> int:
+        tokens = 0
+        for message in messages:
+            content = message.get("content") if isinstance(message, dict) else None
+            if isinstance(content, list):
+                content = " ".join(part.get("text") or "" for part in content
+                                   if isinstance(part, dict))
+            tokens += _MESSAGE_OVERHEAD_TOKENS + self._prompt_len(content or "")
+        return tokens
+
+    def _check_lengths(self, prompt_len: int, max_tokens: Optional[int]):
+        """Resolve `max_tokens`, or the error vLLM would answer for an overlong request."""
+        max_model_len = min(self.settings.max_model_len, self.settings.kv_capacity_tokens)
+        if max_tokens is None:
+            max_tokens = min(self.settings.default_max_tokens, max_model_len - prompt_len)
+        if prompt_len + max_tokens > max_model_len or max_tokens < 1:
+            return None, _error(f"This model's maximum context length is {max_model_len} tokens. "
+                                f"However, you requested {prompt_len + max_tokens} tokens "
+                                f"({prompt_len} in the messages, {max_tokens} in the completion).",
+                                400)
+        return max_tokens, None
+
+    @staticmethod
+    def _text(start: int, end: int) -> str:
+        return "".join(_WORDS[i % len(_WORDS)] for i in range(start, end))
+
+    @staticmethod
+    def _usage(prompt_len: int, completion_tokens: int) -> Dict[str, int]:
+        return {"prompt_tokens": prompt_len, "completion_tokens": completion_tokens,
+                "total_tokens": prompt_len + completion_tokens}
+
+    @staticmethod
+    def _chunk(object_type: str, request_id: str, created: int, model: str,
+               choices: List[Dict[str, Any]], usage: Optional[Dict[str, int]] = None) -> str:
+        """One SSE frame of a streamed `object_type` chunk."""
+        chunk = {"id": request_id, "object": object_type, "created": created, "model": model,
+                 "choices": choices}
+        if usage is not None:
+            chunk["usage"] = usage
+        return f"data: {json_dumps(chunk).decode('utf-8')}\n\n"
+
+
+    async def check_model_health(self, raw_request: Request = None):
+        await self.check_health()
+        return Response(status_code=200, content="Model is Healthy!")
+
+
+    async def check_health(self):
+        task = self.engine.task
+        if task is not None and task.done() and not task.cancelled() and task.exception():
+            raise RuntimeError(f"Simulated engine failed: {task.exception()!r}")
+
+
+    async def get_model_info(self, raw_request: Request = None):
+        return FastJSONResponse(content={"object": "list", "data": [{
+            "id": self.model, "object": "model", "created": 0, "owned_by": "oc-serve",
+            "root": self.model, "max_model_len": self.settings.max_model_len}]})
+
+
+    async def instruct(self, request: ChatCompletionRequest, raw_request: Request,
+                       preprocessed=None):
+        async with self._admit("instruct"):
+            self.logger.info("Instruct Request")
+            prompt_len = self._chat_prompt_len(request.messages)
+            max_tokens, error = self._check_lengths(
+                prompt_len, request.max_completion_tokens or request.max_tokens)
+            if error is not None:
+                return error
+            n = request.n or 1
+            if request.stream:
+                return SSEResponse(content=self._stream(
+                    self._chat_stream(request, prompt_len, max_tokens, n), "instruct"))
+
+            generated = [0] * n
+            async for index, count in self.engine.generate(prompt_len, max_tokens, n):
+                generated[index] = count
+            response = {
+                "id": f"chatcmpl-{random_uuid()}", "object": "chat.completion",
+                "created": int(time.time()), "model": self.model,
+                "choices": [{"index": index,
+                             "message": {"role": "assistant", "content": self._text(0, count)},
+                             "logprobs": None, "finish_reason": "length"}
+                            for index, count in enumerate(generated)],
+                "usage": self._usage(prompt_len, sum(generated)),
+            }
+            return FastJSONResponse(content=response, endpoint="instruct")
+
+
+    async def _chat_stream(self, request: ChatCompletionRequest, prompt_len: int,
+                           max_tokens: int, n: int):
+        """vLLM-style chat completion chunks: a role delta, one delta per token, usage, `[DONE]`."""
+        request_id, created = f"chatcmpl-{random_uuid()}", int(time.time())
+        options = request.stream_options
+        include_usage = options is not None and options.include_usage
+        for index in range(n):
+            yield self._chunk("chat.completion.chunk", request_id, created, self.model, [{
+                "index": index, "delta": {"role": "assistant", "content": ""},
+                "logprobs": None, "finish_reason": None}])
+        completion_tokens = 0
+        async for index, count in self.engine.generate(prompt_len, max_tokens, n):
+            completion_tokens += 1
+            yield self._chunk("chat.completion.chunk", request_id, created, self.model, [{
+                "index": index, "delta": {"content": self._text(count - 1, count)},
+                "logprobs": None, "finish_reason": "length" if count == max_tokens else None}])
+        if include_usage:
+            yield self._chunk("chat.completion.chunk", request_id, created, self.model, [],
+                              usage=self._usage(prompt_len, completion_tokens))
+        yield "data: [DONE]\n\n"
+
+
+    async def complete(self, request: CompletionRequest, raw_request: Request,
+                       preprocessed=None):
+        async with self._admit("complete"):
+            self.logger.info("Complete Request")
+            prompt = preprocessed if preprocessed is not None else request.prompt
+            if isinstance(prompt, list) and prompt and not isinstance(prompt[0], int):
+                prompts = prompt
+            else:
+                prompts = [prompt or ""]
+            prompt_lens = [self._prompt_len(p) for p in prompts]
+            max_tokens, error = self._check_lengths(max(prompt_lens), request.max_tokens)
+            if error is not None:
+                return error
+            if request.stream:
+                return SSEResponse(content=self._stream(
+                    self._completion_stream(request, prompt_lens, max_tokens), "complete"))
+
+            n = request.n or 1
+            results = await asyncio.gather(*(self._collect(prompt_len, max_tokens, n)
+                                             for prompt_len in prompt_lens))
+            choices = [{"index": i * n + index, "text": self._text(0, count), "logprobs": None,
+                        "finish_reason": "length"}
+                       for i, generated in enumerate(results)
+                       for index, count in enumerate(generated)]
+            response = {
+                "id": f"cmpl-{random_uuid()}", "object": "text_completion",
+                "created": int(time.time()), "model": self.model, "choices": choices,
+                "usage": self._usage(sum(prompt_lens) * n,
+                                     sum(sum(generated) for generated in results)),
+            }
+            return FastJSONResponse(content=response, endpoint="complete")
+
+
+    async def _collect(self, prompt_len: int, max_tokens: int, n: int) -> List[int]:
+        generated = [0] * n
+        async for index, count in self.engine.generate(prompt_len, max_tokens, n):
+            generated[index] = count
+        return generated
+
+
+    async def _completion_stream(self, request: CompletionRequest, prompt_lens: List[int],
+                                 max_tokens: int):
+        """vLLM-style completion chunks, one per token of every prompt and choice."""
+        request_id, created = f"cmpl-{random_uuid()}", int(time.time())
+        n = request.n or 1
+        options = request.stream_options
+        include_usage = options is not None and options.include_usage
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def pump(offset: int, prompt_len: int):
+            try:
+                async for index, count in self.engine.generate(prompt_len, max_tokens, n):
+                    queue.put_nowait((offset + index, count))
+            finally:
+                queue.put_nowait(None)
+
+        tasks = [asyncio.ensure_future(pump(i * n, prompt_len))
+                 for i, prompt_len in enumerate(prompt_lens)]
+        completion_tokens, remaining = 0, len(tasks)
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is None:
+                    remaining -= 1
+                    continue
+                index, count = item
+                completion_tokens += 1
+                yield self._chunk("text_completion", request_id, created, self.model, [{
+                    "index": index, "text": self._text(count - 1, count), "logprobs": None,
+                    "finish_reason": "length" if count == max_tokens else None}])
+        finally:
+            for task in tasks:
+                task.cancel()
+        if include_usage:
+            yield self._chunk("text_completion", request_id, created, self.model, [],
+                              usage=self._usage(sum(prompt_lens) * n, completion_tokens))
+        yield "data: [DONE]\n\n"
+
+
+    async def transcribe(self, request: Annotated[TranscriptionRequest, Form()],
+                         raw_request: Request, preprocessed=None):
+        return _error("The simulated engine does not support transcription.", 404,
+                      "disabled_feature")
+
+
+    def load_signals(self) -> Dict[str, float]:
+        """Engine load of this replica, with the signals of `VLLM.load_signals`."""
+        return {
+            "kv_cache_utilization": self.engine.kv_cache_utilization,
+            "waiting_requests": float(len(self.engine.waiting)),
+            "queued_prompt_tokens": float(self.engine.queued_prompt_tokens),
+            **self._admission_signals(),
+        }
+
+
+    async def metrics(self, request: Request = None) -> Response:
+        return await self.metrics_exporter.response(request)
+
+
+    async def tokenize(self, request: TokenizeRequest, raw_request: Request):
+        messages = getattr(request, "messages", None)
+        if messages:
+            text = "".join(str(message.get("content") or "") for message in messages)
+        else:
+            text = request.prompt or ""
+        tokens = self._tokens(text)
+        return FastJSONResponse(content={"count": len(tokens),
+                                         "max_model_len": self.settings.max_model_len,
+                                         "tokens": tokens},
+                                endpoint="tokenize")
+
+
+    async def scoring(self, request: ScoreRequest, raw_request: Request):
+        return _error("Scoring is disabled on this server.", 404, "disabled_feature")
+
+
+    async def pooling(self, request: PoolingRequest, raw_request: Request):
+        return _error("Pooling is disabled on this server.", 404, "disabled_feature")
+
+
+    async def detokenize(self, request: DetokenizeRequest, raw_request: Request):
+        return FastJSONResponse(content={"prompt": self._text(0, len(request.tokens))},
+                                endpoint="detokenize")
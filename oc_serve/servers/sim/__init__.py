@@ -0,0 +1,2 @@
+"""Simulated Engine Server Package"""
+from .Sim import Sim
@@ -0,0 +1,173 @@
+"""Continuous-batching engine model used by the simulated server.
+
+The engine runs one step at a time on the event loop, like vLLM's V1
+scheduler: every step decodes one token for each running sequence that has
+finished its prefill and spends the rest of `max_num_batched_tokens` on
+chunked prefill, oldest sequence first. Sequences are admitted in arrival
+order while they fit in `max_num_seqs` and the KV cache; when decoding runs
+out of KV cache the most recently admitted sequence is preempted and
+recomputed later. Each step sleeps for its modelled duration, so latency
+and throughput follow the step cost model of `SimEngineSettings`.
+"""
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Deque, List, Optional, Tuple
+
+from prometheus_client import Gauge
+
+from configs.servers_configs import SimEngineSettings
+
+SIM_KV_CACHE_USAGE = Gauge(
+    "oc_serve_sim_kv_cache_usage",
+    "Fraction of the simulated engine's KV cache in use.",
+    multiprocess_mode="livemax",
+)
+SIM_REQUESTS = Gauge(
+    "oc_serve_sim_requests",
+    "Sequences in the simulated engine, by state.",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+
+
+class SimSequence:
+    """One generated choice of a request."""
+    __slots__ = ("index", "prompt_len", "max_tokens", "queue", "computed", "generated", "aborted")
+
+    def __init__(self, index: int, prompt_len: int, max_tokens: int, queue: asyncio.Queue):
+        self.index = index
+        self.prompt_len = prompt_len
+        self.max_tokens = max_tokens
+        self.queue = queue
+        self.computed = 0
+        self.generated = 0
+        self.aborted = False
+
+    @property
+    def context_len(self) -> int:
+        return self.prompt_len + self.generated
+
+    @property
+    def prefilling(self) -> bool:
+        return self.computed < self.context_len
+
+
+class SimEngine:
+    """Step-by-step engine model; `generate` submits sequences and streams their tokens."""
+    def __init__(self, settings: SimEngineSettings):
+        self.settings = settings
+        self.waiting: Deque[SimSequence] = deque()
+        self.running: List[SimSequence] = []
+        self.kv_used = 0
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def kv_cache_utilization(self) -> float:
+        return self.kv_used / self.settings.kv_capacity_tokens
+
+    @property
+    def queued_prompt_tokens(self) -> int:
+        return (sum(seq.context_len - seq.computed for seq in self.running if seq.prefilling)
+                + sum(seq.context_len for seq in self.waiting))
+
+    async def generate(self, prompt_len: int, max_tokens: int,
+                       n: int = 1) -> AsyncIterator[Tuple[int, int]]:
+        """Yield `(choice index, tokens generated so far)` as each choice produces a token."""
+        queue: asyncio.Queue = asyncio.Queue()
+        sequences = [SimSequence(index, prompt_len, max_tokens, queue) for index in range(n)]
+        self.waiting.extend(sequences)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._run())
+        self.wakeup.set()
+        remaining = n
+        try:
+            while remaining:
+                index, generated = await queue.get()
+                if generated is None:
+                    remaining -= 1
+                    continue
+                yield index, generated
+        finally:
+            for sequence in sequences:
+                sequence.aborted = True
+
+    async def _run(self) -> None:
+        while True:
+            if not self.waiting and not self.running:
+                SIM_REQUESTS.labels("running").set(0)
+                SIM_REQUESTS.labels("waiting").set(0)
+                SIM_KV_CACHE_USAGE.set(0)
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+            await self._step()
+
+    def _free(self, sequence: SimSequence) -> None:
+        self.running.remove(sequence)
+        self.kv_used -= sequence.computed
+
+    def _schedule(self) -> Tuple[List[SimSequence], List[Tuple[SimSequence, int]]]:
+        """Pick this step's decoding sequences and prefill chunks."""
+        settings = self.settings
+        for sequence in [seq for seq in self.running if seq.aborted]:
+            self._free(sequence)
+        while self.waiting and len(self.running) < settings.max_num_seqs:
+            sequence = self.waiting[0]
+            if sequence.aborted:
+                self.waiting.popleft()
+                continue
+            if self.kv_used + sequence.context_len + 1 > settings.kv_capacity_tokens:
+                break
+            self.waiting.popleft()
+            self.running.append(sequence)
+
+        decoding = [seq for seq in self.running if not seq.prefilling]
+        # Preempt the newest sequences until every decoding sequence has room for its token.
+        while decoding and self.kv_used + len(decoding) > settings.kv_capacity_tokens:
+            victim = self.running[-1]
+            self._free(victim)
+            victim.computed = 0
+            self.waiting.appendleft(victim)
+            if victim in decoding:
+                decoding.remove(victim)
+
+        budget = settings.max_num_batched_tokens - len(decoding)
+        prefills = []
+        for sequence in self.running:
+            if budget <= 0:
+                break
+            if sequence.prefilling:
+                chunk = min(budget, sequence.context_len - sequence.computed)
+                prefills.append((sequence, chunk))
+                budget -= chunk
+        return decoding, prefills
+
+    async def _step(self) -> None:
+        settings = self.settings
+        decoding, prefills = self._schedule()
+        prefill_tokens = sum(chunk for _, chunk in prefills)
+        step_s = settings.step_overhead_s + prefill_tokens * settings.prefill_s_per_token
+        if decoding:
+            step_s += settings.decode_s_per_token * (
+                1 + settings.batch_slowdown * (len(decoding) - 1))
+        SIM_REQUESTS.labels("running").set(len(self.running))
+        SIM_REQUESTS.labels("waiting").set(len(self.waiting))
+        SIM_KV_CACHE_USAGE.set(self.kv_cache_utilization)
+        await asyncio.sleep(step_s)
+
+        for sequence, chunk in prefills:
+            sequence.computed += chunk
+            self.kv_used += chunk
+            if not sequence.prefilling:
+                decoding.append(sequence)
+        for sequence in decoding:
+            if sequence.aborted:
+                continue
+            sequence.generated += 1
+            sequence.computed += 1
+            self.kv_used += 1
+            sequence.queue.put_nowait((sequence.index, sequence.generated))
+            if sequence.generated >= sequence.max_tokens:
+                self._free(sequence)
+                sequence.queue.put_nowait((sequence.index, None))
@@ -1,31 +1,33 @@
-"""VLLM Server implementation."""
+"""VLLM Server implementation.
+
+Serving classes for each endpoint are imported and built on first use, so a
+deployment only pays for the endpoints it serves.
+"""
 import os
-from typing import Annotated
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Annotated, Any, Dict, List, Optional
 
 import asyncio
-from vllm.engine.async_llm_engine import AsyncLLMEngine
-from vllm.v1.engine.async_llm import AsyncLLM
-from vllm.entrypoints.openai.serving_chat import OpenAIServingChat
-from vllm.entrypoints.openai.serving_completion import OpenAIServingCompletion
-from vllm.entrypoints.openai.serving_pooling import OpenAIServingPooling
-from vllm.entrypoints.openai.serving_score import ServingScores
-from vllm.entrypoints.openai.serving_tokenization import OpenAIServingTokenization
-from vllm.entrypoints.openai.serving_transcription import OpenAIServingTranscription
+from prometheus_client import REGISTRY
 from vllm.entrypoints.openai.serving_models import OpenAIServingModels, BaseModelPath
-from prometheus_client.openmetrics.exposition import CONTENT_TYPE_LATEST, generate_latest
 
 from oc_serve.servers import Server
+from oc_serve.servers.vllm.warmup import load_warmup_profile, run_warmup
 from oc_serve.utils import (
     oc_logger,
     get_metrics_registry,
+    MetricsExporter,
+    HealthProber,
     split_audio_by_time,
+    startup_timer,
+    request_timer,
+    ArtifactManager,
 )
 from oc_serve.api.models import (
     Form,
     Request,
     Response,
-    StreamingResponse,
-    JSONResponse,
     ChatCompletionRequest,
     ChatCompletionResponse,
     CompletionRequest,
@@ -44,6 +46,7 @@ from oc_serve.api.models import (
     UsageInfoTranscriptionModels,
     SpeechResponse,
 )
+from oc_serve.api.responses import FastJSONResponse, SSEResponse
 from configs import ServerConfigs
 
 @Server.register("vllm")
@@ -51,32 +54,164 @@ class VLLM(Server):
     """
     VLLM Server implementation.
     """
-    def __init__(self, server_configs: ServerConfigs):
+    def __init__(self, server_configs: ServerConfigs, client_config: Optional[Dict[str, Any]] = None):
         self.logger = oc_logger.get_logger("vllm")
         self.engine_args = server_configs
+        self.client_config = client_config
         self.logger.info("Starting AsyncLLM Engine with args: %s", self.engine_args)
-        del os.environ['CUDA_VISIBLE_DEVICES']
-        if int(self.engine_args.extra_args.vllm_use_v1):
-            self.engine = AsyncLLM.from_engine_args(self.engine_args)
-            model_config = self.engine.model_config
-        else:
-            self.engine = AsyncLLMEngine.from_engine_args(self.engine_args)
-            model_config = self.engine.engine.get_model_config()
-        base_model_paths = [BaseModelPath(
-            name=self.engine_args.served_model_name \
-                if self.engine_args.served_model_name is not None \
-                else self.engine_args.model,
-            model_path=self.engine_args.model
-        )]
-        self.openai_models = OpenAIServingModels(
-            self.engine,
-            model_config,
-            base_model_paths=base_model_paths,
-            lora_modules=self.engine_args.extra_args.lora_modules
-        )
-        self.instruction_server = OpenAIServingChat(
+        os.environ.pop('CUDA_VISIBLE_DEVICES', None)
+        with startup_timer.phase("artifacts"):
+            self._resolve_model(self.engine_args)
+        with startup_timer.phase("engine_init"):
+            if client_config is not None:
+                from vllm.usage.usage_lib import UsageContext
+                from vllm.v1.engine.async_llm import AsyncLLM
+                client_config = dict(client_config)
+                self.engine_args.mm_processor_cache_gb = 0
+                self.engine = AsyncLLM.from_vllm_config(
+                    vllm_config=self.engine_args.create_engine_config(
+                        usage_context=UsageContext.OPENAI_API_SERVER),
+                    usage_context=UsageContext.OPENAI_API_SERVER,
+                    enable_log_requests=self.engine_args.enable_log_requests,
+                    disable_log_stats=self.engine_args.disable_log_stats,
+                    client_count=client_config.pop("client_count"),
+                    client_index=client_config.pop("client_index"),
+                    client_addresses=client_config,
+                )
+                self.model_config = self.engine.model_config
+            elif int(self.engine_args.extra_args.vllm_use_v1):
+                from vllm.v1.engine.async_llm import AsyncLLM
+                self.engine = AsyncLLM.from_engine_args(self.engine_args)
+                self.model_config = self.engine.model_config
+            else:
+                from vllm.engine.async_llm_engine import AsyncLLMEngine
+                self.engine = AsyncLLMEngine.from_engine_args(self.engine_args)
+                self.model_config = self.engine.engine.get_model_config()
+
+        with startup_timer.phase("serving_setup"):
+            base_model_paths = [BaseModelPath(
+                name=self.engine_args.served_model_name \
+                    if self.engine_args.served_model_name is not None \
+                    else self.engine_args.model,
+                model_path=self.engine_args.model
+            )]
+            self.openai_models = OpenAIServingModels(
+                self.engine,
+                self.model_config,
+                base_model_paths=base_model_paths,
+                lora_modules=self.engine_args.extra_args.lora_modules
+            )
+            self.logger.info("Scoring endpoint is %s",
+                             "ENABLED" if int(self.engine_args.extra_args.vllm_enable_scoring) else "DISABLED")
+            self.logger.info("Pooling/embeddings endpoint is %s",
+                             "ENABLED" if int(self.engine_args.extra_args.vllm_enable_pooling) else "DISABLED")
+            for name in self.engine_args.extra_args.preload_servers or []:
+                getattr(self, f"{name}_server")
+                self.logger.info("Preloaded %s server", name)
+
+        self.stream_flush_interval_s = float(self.engine_args.extra_args.stream_flush_interval_ms) / 1000
+        self.stream_flush_max_chunks = int(self.engine_args.extra_args.stream_flush_max_chunks)
+        self.skips = int(self.engine_args.extra_args.skips)
+        self._init_admission(int(self.engine_args.extra_args.max_concurrent_calls))
+        self.metrics_registry = get_metrics_registry()
+        self.metrics_exporter = MetricsExporter(self.metrics_registry)
+        self._model_info = None
+        self.health_prober = HealthProber(self._check_engine)
+        try:
+            self.health_prober.start()
+        except RuntimeError:
+            self.logger.info("No running event loop, health probing starts on first health check")
+
+        self.warmup_entries = []
+        self.warmup_task = None
+        # Frontends sharing an engine warm it up once, from the first client.
+        if self.engine_args.extra_args.warmup_file and (self.client_config or {}).get("client_index", 0) == 0:
+            self.warmup_entries = load_warmup_profile(self.engine_args.extra_args.warmup_file)
+            self.logger.info("Loaded %d warmup entries from %s",
+                             len(self.warmup_entries), self.engine_args.extra_args.warmup_file)
+            try:
+                self._start_warmup()
+            except RuntimeError:
+                self.logger.info("No running event loop, warmup starts on first health check")
+
+
+    @classmethod
+    @contextmanager
+    def shared_engine(cls, num_clients: int):
+        """Launch one V1 engine core process serving `num_clients` frontends.
+
+        The frontends talk to the engine core over ZeroMQ; each yielded client
+        config holds the socket addresses and index of one frontend.
+        """
+        from vllm.usage.usage_lib import UsageContext
+        from vllm.v1.engine.utils import launch_core_engines
+        from vllm.v1.executor.abstract import Executor
+        from vllm.v1.metrics.prometheus import setup_multiprocess_prometheus
+
+        engine_args = ServerConfigs.get("vllm")
+        if not int(engine_args.extra_args.vllm_use_v1):
+            raise ValueError("Multiple frontends require the vLLM V1 engine (VLLM_EXTRA_VLLM_USE_V1=1)")
+        os.environ.pop('CUDA_VISIBLE_DEVICES', None)
+        setup_multiprocess_prometheus()
+        cls._resolve_model(engine_args)
+        engine_args.mm_processor_cache_gb = 0
+        vllm_config = engine_args.create_engine_config(usage_context=UsageContext.OPENAI_API_SERVER)
+
+        # The engines live for as long as the launch context is open, so the
+        # frontends are served from inside it.
+        with launch_core_engines(vllm_config, Executor.get_class(vllm_config),
+                                 not engine_args.disable_log_stats,
+                                 num_clients) as (engine_manager, coordinator, addresses):
+            stats_update_address = (coordinator.get_stats_publish_address()
+                                    if coordinator else addresses.frontend_stats_publish_address)
+            try:
+                yield [{
+                    "input_address": addresses.inputs[index],
+                    "output_address": addresses.outputs[index],
+                    "stats_update_address": stats_update_address,
+                    "client_count": num_clients,
+                    "client_index": index,
+                } for index in range(num_clients)]
+            finally:
+                if engine_manager is not None:
+                    engine_manager.close()
+                if coordinator is not None:
+                    coordinator.close()
+
+    @classmethod
+    def build_preprocessor(cls):
+        """Build a `VLLMPreprocessor` for the configured model."""
+        from oc_serve.servers.vllm.preprocessing import VLLMPreprocessor
+        engine_args = ServerConfigs.get("vllm")
+        cls._resolve_model(engine_args)
+        return VLLMPreprocessor(engine_args)
+
+    @staticmethod
+    def _resolve_model(engine_args):
+        """Point `engine_args` at the local artifact cache copy of the model."""
+        model_path = ArtifactManager().resolve(engine_args.model)
+        if model_path != engine_args.model:
+            if engine_args.served_model_name is None:
+                engine_args.served_model_name = engine_args.model
+            engine_args.model = model_path
+
+    @cached_property
+    def instruction_server(self):
+        """Chat completion server, optionally with the prompt prefix token cache."""
+        from oc_serve.servers.vllm.preprocessing import PreprocessedOpenAIServingChat
+        chat_kwargs = {}
+        chat_server_cls = PreprocessedOpenAIServingChat
+        if int(self.engine_args.extra_args.prompt_prefix_cache_max_tokens) > 0:
+            from oc_serve.servers.vllm.prefix_cache import CachedOpenAIServingChat, PrefixTokenCache
+            chat_server_cls = CachedOpenAIServingChat
+            chat_kwargs["prefix_cache"] = PrefixTokenCache(
+                max_tokens=int(self.engine_args.extra_args.prompt_prefix_cache_max_tokens),
+                max_splits=int(self.engine_args.extra_args.prompt_prefix_cache_max_splits),
+            )
+            self.logger.info("Prompt prefix cache is ENABLED")
+        return chat_server_cls(
             self.engine,
-            model_config,
+            self.model_config,
             models=self.openai_models,
             response_role=self.engine_args.extra_args.response_role,
             chat_template=self.engine_args.extra_args.chat_template,
@@ -84,119 +219,195 @@ class VLLM(Server):
             return_tokens_as_token_ids=self.engine_args.extra_args.return_tokens_as_token_ids,
             enable_auto_tools=self.engine_args.extra_args.enable_auto_tools,
             tool_parser=self.engine_args.extra_args.tool_parser,
-            chat_template_content_format=self.engine_args.extra_args.chat_template_content_format
+            chat_template_content_format=self.engine_args.extra_args.chat_template_content_format,
+            **chat_kwargs
         )
-        self.completion_server = OpenAIServingCompletion(
+
+
+    @cached_property
+    def completion_server(self):
+        """Completion server."""
+        from vllm.entrypoints.openai.serving_completion import OpenAIServingCompletion
+        return OpenAIServingCompletion(
             self.engine,
-            model_config,
+            self.model_config,
             models=self.openai_models,
             request_logger=None,
             return_tokens_as_token_ids=self.engine_args.extra_args.return_tokens_as_token_ids
         )
-        self.tokenization_server = OpenAIServingTokenization(
+
+
+    @cached_property
+    def tokenization_server(self):
+        """Tokenize / detokenize server."""
+        from vllm.entrypoints.openai.serving_tokenization import OpenAIServingTokenization
+        return OpenAIServingTokenization(
             self.engine,
-            model_config,
+            self.model_config,
             models=self.openai_models,
             request_logger=None,
             chat_template=self.engine_args.extra_args.chat_template,
             chat_template_content_format=self.engine_args.extra_args.chat_template_content_format
         )
-        if int(self.engine_args.extra_args.vllm_enable_scoring):
-            self.scoring_server = ServingScores(
-                self.engine,
-                model_config,
-                models=self.openai_models,
-                request_logger=None
-            )
-            self.logger.info("Scoring endpoint is ENABLED")
-        else:
-            self.logger.info("Scoring endpoint is DISABLED")
-        self.pooling_server = None
-        if int(self.engine_args.extra_args.vllm_enable_pooling):
-            self.pooling_server = OpenAIServingPooling(
-                self.engine,
-                model_config,
-                models=self.openai_models,
-                request_logger=None,
-                chat_template=self.engine_args.extra_args.chat_template,
-                chat_template_content_format=self.engine_args.extra_args.chat_template_content_format
-            )
-            self.logger.info("Pooling/embeddings endpoint is ENABLED")
-        else:
-            self.logger.info("Pooling/embeddings endpoint is DISABLED")
 
-        if int(self.engine_args.extra_args.use_transcribe_server):
-            self.transcription_server = OpenAIServingTranscription(
-                self.engine,
-                model_config,
-                models=self.openai_models,
-                request_logger=None,
-                return_tokens_as_token_ids=self.engine_args.extra_args.return_tokens_as_token_ids
-            )
-        self.skips = int(self.engine_args.extra_args.skips)
-        self.semaphore = asyncio.Semaphore(int(self.engine_args.extra_args.max_concurrent_calls))
-        self.metrics_registry = get_metrics_registry()
+
+    @cached_property
+    def scoring_server(self):
+        """Scoring server, or None when scoring is disabled."""
+        if not int(self.engine_args.extra_args.vllm_enable_scoring):
+            return None
+        from vllm.entrypoints.openai.serving_score import ServingScores
+        return ServingScores(
+            self.engine,
+            self.model_config,
+            models=self.openai_models,
+            request_logger=None
+        )
+
+
+    @cached_property
+    def pooling_server(self):
+        """Pooling/embeddings server, or None when pooling is disabled."""
+        if not int(self.engine_args.extra_args.vllm_enable_pooling):
+            return None
+        from vllm.entrypoints.openai.serving_pooling import OpenAIServingPooling
+        return OpenAIServingPooling(
+            self.engine,
+            self.model_config,
+            models=self.openai_models,
+            request_logger=None,
+            chat_template=self.engine_args.extra_args.chat_template,
+            chat_template_content_format=self.engine_args.extra_args.chat_template_content_format
+        )
+
+
+    @cached_property
+    def transcription_server(self):
+        """Transcription server, or None when transcription is disabled."""
+        if not int(self.engine_args.extra_args.use_transcribe_server):
+            return None
+        from vllm.entrypoints.openai.serving_transcription import OpenAIServingTranscription
+        return OpenAIServingTranscription(
+            self.engine,
+            self.model_config,
+            models=self.openai_models,
+            request_logger=None,
+            return_tokens_as_token_ids=self.engine_args.extra_args.return_tokens_as_token_ids
+        )
+
+
+    def _start_warmup(self):
+        """Schedule the warmup profile on the running event loop."""
+        self.warmup_task = asyncio.get_running_loop().create_task(run_warmup(
+            self.instruction_server,
+            self.completion_server,
+            self.warmup_entries,
+            max_tokens=int(self.engine_args.extra_args.warmup_max_tokens),
+            concurrency=int(self.engine_args.extra_args.warmup_concurrency),
+            admit=self._admit,
+        ))
+
+
+    async def _check_engine(self):
+        """Background health check; also refreshes the cached model list."""
+        await self.engine.check_health()
+        self._model_info = await self.openai_models.show_available_models()
+
+
+    async def check_health(self):
+        """Raise if the engine is unhealthy; wait for the warmup profile to finish first.
+
+        Ray Serve runs this check once before a new replica takes traffic, so
+        replicas are only routed requests once they are warm.
+        """
+        if self.warmup_entries:
+            if self.warmup_task is None:
+                self._start_warmup()
+            await asyncio.shield(self.warmup_task)
+        status = await self.health_prober.status()
+        if not status.healthy:
+            raise RuntimeError(f"Engine is unhealthy: {status.error}")
 
 
     async def check_model_health(self, raw_request: Request = None):
-        async with self.semaphore:
-            await self.engine.check_health()
-            return Response(status_code=200,
-                            content="Model is Healthy!")
+        if self.warmup_entries:
+            if self.warmup_task is None:
+                self._start_warmup()
+            if not self.warmup_task.done():
+                return Response(status_code=503, content="Model is warming up")
+        status = await self.health_prober.status()
+        headers = {"X-Health-Age-S": f"{status.age_s:.3f}"}
+        if not status.healthy:
+            return Response(status_code=503, content=f"Model is unhealthy: {status.error}",
+                            headers=headers)
+        return Response(status_code=200,
+                        content="Model is Healthy!", headers=headers)
 
 
     async def get_model_info(self, raw_request: Request = None):
-        async with self.semaphore:
+        models = self._model_info
+        if models is None:
             models = await self.openai_models.show_available_models()
-            return JSONResponse(content=models.model_dump())
+        return FastJSONResponse(content=models)
 
 
-    async def instruct(self, request: ChatCompletionRequest, raw_request: Request):
-        async with self.semaphore:
+    async def instruct(self, request: ChatCompletionRequest, raw_request: Request,
+                       preprocessed=None):
+        async with self._admit("instruct"):
             self.logger.info("Instruct Request")
-            generator = await self.instruction_server.create_chat_completion(request,
-                                                                             raw_request)
+            if preprocessed is None:
+                generator = await self.instruction_server.create_chat_completion(request,
+                                                                                 raw_request)
+            else:
+                generator = await self.instruction_server.create_preprocessed_chat_completion(
+                    preprocessed, request, raw_request)
             if isinstance(generator, ErrorResponse):
-                return JSONResponse(content=generator.model_dump(),
-                                    status_code=generator.code)
+                return FastJSONResponse(content=generator,
+                                        status_code=generator.code)
             if request.stream:
-                return StreamingResponse(content=generator,
-                                         media_type="text/event-stream")
+                return SSEResponse(content=self._stream(generator, "instruct"))
 
             assert isinstance(generator, ChatCompletionResponse)
-            return JSONResponse(content=generator.model_dump())
+            return FastJSONResponse(content=generator, endpoint="instruct")
 
 
-    async def complete(self, request: CompletionRequest, raw_request: Request):
-        async with self.semaphore:
+    async def complete(self, request: CompletionRequest, raw_request: Request,
+                       preprocessed=None):
+        async with self._admit("complete"):
             self.logger.info("Complete Request")
+            if preprocessed is not None:
+                request.prompt = preprocessed
             generator = await self.completion_server.create_completion(request,
                                                                        raw_request)
             if isinstance(generator, ErrorResponse):
-                return JSONResponse(content=generator.model_dump(),
-                                    status_code=generator.code)
+                return FastJSONResponse(content=generator,
+                                        status_code=generator.code)
             if request.stream:
-                return StreamingResponse(content=generator,
-                                         media_type="text/event-stream")
+                return SSEResponse(content=self._stream(generator, "complete"))
 
             assert isinstance(generator, CompletionResponse)
-            return JSONResponse(content=generator.model_dump())
+            return FastJSONResponse(content=generator, endpoint="complete")
 
 
     async def transcribe(self,
                          request: Annotated[TranscriptionRequest, Form()],
-                         raw_request: Request):
+                         raw_request: Request,
+                         preprocessed=None):
         """Transcription endpoint handling audio transcription requests."""
         self.logger.info("Request Transcribe")
         if not bool(self.engine_args.extra_args.use_transcribe_server):
-            return JSONResponse(content={"error": {"message": "It seems "
-                                         "this model does not support transcription, "
-                                         "or transcription is disabled on this server.",
-                                         "type": "disabled_feature"}},
-                                status_code=404)
-
-        audio_data = await request.file.read()
-        chunks, input_audio_duration = split_audio_by_time(audio_data)
+            return FastJSONResponse(content={"error": {"message": "It seems "
+                                             "this model does not support transcription, "
+                                             "or transcription is disabled on this server.",
+                                             "type": "disabled_feature"}},
+                                    status_code=404)
+
+        if preprocessed is not None:
+            chunks, input_audio_duration = preprocessed
+        else:
+            audio_data = await request.file.read()
+            with request_timer.stage("transcribe", "audio_decode"):
+                chunks, input_audio_duration = split_audio_by_time(audio_data)
         self.logger.debug("split into %d audio chunks", len(chunks))
 
         texts = []
@@ -206,11 +417,10 @@ class VLLM(Server):
                 chunk, request, raw_request
             )
             if isinstance(generator, ErrorResponse):
-                return JSONResponse(content=generator.model_dump(),
-                                    status_code=generator.code)
+                return FastJSONResponse(content=generator,
+                                        status_code=generator.code)
 
-            data = generator.model_dump()
-            texts.append(data["text"])
+            texts.append(generator.text)
             response = SpeechResponse(
                 model=self.engine_args.model,
                 data=[TranscribeResponseData(index=1, text=" ".join(texts))],
@@ -218,65 +428,115 @@ class VLLM(Server):
                                                    input_audio_duration=input_audio_duration),
             )
 
-        return JSONResponse(content=response.model_dump(exclude_none=True))
+        return FastJSONResponse(content=response, exclude_none=True, endpoint="transcribe")
+
+
+    @property
+    def supports_live_transcription(self) -> bool:
+        return bool(self.engine_args.extra_args.use_transcribe_server)
+
+
+    async def transcribe_audio(self, audio: bytes, language: Optional[str] = None,
+                               prompt: Optional[str] = None):
+        if not self.supports_live_transcription:
+            return await super().transcribe_audio(audio, language, prompt)
+        request = TranscriptionRequest.model_construct(language=language, prompt=prompt or "",
+                                                       response_format="json")
+        async with self._admit("transcribe"):
+            result = await self.transcription_server.create_transcription(audio, request, None)
+        if isinstance(result, ErrorResponse):
+            raise RuntimeError(result.error.message)
+        return result.text
+
+
+    @staticmethod
+    def _gauge_values(name: str) -> List[float]:
+        """Sample values of the vLLM gauge `name` (one per engine), if it is registered."""
+        return [sample.value for metric in REGISTRY.restricted_registry([name]).collect()
+                for sample in metric.samples if sample.name == name]
+
+    def load_signals(self) -> Dict[str, float]:
+        """
+        Engine load of this replica:
+
+        - `kv_cache_utilization`: fraction of the KV cache in use (0-1),
+        - `waiting_requests`: requests waiting in the engine scheduler queue,
+        - `queued_prompt_tokens`: prompt tokens of in-flight requests not yet prefilled,
+        - `admission_waiting` / `admission_wait_s`: see `Server._admission_signals`.
+        """
+        signals = {}
+        kv_cache = (self._gauge_values("vllm:kv_cache_usage_perc")
+                    or self._gauge_values("vllm:gpu_cache_usage_perc"))
+        if kv_cache:
+            signals["kv_cache_utilization"] = sum(kv_cache) / len(kv_cache)
+        waiting = self._gauge_values("vllm:num_requests_waiting")
+        if waiting:
+            signals["waiting_requests"] = sum(waiting)
+        output_processor = getattr(self.engine, "output_processor", None)
+        if output_processor is not None:
+            signals["queued_prompt_tokens"] = float(sum(
+                state.prompt_len for state in list(output_processor.request_states.values())
+                if state.is_prefilling))
+
+        signals.update(self._admission_signals())
+        return signals
 
 
     async def metrics(self, request: Request = None) -> Response:
-        return Response(generate_latest(self.metrics_registry),
-                        headers={"Content-Type": CONTENT_TYPE_LATEST})
+        return await self.metrics_exporter.response(request)
 
 
     async def tokenize(self, request: TokenizeRequest, raw_request: Request):
-        async with self.semaphore:
+        async with self._admit("tokenize"):
             self.logger.info("Tokenize Request")
             generator = await self.tokenization_server.create_tokenize(request,
                                                                        raw_request)
             if isinstance(generator, ErrorResponse):
-                return JSONResponse(content=generator.model_dump(),
-                                    status_code=generator.code)
+                return FastJSONResponse(content=generator,
+                                        status_code=generator.code)
             assert isinstance(generator, TokenizeResponse)
-            return JSONResponse(content=generator.model_dump())
+            return FastJSONResponse(content=generator, endpoint="tokenize")
 
 
     async def scoring(self, request: ScoreRequest, raw_request: Request):
         if not int(self.engine_args.extra_args.vllm_enable_scoring) or self.scoring_server is None:
-            return JSONResponse(content={"error": {"message": "Scoring is disabled on this server.",
-                                   "type": "disabled_feature"}},
-                                status_code=404)
-        async with self.semaphore:
+            return FastJSONResponse(content={"error": {"message": "Scoring is disabled on this server.",
+                                       "type": "disabled_feature"}},
+                                    status_code=404)
+        async with self._admit("scoring"):
             self.logger.info("Scoring Request")
             generator = await self.scoring_server.create_score(request,
                                                                raw_request)
             if isinstance(generator, ErrorResponse):
-                return JSONResponse(content=generator.model_dump(),
-                                    status_code=generator.code)
+                return FastJSONResponse(content=generator,
+                                        status_code=generator.code)
             assert isinstance(generator, ScoreResponse)
-            return JSONResponse(content=generator.model_dump())
+            return FastJSONResponse(content=generator, endpoint="scoring")
 
 
     async def pooling(self, request: PoolingRequest, raw_request: Request):
         if not int(self.engine_args.extra_args.vllm_enable_pooling) or self.pooling_server is None:
-            return JSONResponse(content={"error": {"message": "Pooling is disabled on this server.",
-                                                   "type": "disabled_feature"}},
-                                status_code=404)
-        async with self.semaphore:
+            return FastJSONResponse(content={"error": {"message": "Pooling is disabled on this server.",
+                                                       "type": "disabled_feature"}},
+                                    status_code=404)
+        async with self._admit("pooling"):
             self.logger.info("Pooling Request")
             generator = await self.pooling_server.create_pooling(request,
                                                                  raw_request)
             if isinstance(generator, ErrorResponse):
-                return JSONResponse(content=generator.model_dump(),
-                                    status_code=generator.code)
+                return FastJSONResponse(content=generator,
+                                        status_code=generator.code)
             assert isinstance(generator, PoolingResponse)
-            return JSONResponse(content=generator.model_dump())
+            return FastJSONResponse(content=generator, endpoint="pooling")
 
 
     async def detokenize(self, request: DetokenizeRequest, raw_request: Request):
-        async with self.semaphore:
+        async with self._admit("detokenize"):
             self.logger.info("Detokenize Request")
             generator = await self.tokenization_server.create_detokenize(request,
                                                                          raw_request)
             if isinstance(generator, ErrorResponse):
-                return JSONResponse(content=generator.model_dump(),
-                                    status_code=generator.code)
+                return FastJSONResponse(content=generator,
+                                        status_code=generator.code)
             assert isinstance(generator, DetokenizeResponse)
-            return JSONResponse(content=generator.model_dump())
+            return FastJSONResponse(content=generator, endpoint="detokenize")
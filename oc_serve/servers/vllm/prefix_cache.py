@@ -0,0 +1,175 @@
+"""Prompt prefix tokenization cache for the VLLM chat server."""
+import asyncio
+import bisect
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from prometheus_client import Counter
+
+from oc_serve.servers.vllm.preprocessing import PreprocessedOpenAIServingChat
+
+PREFIX_CACHE_LOOKUPS = Counter(
+    "oc_serve_prompt_prefix_cache_lookups",
+    "Prompt prefix cache lookups, by result (hit/miss).",
+    ["result"],
+)
+PREFIX_CACHE_TOKENS_SAVED = Counter(
+    "oc_serve_prompt_prefix_cache_tokens_saved",
+    "Prompt tokens served from the prefix cache instead of being re-tokenized.",
+)
+PREFIX_CACHE_SECONDS_SAVED = Counter(
+    "oc_serve_prompt_prefix_cache_seconds_saved",
+    "Estimated tokenization time saved by the prefix cache, in seconds.",
+)
+
+
+class PrefixTokenCache:
+    """
+    Bounded LRU cache of token ids for rendered prompt prefixes.
+
+    Prefixes are cut at added-token boundaries (`<|im_start|>`,
+    `<|eot_id|>`, ...). Fast tokenizers split on added tokens before running
+    the model's pre-tokenizer, so the ids of the text before such a boundary
+    do not depend on the text after it. Entries are keyed by a digest of the
+    namespace (model, chat template, special-token handling) and the prefix
+    text, and evicted least-recently-used once `max_tokens` is exceeded.
+    """
+    def __init__(self, max_tokens: int, max_splits: int = 4):
+        self.max_tokens = max_tokens
+        self.max_splits = max_splits
+        self.num_tokens = 0
+        self._entries: "OrderedDict[bytes, Tuple[int, ...]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return digest in self._entries
+
+    @staticmethod
+    def boundary_digests(namespace: str, prompt: str,
+                         boundaries: Sequence[int]) -> List[bytes]:
+        """Digest of `prompt[:b]` for every boundary, hashed incrementally."""
+        hasher = hashlib.blake2b(namespace.encode("utf-8"), digest_size=16)
+        digests = []
+        start = 0
+        for boundary in boundaries:
+            hasher.update(prompt[start:boundary].encode("utf-8"))
+            digests.append(hasher.copy().digest())
+            start = boundary
+        return digests
+
+    def lookup(self, digests: Sequence[bytes],
+               boundaries: Sequence[int]) -> Optional[Tuple[int, Tuple[int, ...]]]:
+        """Return `(boundary, token_ids)` of the longest cached prefix."""
+        for digest, boundary in zip(reversed(digests), reversed(boundaries)):
+            token_ids = self._entries.get(digest)
+            if token_ids is not None:
+                self._entries.move_to_end(digest)
+                return boundary, token_ids
+        return None
+
+    def insert(self, digest: bytes, token_ids: Sequence[int]) -> None:
+        """Store the token ids of a prefix, evicting old entries as needed."""
+        if digest in self._entries or not token_ids or len(token_ids) > self.max_tokens:
+            return
+        self._entries[digest] = tuple(token_ids)
+        self.num_tokens += len(token_ids)
+        while self.num_tokens > self.max_tokens:
+            _, evicted = self._entries.popitem(last=False)
+            self.num_tokens -= len(evicted)
+
+
+class CachedOpenAIServingChat(PreprocessedOpenAIServingChat):
+    """
+    Chat server that reuses token ids of previously seen prompt prefixes.
+
+    The chat template is still rendered per request, but only the text after
+    the longest cached prefix is tokenized. Prefixes are learned from full
+    tokenizations (with offsets) and checked against a suffix-only
+    tokenization before they are cached, so cached results always match
+    what the tokenizer would produce for the whole prompt.
+    """
+    def __init__(self, *args, prefix_cache: PrefixTokenCache, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prefix_cache = prefix_cache
+        self._boundary_patterns: Dict[int, Optional[re.Pattern]] = {}
+        self._seconds_per_token = 0.0
+
+    def _boundary_pattern(self, tokenizer) -> Optional[re.Pattern]:
+        key = id(tokenizer)
+        if key not in self._boundary_patterns:
+            added = sorted(getattr(tokenizer, "get_added_vocab", dict)(), key=len, reverse=True)
+            self._boundary_patterns[key] = (
+                re.compile("|".join(re.escape(tok) for tok in added)) if added else None
+            )
+        return self._boundary_patterns[key]
+
+    async def _normalize_prompt_text_to_input(self, request, prompt: str, tokenizer,
+                                              add_special_tokens: bool):
+        pattern = self._boundary_pattern(tokenizer)
+        if (pattern is None
+                or not getattr(tokenizer, "is_fast", False)
+                or getattr(request, "truncate_prompt_tokens", None) is not None
+                or (self.model_config.encoder_config or {}).get("do_lower_case", False)):
+            return await super()._normalize_prompt_text_to_input(
+                request, prompt, tokenizer, add_special_tokens)
+
+        boundaries = [m.start() for m in pattern.finditer(prompt) if m.start() > 0]
+        namespace = f"{self.model_config.model}|{self.chat_template}|{add_special_tokens}"
+        digests = PrefixTokenCache.boundary_digests(namespace, prompt, boundaries)
+
+        cached = self.prefix_cache.lookup(digests, boundaries)
+        if cached is not None:
+            boundary, prefix_ids = cached
+            PREFIX_CACHE_LOOKUPS.labels("hit").inc()
+            PREFIX_CACHE_TOKENS_SAVED.inc(len(prefix_ids))
+            PREFIX_CACHE_SECONDS_SAVED.inc(len(prefix_ids) * self._seconds_per_token)
+            encoded = await self._get_async_tokenizer(tokenizer)(prompt[boundary:],
+                                                                 add_special_tokens=False)
+            return self._validate_input(request, [*prefix_ids, *encoded.input_ids], prompt)
+
+        PREFIX_CACHE_LOOKUPS.labels("miss").inc()
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        encoded = await loop.run_in_executor(
+            self._tokenizer_executor,
+            partial(tokenizer, prompt, add_special_tokens=add_special_tokens,
+                    return_offsets_mapping=True),
+        )
+        input_ids = list(encoded.input_ids)
+        if input_ids:
+            self._seconds_per_token = (time.perf_counter() - start) / len(input_ids)
+
+        splits = [(digest, boundary)
+                  for digest, boundary in list(zip(digests, boundaries))[-self.prefix_cache.max_splits:]
+                  if digest not in self.prefix_cache]
+        if splits:
+            learned = await loop.run_in_executor(
+                self._tokenizer_executor,
+                partial(self._learn_prefixes, tokenizer, prompt, input_ids,
+                        encoded["offset_mapping"], splits),
+            )
+            for digest, prefix_ids in learned:
+                self.prefix_cache.insert(digest, prefix_ids)
+        return self._validate_input(request, input_ids, prompt)
+
+    @staticmethod
+    def _learn_prefixes(tokenizer, prompt: str, input_ids: List[int],
+                        offsets: Sequence[Tuple[int, int]],
+                        splits: Sequence[Tuple[bytes, int]]) -> List[Tuple[bytes, List[int]]]:
+        """Return the prefixes whose token ids compose exactly with their suffix."""
+        ends = [end for _, end in offsets]
+        learned = []
+        for digest, boundary in splits:
+            split = bisect.bisect_right(ends, boundary)
+            if split < len(offsets) and offsets[split][0] < boundary:
+                continue
+            suffix = tokenizer(prompt[boundary:], add_special_tokens=False).input_ids
+            if list(suffix) == input_ids[split:]:
+                learned.append((digest, input_ids[:split]))
+        return learned
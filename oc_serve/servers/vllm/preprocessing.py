@@ -0,0 +1,162 @@
+"""CPU-side request preprocessing for the VLLM server.
+
+`VLLMPreprocessor` renders chat templates, tokenizes prompts and decodes audio
+without an engine, so it can run in a CPU-only deployment in front of the GPU
+replicas. The GPU server consumes its output: completion prompts are replaced
+by token ids, and rendered chats are served by `PreprocessedOpenAIServingChat`,
+which skips rendering and tokenization for them.
+"""
+import time
+from contextvars import ContextVar
+from typing import Any, List, Optional, Tuple
+
+from transformers import PreTrainedTokenizer, PreTrainedTokenizerFast
+from vllm.entrypoints.chat_utils import (
+    apply_hf_chat_template,
+    parse_chat_messages,
+    resolve_chat_template_content_format,
+)
+from vllm.entrypoints.openai.serving_chat import OpenAIServingChat
+from vllm.inputs.data import TokensPrompt
+from vllm.transformers_utils.tokenizer import get_tokenizer
+
+from oc_serve.utils import request_timer, split_audio_by_time
+
+PreprocessedChat = Tuple[List[Any], List[int]]
+
+PREPROCESSED_CHAT: ContextVar[Optional[PreprocessedChat]] = ContextVar(
+    "oc_serve_preprocessed_chat", default=None)
+
+# Tokenization time of the chat being preprocessed, so it can be
+# subtracted from the total to get the chat template time.
+_TOKENIZE_SECONDS: ContextVar[Optional[List[float]]] = ContextVar(
+    "oc_serve_tokenize_seconds", default=None)
+
+
+class VLLMPreprocessor:
+    """
+    Engine-free request preprocessing using the served model's tokenizer.
+
+    Requests the preprocessor cannot handle exactly like the engine would
+    (tools, documents, per-request chat templates, multimodal content,
+    prompt truncation, echo) return `None` and are processed on the GPU
+    replica as usual.
+    """
+    def __init__(self, engine_args):
+        self.engine_args = engine_args
+        self.model_config = engine_args.create_model_config()
+        self.tokenizer = get_tokenizer(
+            self.model_config.tokenizer,
+            tokenizer_mode=self.model_config.tokenizer_mode,
+            trust_remote_code=self.model_config.trust_remote_code,
+            revision=self.model_config.tokenizer_revision,
+        )
+        self.chat_template = engine_args.extra_args.chat_template
+        self.supported = (
+            isinstance(self.tokenizer, (PreTrainedTokenizer, PreTrainedTokenizerFast))
+            and not (self.model_config.encoder_config or {}).get("do_lower_case", False)
+        )
+        self.content_format = resolve_chat_template_content_format(
+            self.chat_template,
+            None,
+            engine_args.extra_args.chat_template_content_format,
+            self.tokenizer,
+            model_config=self.model_config,
+        ) if self.supported else None
+
+    def chat(self, request) -> Optional[PreprocessedChat]:
+        """Return the parsed conversation and prompt token ids of a chat request."""
+        if (not self.supported or request.tools or request.documents
+                or request.chat_template or request.truncate_prompt_tokens is not None):
+            return None
+        conversation, mm_data, _ = parse_chat_messages(
+            request.messages, self.model_config, self.tokenizer, self.content_format)
+        if mm_data:
+            return None
+
+        chat_template_kwargs = dict(
+            chat_template=self.chat_template,
+            add_generation_prompt=request.add_generation_prompt,
+            continue_final_message=request.continue_final_message,
+            tools=None,
+            documents=None,
+        )
+        chat_template_kwargs.update(request.chat_template_kwargs or {})
+        prompt = apply_hf_chat_template(
+            tokenizer=self.tokenizer,
+            conversation=conversation,
+            model_config=self.model_config,
+            **chat_template_kwargs,
+        )
+        prompt_token_ids = self.tokenizer(
+            prompt, add_special_tokens=request.add_special_tokens).input_ids
+        return conversation, list(prompt_token_ids)
+
+    def completion(self, request) -> Optional[List[List[int]]]:
+        """Return the token ids of every text prompt of a completion request."""
+        if (not self.supported or request.echo or request.prompt_embeds is not None
+                or request.truncate_prompt_tokens is not None):
+            return None
+        prompts = [request.prompt] if isinstance(request.prompt, str) else request.prompt
+        if not prompts or not all(isinstance(prompt, str) for prompt in prompts):
+            return None
+        encoded = self.tokenizer(prompts, add_special_tokens=request.add_special_tokens)
+        return [list(input_ids) for input_ids in encoded.input_ids]
+
+    @staticmethod
+    def audio(audio_bytes: bytes) -> Tuple[List[bytes], float]:
+        """Decode audio into 16-bit PCM WAV chunks and return its duration."""
+        return split_audio_by_time(audio_bytes)
+
+
+class PreprocessedOpenAIServingChat(OpenAIServingChat):
+    """
+    OpenAIServingChat that can serve chats rendered by `VLLMPreprocessor`.
+
+    Chats it renders itself are timed as the `template` and `tokenize`
+    stages of the `instruct` endpoint.
+    """
+    async def create_preprocessed_chat_completion(self, preprocessed: PreprocessedChat,
+                                                  request, raw_request=None):
+        """`create_chat_completion` using an already rendered and tokenized prompt."""
+        token = PREPROCESSED_CHAT.set(preprocessed)
+        try:
+            return await self.create_chat_completion(request, raw_request)
+        finally:
+            PREPROCESSED_CHAT.reset(token)
+
+    async def _preprocess_chat(self, request, tokenizer, messages, *args, **kwargs):
+        preprocessed = PREPROCESSED_CHAT.get()
+        if preprocessed is None:
+            tokenize_seconds = [0.0]
+            token = _TOKENIZE_SECONDS.set(tokenize_seconds)
+            start = time.perf_counter()
+            try:
+                return await super()._preprocess_chat(request, tokenizer, messages, *args, **kwargs)
+            finally:
+                _TOKENIZE_SECONDS.reset(token)
+                request_timer.observe("instruct", "template",
+                                      time.perf_counter() - start - tokenize_seconds[0])
+                request_timer.observe("instruct", "tokenize", tokenize_seconds[0])
+
+        # Tool parsers may adjust the request, e.g. to keep special tokens in the output.
+        tool_parser = kwargs.get("tool_parser")
+        if tool_parser is not None and getattr(request, "tool_choice", "none") != "none":
+            request = tool_parser(tokenizer).adjust_request(request=request)
+        conversation, prompt_token_ids = preprocessed
+        self._validate_input(request, prompt_token_ids, "")
+        engine_prompt = TokensPrompt(prompt_token_ids=prompt_token_ids)
+        if request.mm_processor_kwargs is not None:
+            engine_prompt["mm_processor_kwargs"] = request.mm_processor_kwargs
+        if request.cache_salt is not None:
+            engine_prompt["cache_salt"] = request.cache_salt
+        return conversation, [prompt_token_ids], [engine_prompt]
+
+    async def _tokenize_prompt_input_async(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super()._tokenize_prompt_input_async(*args, **kwargs)
+        finally:
+            tokenize_seconds = _TOKENIZE_SECONDS.get()
+            if tokenize_seconds is not None:
+                tokenize_seconds[0] += time.perf_counter() - start
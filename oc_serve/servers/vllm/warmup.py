@@ -0,0 +1,104 @@
+"""Startup warmup for the VLLM server."""
+import asyncio
+import json
+import time
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional
+
+from prometheus_client import Gauge
+
+from oc_serve.utils import oc_logger
+from oc_serve.api.models import (
+    ChatCompletionRequest,
+    CompletionRequest,
+    ErrorResponse,
+)
+
+WARMUP_DURATION = Gauge(
+    "oc_serve_warmup_duration_seconds",
+    "Time spent running the warmup profile at replica startup.",
+    multiprocess_mode="liveall",
+)
+WARMUP_PROMPTS = Gauge(
+    "oc_serve_warmup_prompts",
+    "Number of warmup profile entries run at replica startup, by result.",
+    ["result"],
+    multiprocess_mode="liveall",
+)
+
+logger = oc_logger.get_logger("vllm.warmup")
+
+
+def load_warmup_profile(path: str) -> List[Dict[str, Any]]:
+    """Load a warmup profile.
+
+    The profile is a text file with one entry per line. JSON objects with a
+    `messages` list are run as chat requests, JSON objects with a `prompt` as
+    completion requests, and any other non-empty line is used verbatim as a
+    completion prompt.
+
+    Args:
+        path (str): Path to the profile file.
+
+    Returns:
+        List[Dict[str, Any]]: Entries with either a `messages` or a `prompt` key.
+    """
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                entry = None
+            if not isinstance(entry, dict) or not ("messages" in entry or "prompt" in entry):
+                entry = {"prompt": line}
+            entries.append(entry)
+    return entries
+
+
+async def run_warmup(instruction_server, completion_server,
+                     entries: List[Dict[str, Any]],
+                     max_tokens: int = 1,
+                     concurrency: int = 4,
+                     admit: Optional[Callable[[str], AsyncContextManager]] = None) -> float:
+    """Run every profile entry through the engine to populate its prefix cache.
+
+    Each entry is admitted through `admit("warmup")` (the server's concurrency
+    semaphore), like a client request.
+
+    Returns:
+        float: Warmup duration in seconds.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(entry: Dict[str, Any]) -> bool:
+        async with semaphore, (admit("warmup") if admit is not None else nullcontext()):
+            try:
+                if "messages" in entry:
+                    request = ChatCompletionRequest(messages=entry["messages"],
+                                                    max_tokens=max_tokens)
+                    result = await instruction_server.create_chat_completion(request, None)
+                else:
+                    request = CompletionRequest(prompt=entry["prompt"], max_tokens=max_tokens)
+                    result = await completion_server.create_completion(request, None)
+            except Exception:
+                logger.exception("warmup entry failed")
+                return False
+            if isinstance(result, ErrorResponse):
+                logger.warning("warmup entry rejected: %s", result.error.message)
+                return False
+            return True
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run(entry) for entry in entries))
+    duration = time.perf_counter() - start
+
+    WARMUP_DURATION.set(duration)
+    WARMUP_PROMPTS.labels("ok").set(sum(results))
+    WARMUP_PROMPTS.labels("failed").set(len(results) - sum(results))
+    logger.info("Warmup finished: %d/%d entries in %.2fs",
+                sum(results), len(results), duration)
+    return duration
@@ -1,5 +1,17 @@
 """Utility functions and classes for OC Serve."""
 from .logger import OCLogger
 from .metrics_registry import get_metrics_registry
+from .metrics_exposition import MetricsExporter
+from .serialization import json_dumps, json_loads, sse_event
+from .streaming import coalesce_sse, measure_sse, time_stream
+from .startup import StartupTimer
+from .timing import RequestTimer, request_timer
+from .loop_monitor import EventLoopMonitor
+from .profiler import Profiler
+from .health import HealthProber, HealthStatus
+from .artifacts import ArtifactManager
+from .live_transcription import LiveTranscriber
+from .speech import encode_speech, measure_speech, wav_stream_header
 from .audio import *
 oc_logger = OCLogger()
+startup_timer = StartupTimer()
@@ -0,0 +1,241 @@
+"""Model artifact prefetcher backed by a content-addressed local cache."""
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from prometheus_client import Counter, Histogram
+
+from configs import ArtifactConfigs
+from .logger import OCLogger
+
+MANIFEST_FILE = "oc-manifest.json"
+_CHUNK_SIZE = 8 * 1024 * 1024
+
+ARTIFACT_CACHE_LOOKUPS = Counter(
+    "oc_serve_artifact_cache_lookups",
+    "Model artifact cache lookups, by result (hit/miss).",
+    ["result"],
+)
+ARTIFACT_PREFETCH_SECONDS = Histogram(
+    "oc_serve_artifact_prefetch_seconds",
+    "Time spent prefetching model artifacts into the local cache.",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 2400, 3600),
+)
+ARTIFACT_PREFETCH_BYTES = Counter(
+    "oc_serve_artifact_prefetch_bytes",
+    "Bytes copied into the local model artifact cache.",
+)
+
+
+class ArtifactChecksumError(RuntimeError):
+    """A prefetched file does not match its source, or cannot be checked against a required manifest."""
+
+
+class ArtifactManager:
+    """
+    Resolves model names to a content-addressed local cache directory.
+
+    A model `org/name` is looked up under `source_dir/org/name` (a local or
+    mounted directory acting as the remote store). Files are copied in
+    parallel into `cache_dir/blobs/sha256/<digest>`, hashed while they are
+    copied, checked against the size listed from the source and verified
+    against `oc-manifest.json` when the source provides one. The model is then assembled as `cache_dir/models/<manifest digest>`
+    from hard links to the blobs, so identical files are stored once.
+
+    A per-model file lock serializes prefetches, so concurrent replicas on
+    the same node or volume share a single copy: the first one fetches and
+    the others find a cache hit once the lock is released.
+    """
+    def __init__(self, configs: Optional[ArtifactConfigs] = None):
+        self.configs = configs or ArtifactConfigs()
+        self.logger = OCLogger().get_logger("artifacts")
+        self.blobs_dir = os.path.join(self.configs.cache_dir, "blobs", "sha256")
+        self.models_dir = os.path.join(self.configs.cache_dir, "models")
+        self.refs_dir = os.path.join(self.configs.cache_dir, "refs")
+        self.locks_dir = os.path.join(self.configs.cache_dir, "locks")
+        self.tmp_dir = os.path.join(self.configs.cache_dir, "tmp")
+
+    def resolve(self, model: str) -> str:
+        """Return a local directory for `model`, prefetching it if needed.
+
+        The model name is returned unchanged when the manager is disabled, the
+        name already is a local path, or the source has no copy of it.
+        """
+        if not self.configs.enabled or not self.configs.source_dir or os.path.exists(model):
+            return model
+        source = os.path.join(self.configs.source_dir, model)
+        if not os.path.isdir(source):
+            self.logger.info("Model %s not found in artifact source %s", model,
+                             self.configs.source_dir)
+            return model
+
+        for path in (self.blobs_dir, self.models_dir, self.refs_dir, self.locks_dir, self.tmp_dir):
+            os.makedirs(path, exist_ok=True)
+
+        key = quote(model, safe="")
+        with self._lock(key):
+            files = self._list_files(source)
+            fingerprint = self._fingerprint(files)
+            cached = self._lookup(key, fingerprint)
+            if cached is not None:
+                ARTIFACT_CACHE_LOOKUPS.labels("hit").inc()
+                self.logger.info("Artifact cache hit for %s: %s", model, cached)
+                return cached
+
+            ARTIFACT_CACHE_LOOKUPS.labels("miss").inc()
+            start = time.perf_counter()
+            path = self._prefetch(source, files, key, fingerprint)
+            duration = time.perf_counter() - start
+            ARTIFACT_PREFETCH_SECONDS.observe(duration)
+            self.logger.info("Prefetched %s into %s in %.1fs", model, path, duration)
+            return path
+
+    @contextmanager
+    def _lock(self, key: str):
+        """Exclusive inter-process lock on `key`, waiting up to `lock_timeout_s`."""
+        deadline = time.monotonic() + self.configs.lock_timeout_s
+        with open(os.path.join(self.locks_dir, f"{key}.lock"), "w", encoding="utf-8") as f:
+            while True:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except OSError as exc:
+                    if exc.errno not in (errno.EAGAIN, errno.EACCES):
+                        raise
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Timed out waiting for artifact lock {key}") from exc
+                    time.sleep(0.5)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _list_files(source: str) -> List[Tuple[str, int, int]]:
+        """Return `(relative path, size, mtime_ns)` of every file under `source`."""
+        files = []
+        for root, _, names in os.walk(source):
+            for name in names:
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, source)
+                if rel == MANIFEST_FILE:
+                    continue
+                stat = os.stat(path)
+                files.append((rel, stat.st_size, stat.st_mtime_ns))
+        return sorted(files)
+
+    @staticmethod
+    def _fingerprint(files: List[Tuple[str, int, int]]) -> str:
+        return hashlib.sha256(json.dumps(files).encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str, fingerprint: str) -> Optional[str]:
+        ref_path = os.path.join(self.refs_dir, f"{key}.json")
+        try:
+            with open(ref_path, "r", encoding="utf-8") as f:
+                ref = json.load(f)
+        except (OSError, ValueError):
+            return None
+        path = os.path.join(self.models_dir, ref.get("digest", ""))
+        if ref.get("fingerprint") != fingerprint or not os.path.exists(os.path.join(path, ".complete")):
+            return None
+        return path
+
+    def _prefetch(self, source: str, files: List[Tuple[str, int, int]],
+                  key: str, fingerprint: str) -> str:
+        expected = self._load_source_manifest(source)
+        unverified = [rel for rel, _, _ in files if rel not in expected]
+        if unverified:
+            message = (f"{len(unverified)} of {len(files)} files in {source} have no checksum "
+                       f"in its {MANIFEST_FILE}")
+            if self.configs.require_manifest:
+                raise ArtifactChecksumError(message)
+            if self.configs.verify_checksums:
+                self.logger.warning("%s; only their sizes are verified", message)
+        with ThreadPoolExecutor(max_workers=max(1, self.configs.workers)) as pool:
+            digests = list(pool.map(
+                lambda file: self._fetch_blob(os.path.join(source, file[0]), file[1],
+                                              expected.get(file[0])),
+                files,
+            ))
+        manifest = {rel: {"sha256": digest, "size": size}
+                    for (rel, size, _), digest in zip(files, digests)}
+        manifest_bytes = json.dumps(manifest, sort_keys=True).encode("utf-8")
+        digest = hashlib.sha256(manifest_bytes).hexdigest()
+
+        path = os.path.join(self.models_dir, digest)
+        if not os.path.exists(os.path.join(path, ".complete")):
+            staging = os.path.join(self.tmp_dir, f"{digest}.{os.getpid()}")
+            shutil.rmtree(staging, ignore_errors=True)
+            for rel, entry in manifest.items():
+                target = os.path.join(staging, rel)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                self._link(os.path.join(self.blobs_dir, entry["sha256"]), target)
+            with open(os.path.join(staging, MANIFEST_FILE), "wb") as f:
+                f.write(manifest_bytes)
+            open(os.path.join(staging, ".complete"), "w", encoding="utf-8").close()
+            shutil.rmtree(path, ignore_errors=True)
+            os.rename(staging, path)
+
+        ref_tmp = os.path.join(self.tmp_dir, f"{key}.json.{os.getpid()}")
+        with open(ref_tmp, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "digest": digest}, f)
+        os.replace(ref_tmp, os.path.join(self.refs_dir, f"{key}.json"))
+        return path
+
+    @staticmethod
+    def _load_source_manifest(source: str) -> Dict[str, str]:
+        """Map of relative path to expected sha256 from the source manifest, if any."""
+        try:
+            with open(os.path.join(source, MANIFEST_FILE), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        return {rel: entry["sha256"] for rel, entry in manifest.items()}
+
+    def _fetch_blob(self, path: str, size: int, expected: Optional[str]) -> str:
+        """Copy `path`, listed with `size` bytes, into the blob store, returning its sha256."""
+        if expected and os.path.exists(os.path.join(self.blobs_dir, expected)):
+            return expected
+
+        copied = 0
+        hasher = hashlib.sha256()
+        tmp_path = os.path.join(self.tmp_dir, f"blob.{os.getpid()}.{id(hasher)}")
+        try:
+            with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+                while True:
+                    chunk = src.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    dst.write(chunk)
+                    copied += len(chunk)
+                    ARTIFACT_PREFETCH_BYTES.inc(len(chunk))
+            if copied != size:
+                raise ArtifactChecksumError(f"Size mismatch for {path}: "
+                                            f"expected {size} bytes, copied {copied}")
+            digest = hasher.hexdigest()
+            if self.configs.verify_checksums and expected and digest != expected:
+                raise ArtifactChecksumError(f"Checksum mismatch for {path}: "
+                                            f"expected {expected}, got {digest}")
+            blob_path = os.path.join(self.blobs_dir, digest)
+            if not os.path.exists(blob_path):
+                os.replace(tmp_path, blob_path)
+            return digest
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def _link(blob: str, target: str) -> None:
+        try:
+            os.link(blob, target)
+        except OSError:
+            os.symlink(blob, target)
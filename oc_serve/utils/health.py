@@ -0,0 +1,99 @@
+"""Background engine health probing with a cached status."""
+import asyncio
+import time
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+from prometheus_client import Gauge, Histogram
+
+from configs import HealthProbeConfigs
+from .logger import OCLogger
+
+ENGINE_HEALTHY = Gauge(
+    "oc_serve_engine_healthy",
+    "Whether the last background engine health check succeeded.",
+    multiprocess_mode="livemin",
+)
+ENGINE_HEALTH_CHECK_SECONDS = Histogram(
+    "oc_serve_engine_health_check_seconds",
+    "Duration of background engine health checks.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+
+
+class HealthStatus(NamedTuple):
+    """Result of one health check; `checked_at` is a `time.monotonic()` timestamp."""
+    healthy: bool
+    checked_at: float
+    latency_s: float
+    error: Optional[str] = None
+
+    @property
+    def age_s(self) -> float:
+        return time.monotonic() - self.checked_at
+
+
+class HealthProber:
+    """
+    Runs `check` every `interval_s` on a background task and caches the result.
+
+    `status()` answers from the cache without waiting on anything the
+    engine is doing: a check that raises or takes longer than `timeout_s`
+    marks the engine unhealthy, and so does a cached result older than
+    `max_staleness_s` (the probe task itself is stuck). The first call
+    before any check has completed runs one inline.
+
+    `start()` must be called from the thread running the event loop.
+    """
+    def __init__(self, check: Callable[[], Awaitable[None]],
+                 configs: Optional[HealthProbeConfigs] = None):
+        self.check = check
+        self.configs = configs or HealthProbeConfigs()
+        self.logger = OCLogger().get_logger("health")
+        self.last: Optional[HealthStatus] = None
+        self.task = None
+
+    def start(self) -> None:
+        """Start probing on the running event loop; does nothing if already started."""
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.configs.interval_s)
+
+    async def probe(self) -> HealthStatus:
+        """Run one check now and cache its result."""
+        started = time.monotonic()
+        error = None
+        try:
+            await asyncio.wait_for(self.check(), timeout=self.configs.timeout_s)
+        except asyncio.TimeoutError:
+            error = f"Health check timed out after {self.configs.timeout_s:.1f}s"
+        except Exception as exc:  # pylint: disable=broad-except
+            error = f"{type(exc).__name__}: {exc}"
+        now = time.monotonic()
+        ENGINE_HEALTH_CHECK_SECONDS.observe(now - started)
+        ENGINE_HEALTHY.set(error is None)
+        if error is not None and (self.last is None or self.last.healthy):
+            self.logger.error("Engine health check failed: %s", error)
+        elif error is None and self.last is not None and not self.last.healthy:
+            self.logger.info("Engine health check recovered")
+        self.last = HealthStatus(error is None, now, now - started, error)
+        return self.last
+
+    async def status(self) -> HealthStatus:
+        """Cached health status, probing inline only if nothing is cached yet."""
+        if self.task is None:
+            self.start()
+        last = self.last
+        if last is None:
+            return await self.probe()
+        if last.healthy and last.age_s > self.configs.max_staleness_s:
+            return last._replace(healthy=False,
+                                 error=f"Last health check is {last.age_s:.0f}s old")
+        return last
@@ -0,0 +1,312 @@
+"""Real-time transcription of audio streamed over a WebSocket."""
+import asyncio
+import bisect
+import io
+import json
+import time
+import wave
+from typing import Optional
+
+import numpy as np
+from prometheus_client import Counter, Gauge, Histogram
+
+from configs import LiveTranscriptionConfigs
+from .logger import OCLogger
+
+_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10, 30)
+
+LIVE_TRANSCRIPTION_LATENCY = Histogram(
+    "oc_serve_live_transcription_latency_seconds",
+    "Time from the arrival of the last audio in a window to its hypothesis being sent, by kind.",
+    ["kind"],
+    buckets=_LATENCY_BUCKETS,
+)
+LIVE_TRANSCRIPTION_INFERENCE = Histogram(
+    "oc_serve_live_transcription_inference_seconds",
+    "Time spent transcribing one live transcription window, by kind.",
+    ["kind"],
+    buckets=_LATENCY_BUCKETS,
+)
+LIVE_TRANSCRIPTION_OVER_BUDGET = Counter(
+    "oc_serve_live_transcription_over_budget",
+    "Live transcription hypotheses sent later than the latency budget, by kind.",
+    ["kind"],
+)
+LIVE_TRANSCRIPTION_SESSIONS = Gauge(
+    "oc_serve_live_transcription_sessions",
+    "Open live transcription sessions.",
+    multiprocess_mode="livesum",
+)
+
+_BYTES_PER_SAMPLE = 2
+_FRAME_MS = 30
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap 16-bit mono PCM in a WAV container."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(_BYTES_PER_SAMPLE)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buf.getvalue()
+
+
+class PCMBuffer:
+    """
+    Rolling buffer of 16-bit mono PCM addressed by absolute sample offsets.
+
+    Audio before the start of the current segment is discarded, so memory
+    stays bounded by the maximum window length.
+    """
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.data = bytearray()
+        self.start = 0
+        self.pending = b""
+        self.changed = asyncio.Event()
+        self._arrival_ends = []
+        self._arrival_times = []
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.data) // _BYTES_PER_SAMPLE
+
+    def append(self, pcm: bytes) -> None:
+        """Append PCM bytes; a trailing partial sample is kept for the next call."""
+        pcm = self.pending + pcm
+        whole = len(pcm) // _BYTES_PER_SAMPLE * _BYTES_PER_SAMPLE
+        self.pending = pcm[whole:]
+        if not whole:
+            return
+        self.data += pcm[:whole]
+        self._arrival_ends.append(self.end)
+        self._arrival_times.append(time.monotonic())
+        self.changed.set()
+
+    def arrival_time(self, sample: int) -> float:
+        """Monotonic time at which audio up to `sample` had arrived."""
+        index = bisect.bisect_left(self._arrival_ends, sample)
+        return self._arrival_times[min(index, len(self._arrival_times) - 1)]
+
+    def window(self, start: int, end: int) -> bytes:
+        return bytes(self.data[(start - self.start) * _BYTES_PER_SAMPLE:
+                               (end - self.start) * _BYTES_PER_SAMPLE])
+
+    def discard_until(self, sample: int) -> None:
+        del self.data[:(sample - self.start) * _BYTES_PER_SAMPLE]
+        self.start = sample
+        drop = bisect.bisect_left(self._arrival_ends, sample)
+        del self._arrival_ends[:drop], self._arrival_times[:drop]
+
+    def frame_rms(self, start: int, end: int) -> np.ndarray:
+        """RMS level (0-1) of consecutive 30 ms frames in `[start, end)`."""
+        frame = self.sample_rate * _FRAME_MS // 1000
+        samples = np.frombuffer(self.window(start, end), dtype=np.int16)
+        samples = samples[:len(samples) // frame * frame].astype(np.float32) / 32768.0
+        if not len(samples):
+            return np.zeros(0, dtype=np.float32)
+        return np.sqrt(np.mean(samples.reshape(-1, frame) ** 2, axis=1))
+
+
+class FFmpegDecoder:
+    """Decodes a compressed audio stream (e.g. Ogg/WebM Opus) to PCM with ffmpeg."""
+    def __init__(self, buffer: PCMBuffer, ffmpeg_path: str, input_args=()):
+        self.buffer = buffer
+        self.ffmpeg_path = ffmpeg_path
+        self.input_args = list(input_args)
+        self.process = None
+        self.reader = None
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            self.ffmpeg_path, "-loglevel", "error", *self.input_args, "-i", "pipe:0",
+            "-f", "s16le", "-ac", "1", "-ar", str(self.buffer.sample_rate), "pipe:1",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+        )
+        self.reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while True:
+            pcm = await self.process.stdout.read(self.buffer.sample_rate * _BYTES_PER_SAMPLE // 10)
+            if not pcm:
+                return
+            self.buffer.append(pcm)
+
+    async def feed(self, data: bytes) -> None:
+        self.process.stdin.write(data)
+        await self.process.stdin.drain()
+
+    async def close(self) -> None:
+        if self.process is None:
+            return
+        self.process.stdin.close()
+        await self.reader
+        await self.process.wait()
+
+
+class LiveTranscriber:
+    """
+    Incremental transcription over a growing window of streamed audio.
+
+    The client sends binary audio frames: raw 16-bit little-endian mono PCM
+    (`?encoding=pcm_s16le&sample_rate=16000`, the default) or an Ogg/WebM
+    Opus stream (`?encoding=opus`), then a `{"event": "end"}` text message
+    or a close. Every `step_ms` of new audio the current segment is
+    transcribed and sent as `{"type": "partial", ...}`; a segment is
+    finalized (`{"type": "final", ...}`) after `silence_ms` of trailing
+    silence or once it reaches `max_window_ms`, and the next segment starts
+    after it. Each hypothesis carries its audio span and `latency_ms`, the
+    time since the last audio it covers arrived; partials are spaced at
+    least one inference apart, so they never queue up behind each other.
+    Servers without `supports_live_transcription` reject the handshake with
+    the `disabled_feature` response of their `transcribe_audio`.
+    """
+    def __init__(self, server, configs: Optional[LiveTranscriptionConfigs] = None):
+        self.server = server
+        self.configs = configs or LiveTranscriptionConfigs()
+        self.logger = OCLogger().get_logger("live_transcription")
+
+    async def run(self, websocket) -> None:
+        if not self.server.supports_live_transcription:
+            await self._deny(websocket, await self.server.transcribe_audio(b""))
+            return
+        await websocket.accept()
+        params = websocket.query_params
+        buffer = PCMBuffer(self.configs.sample_rate)
+        decoder = None
+        encoding = params.get("encoding", "pcm_s16le")
+        input_rate = int(params.get("sample_rate", self.configs.sample_rate))
+        if encoding == "opus":
+            decoder = FFmpegDecoder(buffer, self.configs.ffmpeg_path)
+        elif encoding != "pcm_s16le":
+            await websocket.close(code=1003, reason=f"Unsupported encoding: {encoding}")
+            return
+        elif input_rate != self.configs.sample_rate:
+            decoder = FFmpegDecoder(buffer, self.configs.ffmpeg_path,
+                                    ["-f", "s16le", "-ac", "1", "-ar", str(input_rate)])
+        if decoder is not None:
+            await decoder.start()
+
+        LIVE_TRANSCRIPTION_SESSIONS.inc()
+        receiver = asyncio.create_task(self._receive(websocket, buffer, decoder))
+        try:
+            await self._transcribe(websocket, buffer, receiver,
+                                   params.get("language"), params.get("prompt"))
+            await websocket.send_json({"type": "end"})
+            await websocket.close()
+        except Exception as exc:
+            self.logger.exception("Live transcription failed")
+            try:
+                await websocket.send_json({"type": "error", "message": str(exc)})
+                await websocket.close(code=1011)
+            except Exception:
+                pass
+        finally:
+            receiver.cancel()
+            LIVE_TRANSCRIPTION_SESSIONS.dec()
+
+    @staticmethod
+    async def _deny(websocket, response) -> None:
+        """Reject the handshake with `response`, or with a close where denial responses are unsupported."""
+        try:
+            await websocket.send_denial_response(response)
+        except RuntimeError:
+            await websocket.close(code=1008, reason=json.loads(response.body)["error"]["message"])
+
+    async def _receive(self, websocket, buffer: PCMBuffer, decoder) -> None:
+        """Append incoming audio to `buffer` until the client ends the stream."""
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                if message.get("bytes"):
+                    if decoder is not None:
+                        await decoder.feed(message["bytes"])
+                    else:
+                        buffer.append(message["bytes"])
+                elif message.get("text"):
+                    try:
+                        event = json.loads(message["text"]).get("event")
+                    except (ValueError, AttributeError):
+                        event = None
+                    if event == "end":
+                        break
+        finally:
+            if decoder is not None:
+                await decoder.close()
+            buffer.changed.set()
+
+    async def _transcribe(self, websocket, buffer: PCMBuffer, receiver: asyncio.Task,
+                          language: Optional[str], prompt: Optional[str]) -> None:
+        rate = self.configs.sample_rate
+        step = rate * self.configs.step_ms // 1000
+        max_window = rate * self.configs.max_window_ms // 1000
+        silence_frames = max(1, self.configs.silence_ms // _FRAME_MS)
+        segment_start = 0
+        last_partial = 0
+        inference_samples = 0
+
+        while True:
+            await buffer.changed.wait()
+            buffer.changed.clear()
+            done = receiver.done()
+            end = buffer.end
+            if end <= segment_start:
+                if done:
+                    return
+                continue
+
+            levels = buffer.frame_rms(segment_start, end)
+            voiced = levels > self.configs.silence_threshold
+            if not voiced.any():
+                # Nothing but silence so far: drop it instead of transcribing.
+                keep = max(segment_start, end - silence_frames * rate * _FRAME_MS // 1000)
+                if done:
+                    return
+                buffer.discard_until(keep)
+                segment_start = last_partial = keep
+                continue
+
+            trailing_silence = len(voiced) - 1 - int(np.flatnonzero(voiced)[-1])
+            if done or end - segment_start >= max_window or trailing_silence >= silence_frames:
+                await self._send_hypothesis(websocket, buffer, "final", segment_start, end,
+                                            language, prompt)
+                buffer.discard_until(end)
+                segment_start = last_partial = end
+                if done:
+                    return
+            elif end - last_partial >= max(step, inference_samples):
+                seconds = await self._send_hypothesis(websocket, buffer, "partial", segment_start,
+                                                      end, language, prompt)
+                inference_samples = int(seconds * rate)
+                last_partial = end
+            if buffer.end > end:
+                buffer.changed.set()
+
+    async def _send_hypothesis(self, websocket, buffer: PCMBuffer, kind: str, start: int,
+                               end: int, language: Optional[str], prompt: Optional[str]) -> float:
+        """Transcribe `[start, end)`, send the hypothesis and return the inference time."""
+        arrival = buffer.arrival_time(end)
+        began = time.monotonic()
+        text = await self.server.transcribe_audio(
+            pcm_to_wav(buffer.window(start, end), buffer.sample_rate),
+            language=language, prompt=prompt)
+        sent = time.monotonic()
+        latency = sent - arrival
+        LIVE_TRANSCRIPTION_INFERENCE.labels(kind).observe(sent - began)
+        LIVE_TRANSCRIPTION_LATENCY.labels(kind).observe(latency)
+        over_budget = latency * 1000 > self.configs.latency_budget_ms
+        if over_budget:
+            LIVE_TRANSCRIPTION_OVER_BUDGET.labels(kind).inc()
+        await websocket.send_json({
+            "type": kind,
+            "text": text,
+            "start": start / buffer.sample_rate,
+            "end": end / buffer.sample_rate,
+            "latency_ms": round(latency * 1000, 1),
+            "over_budget": over_budget,
+        })
+        return sent - began
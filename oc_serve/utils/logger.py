@@ -1,15 +1,100 @@
 """Logger Factory for OC-Serve."""
+import atexit
 import logging
 import os
+import queue
+import random
 import sys
-from logging.handlers import RotatingFileHandler
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 
-from configs import LoggerConfigs, ColorFormatter, PlainFormatter
+from prometheus_client import Counter
+
+from configs import LoggerConfigs, ColorFormatter, PlainFormatter, JSONFormatter
+
+LOG_RECORDS_DROPPED = Counter(
+    "oc_serve_log_records_dropped",
+    "Log records dropped before being written, by logger and reason.",
+    ["logger", "reason"],
+)
+
+REQUEST_ID: ContextVar[Optional[str]] = ContextVar("oc_serve_request_id", default=None)
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request id (`REQUEST_ID`) to records as `request_id`."""
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = REQUEST_ID.get()
+        return True
+
+
+class HotPathFilter(logging.Filter):
+    """
+    Rate limits and/or samples a logger's records below WARNING.
+
+    `rate` is the sustained number of records per second let through (with a
+    burst of the same size) and `sample` the fraction of records kept.
+    Warnings and errors always pass.
+    """
+    def __init__(self, name: str, rate: Optional[float] = None, sample: Optional[float] = None):
+        super().__init__()
+        self.logger_name = name
+        self.rate = rate
+        self.sample = sample
+        self.tokens = rate or 0.0
+        self.updated = time.monotonic()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        if self.sample is not None and random.random() >= self.sample:
+            LOG_RECORDS_DROPPED.labels(self.logger_name, "sampled").inc()
+            return False
+        if self.rate is not None:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                LOG_RECORDS_DROPPED.labels(self.logger_name, "rate_limited").inc()
+                return False
+            self.tokens -= 1
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    Only the message is rendered on the calling thread; formatting and I/O
+    happen on the listener thread. Records are dropped (and counted) when
+    the queue is full.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(record.name, "queue_full").inc()
 
 
 class OCLogger:
-    """Singleton Logger Factory to create and manage loggers."""
+    """
+    Singleton Logger Factory to create and manage loggers.
+
+    With `OC_LOG_QUEUE` (the default) loggers only enqueue records; a
+    listener thread formats them and writes the file and stdout handlers,
+    so no formatting or I/O happens on the event loop.
+    """
     _instance: Optional["OCLogger"] = None
     _configured: bool = False
 
@@ -19,9 +104,9 @@ class OCLogger:
         return cls._instance
 
     def __init__(self):
-        self.configs = LoggerConfigs()
         if self._configured:
             return
+        self.configs = LoggerConfigs()
 
         if isinstance(self.configs.console_level, str):
             self.configs.console_level = logging._nameToLevel.get(
@@ -36,16 +121,34 @@ class OCLogger:
         if parent and not os.path.exists(parent):
             os.makedirs(parent, exist_ok=True)
 
+        json_output = self.configs.format == "json"
         self._stdout_handler = logging.StreamHandler(sys.stdout)
         self._stdout_handler.setLevel(self.configs.console_level)
-        self._stdout_handler.setFormatter(ColorFormatter())
+        self._stdout_handler.setFormatter(
+            JSONFormatter() if json_output else ColorFormatter() if self.configs.color
+            else PlainFormatter())
 
         self._file_handler = RotatingFileHandler(
             self.configs.file, maxBytes=self.configs.max_bytes,
             backupCount=self.configs.backup_count, encoding="utf-8"
         )
         self._file_handler.setLevel(self.configs.file_level)
-        self._file_handler.setFormatter(PlainFormatter())
+        self._file_handler.setFormatter(JSONFormatter() if json_output else PlainFormatter())
+
+        self._queue_handler = None
+        self._listener = None
+        if self.configs.queue:
+            log_queue = queue.Queue(self.configs.queue_size)
+            self._queue_handler = DroppingQueueHandler(log_queue)
+            self._queue_handler.setLevel(min(self.configs.console_level, self.configs.file_level))
+            self._queue_handler.addFilter(RequestIdFilter())
+            self._listener = QueueListener(log_queue, self._file_handler, self._stdout_handler,
+                                           respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self._listener.stop)
+        else:
+            self._file_handler.addFilter(RequestIdFilter())
+            self._stdout_handler.addFilter(RequestIdFilter())
 
         self._configured = True
 
@@ -55,9 +158,19 @@ class OCLogger:
         logger.setLevel(logging.DEBUG)
         logger.propagate = False
 
-        if not any(isinstance(h, RotatingFileHandler) for h in logger.handlers):
-            logger.addHandler(self._file_handler)
-        if not any(isinstance(h, logging.StreamHandler) and getattr(h, "stream", None) is sys.stdout
-                   for h in logger.handlers):
-            logger.addHandler(self._stdout_handler)
+        if self._queue_handler is not None:
+            if self._queue_handler not in logger.handlers:
+                logger.addHandler(self._queue_handler)
+        else:
+            if not any(isinstance(h, RotatingFileHandler) for h in logger.handlers):
+                logger.addHandler(self._file_handler)
+            if not any(isinstance(h, logging.StreamHandler) and getattr(h, "stream", None) is sys.stdout
+                       for h in logger.handlers):
+                logger.addHandler(self._stdout_handler)
+
+        rate = self.configs.rate_limits.get(name)
+        sample = self.configs.sample_rates.get(name)
+        if (rate is not None or sample is not None) and not any(
+                isinstance(f, HotPathFilter) for f in logger.filters):
+            logger.addFilter(HotPathFilter(name, rate=rate, sample=sample))
         return logger
@@ -0,0 +1,114 @@
+"""Event loop lag monitoring and blocked-loop stack sampling."""
+import asyncio
+import collections
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from configs import EventLoopMonitorConfigs
+from .logger import OCLogger
+
+EVENT_LOOP_LAG = Histogram(
+    "oc_serve_event_loop_lag_seconds",
+    "Delay between when an event loop probe was due and when it ran.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+EVENT_LOOP_LAG_MAX = Gauge(
+    "oc_serve_event_loop_lag_max_seconds",
+    "Largest event loop lag over the monitor's recent window.",
+    multiprocess_mode="livemax",
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "oc_serve_event_loop_blocked",
+    "Times the event loop was blocked by a single callback for longer than the threshold.",
+)
+
+
+class EventLoopMonitor:
+    """
+    Measures how late the event loop runs a periodic probe.
+
+    Every `interval_ms` a probe task records its scheduling lag in
+    `oc_serve_event_loop_lag_seconds` and the window maximum in
+    `oc_serve_event_loop_lag_max_seconds`, a per-replica scaling signal. A
+    watchdog thread samples the loop thread's stack while the probe is
+    overdue by more than `slow_threshold_ms`, and logs where the loop is
+    stuck (at most once per `report_interval_s`).
+
+    `start()` must be called from the thread running the loop.
+    """
+    def __init__(self, configs: Optional[EventLoopMonitorConfigs] = None):
+        self.configs = configs or EventLoopMonitorConfigs()
+        self.logger = OCLogger().get_logger("loop_monitor")
+        self.interval = self.configs.interval_ms / 1000
+        self.threshold = self.configs.slow_threshold_ms / 1000
+        self.heartbeat = time.monotonic()
+        self.task = None
+        self._thread_id = None
+        self._stopped = threading.Event()
+        self._window = collections.deque()
+
+    @property
+    def lag_max(self) -> float:
+        """Largest lag over the recent window, in seconds."""
+        return self._window[0][1] if self._window else 0.0
+
+    def start(self) -> None:
+        """Start monitoring the running event loop; does nothing if already started."""
+        if not self.configs.enabled or self.task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self.task = loop.create_task(self._probe())
+        threading.Thread(target=self._watchdog, name="oc-serve-loop-watchdog",
+                         daemon=True).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self.task is not None:
+            self.task.cancel()
+
+    async def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+            self.heartbeat = time.monotonic()
+            lag = max(0.0, now - due)
+            EVENT_LOOP_LAG.observe(lag)
+            # Monotonic deque of (expiry, lag): the front is the window maximum.
+            window = self._window
+            while window and window[-1][1] <= lag:
+                window.pop()
+            window.append((now + self.configs.window_s, lag))
+            while window[0][0] < now:
+                window.popleft()
+            EVENT_LOOP_LAG_MAX.set(window[0][1])
+
+    def _watchdog(self) -> None:
+        """Log the loop thread's stack when the probe is overdue."""
+        reported_heartbeat = None
+        last_report = 0.0
+        check_every = max(self.threshold / 2, 0.01)
+        while not self._stopped.wait(check_every):
+            heartbeat = self.heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked < self.threshold or heartbeat == reported_heartbeat:
+                continue
+            reported_heartbeat = heartbeat
+            EVENT_LOOP_BLOCKED.inc()
+            if time.monotonic() - last_report < self.configs.report_interval_s:
+                continue
+            last_report = time.monotonic()
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame, limit=self.configs.stack_limit))
+            self.logger.warning("Event loop blocked for at least %.0f ms in:\n%s",
+                                blocked * 1000, stack)
@@ -0,0 +1,85 @@
+"""Cached, off-loop Prometheus exposition."""
+import asyncio
+import gzip
+import time
+from typing import Optional
+
+from prometheus_client import Counter, Histogram
+from prometheus_client.openmetrics.exposition import CONTENT_TYPE_LATEST, generate_latest
+from starlette.responses import Response
+
+from configs import MetricsConfigs
+
+METRICS_SCRAPE_SECONDS = Histogram(
+    "oc_serve_metrics_scrape_seconds",
+    "Time spent collecting and rendering the metrics exposition, in a worker thread.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+METRICS_SCRAPES = Counter(
+    "oc_serve_metrics_scrapes",
+    "Metrics scrapes, by whether they were served from the cache (hit/miss).",
+    ["cache"],
+)
+
+
+class _Exposition:
+    __slots__ = ("body", "rendered_at", "gzipped")
+
+    def __init__(self, body: bytes, rendered_at: float):
+        self.body = body
+        self.rendered_at = rendered_at
+        self.gzipped = None
+
+
+class MetricsExporter:
+    """
+    Renders `registry` in a worker thread and caches the result for `cache_ttl_ms`.
+
+    Concurrent scrapes of an expired cache share one render, so many
+    scrapers cost one collection per interval, and the event loop never
+    runs `generate_latest` (which, with `PROMETHEUS_MULTIPROC_DIR`, reads
+    and merges every process's metric files). Responses are gzipped for
+    scrapers that accept it.
+    """
+    def __init__(self, registry, configs: Optional[MetricsConfigs] = None):
+        self.registry = registry
+        self.configs = configs or MetricsConfigs()
+        self.ttl = self.configs.cache_ttl_ms / 1000
+        self._cached: Optional[_Exposition] = None
+        self._pending: Optional[asyncio.Future] = None
+
+    def _render(self) -> _Exposition:
+        start = time.perf_counter()
+        body = generate_latest(self.registry)
+        METRICS_SCRAPE_SECONDS.observe(time.perf_counter() - start)
+        return _Exposition(body, time.monotonic())
+
+    async def exposition(self) -> _Exposition:
+        cached = self._cached
+        if cached is not None and time.monotonic() - cached.rendered_at < self.ttl:
+            METRICS_SCRAPES.labels("hit").inc()
+            return cached
+        METRICS_SCRAPES.labels("miss").inc()
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(asyncio.to_thread(self._render))
+        pending = self._pending
+        try:
+            self._cached = await asyncio.shield(pending)
+        finally:
+            if self._pending is pending and pending.done():
+                self._pending = None
+        return self._cached
+
+    async def response(self, request=None) -> Response:
+        """Metrics `Response` for `request`, gzip-encoded when it accepts gzip."""
+        exposition = await self.exposition()
+        headers = {"Content-Type": CONTENT_TYPE_LATEST}
+        accept_encoding = request.headers.get("accept-encoding", "") if request is not None else ""
+        if self.configs.gzip and "gzip" in accept_encoding:
+            if exposition.gzipped is None:
+                exposition.gzipped = await asyncio.to_thread(
+                    gzip.compress, exposition.body, self.configs.gzip_level)
+            headers["Content-Encoding"] = "gzip"
+            headers["Vary"] = "Accept-Encoding"
+            return Response(exposition.gzipped, headers=headers)
+        return Response(exposition.body, headers=headers)
@@ -0,0 +1,239 @@
+"""On-demand sampling profiler for live replicas.
+
+Profiles are returned in collapsed-stack format (one `frame;frame;... count`
+line per distinct stack, root first), which `flamegraph.pl`, speedscope and
+inferno read directly.
+"""
+import asyncio
+import itertools
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import Counter
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from configs import ProfilerConfigs
+
+PROFILE_KINDS = ("cpu", "tasks", "memory")
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_filename.rsplit('/', 1)[-1]}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse_frame(frame, prefix: str = "") -> str:
+    """Collapsed stack of `frame` and its callers, root first."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    if prefix:
+        names.append(prefix)
+    return ";".join(reversed(names))
+
+
+def format_collapsed(stacks: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def task_stacks(loop: Optional[asyncio.AbstractEventLoop] = None) -> Counter:
+    """Collapsed coroutine stacks of every pending asyncio task, one count per task."""
+    stacks = Counter()
+    for task in asyncio.all_tasks(loop):
+        names = [_frame_name(frame.f_code) for frame in task.get_stack()]
+        coro = task.get_coro()
+        if not names and coro is not None:
+            names = [getattr(coro, "__qualname__", type(coro).__name__)]
+        stacks[";".join([f"task:{task.get_name().rsplit('-', 1)[0]}", *names])] += 1
+    return stacks
+
+
+class StackSampler:
+    """Samples thread stacks from a background thread every `interval` seconds."""
+    def __init__(self, interval: float, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="oc-serve-profiler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (self.thread_id is not None and ident != self.thread_id):
+                    continue
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                self.stacks[collapse_frame(frame, names.get(ident, str(ident)))] += 1
+
+
+class _RequestSampling:
+    """Samples the loop thread while at least one profiled request is in flight."""
+    __slots__ = ("profiler", "_open")
+
+    def __init__(self, profiler: "Profiler"):
+        self.profiler = profiler
+        self._open = False
+
+    def __enter__(self):
+        self._open = True
+        self.profiler._active_requests += 1
+        self.profiler._requests_active.set()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """Stop sampling for this request; later calls do nothing."""
+        if not self._open:
+            return
+        self._open = False
+        self.profiler._active_requests -= 1
+        if not self.profiler._active_requests:
+            self.profiler._requests_active.clear()
+
+
+async def _sampled_body(body: AsyncIterator, sampling: _RequestSampling) -> AsyncIterator:
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        sampling.close()
+
+
+class Profiler:
+    """
+    Time-boxed CPU, asyncio task and memory profiles of the current process.
+
+    `profile("cpu", seconds)` samples every thread's stack,
+    `profile("memory", seconds)` traces allocations made during the window
+    that are still alive at its end (weighted by bytes), and
+    `profile("tasks")` dumps the coroutine stack of every pending task.
+
+    With `request_sample_every = N`, `request()` marks one request in N
+    for profiling: while a marked request is being handled, a background
+    thread samples the event loop thread into `request_stacks`. For the
+    other requests, and when disabled, `request()` costs one counter step.
+    `profile_request` extends the window of a streamed response to the end
+    of its body.
+    """
+    def __init__(self, configs: Optional[ProfilerConfigs] = None):
+        self.configs = configs or ProfilerConfigs()
+        self.interval = self.configs.sample_interval_ms / 1000
+        self.every = self.configs.request_sample_every
+        self.request_stacks = Counter()
+        self._request_stacks_lock = threading.Lock()
+        self._lock = asyncio.Lock()
+        self._counter = itertools.count()
+        self._active_requests = 0
+        self._requests_active = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._request_sampler: Optional[threading.Thread] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    async def profile(self, kind: str = "cpu", seconds: float = 10.0) -> str:
+        """Run one profile and return it in collapsed-stack format."""
+        if kind not in PROFILE_KINDS:
+            raise ValueError(f"Unknown profile kind: {kind}. Available: {PROFILE_KINDS}")
+        seconds = min(max(seconds, 0.0), self.configs.max_seconds)
+        async with self._lock:
+            if kind == "tasks":
+                return format_collapsed(task_stacks())
+            if kind == "cpu":
+                with StackSampler(self.interval) as sampler:
+                    await asyncio.sleep(seconds)
+                return format_collapsed(sampler.stacks)
+            return format_collapsed(await self._memory(seconds))
+
+    async def _memory(self, seconds: float) -> Counter:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(self.configs.memory_frames)
+        try:
+            await asyncio.sleep(seconds)
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            if started:
+                tracemalloc.stop()
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        stacks = Counter()
+        for stat in snapshot.statistics("traceback")[:self.configs.memory_top]:
+            stacks[";".join(f"{frame.filename.rsplit('/', 1)[-1]}:{frame.lineno}"
+                            for frame in stat.traceback)] += stat.size
+        return stacks
+
+    def request(self):
+        """Context manager profiling the enclosed request if it is sampled."""
+        if not self.every or next(self._counter) % self.every:
+            return nullcontext()
+        if self._request_sampler is None:
+            self._loop_thread_id = threading.get_ident()
+            self._request_sampler = threading.Thread(target=self._sample_requests,
+                                                     name="oc-serve-request-profiler",
+                                                     daemon=True)
+            self._request_sampler.start()
+        return _RequestSampling(self)
+
+    async def profile_request(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `call()` inside `request()`.
+
+        When the result streams its body (`body_iterator`), sampling continues
+        until the body is exhausted or closed, or the response is discarded unsent.
+        """
+        sampling = self.request()
+        if not isinstance(sampling, _RequestSampling):
+            return await call()
+        sampling.__enter__()
+        try:
+            response = await call()
+        except BaseException:
+            sampling.close()
+            raise
+        body = getattr(response, "body_iterator", None)
+        if body is None:
+            sampling.close()
+        else:
+            response.body_iterator = _sampled_body(body, sampling)
+            weakref.finalize(response, sampling.close)
+        return response
+
+    def _sample_requests(self) -> None:
+        while True:
+            self._requests_active.wait()
+            time.sleep(self.interval)
+            if not self._active_requests:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                stack = collapse_frame(frame)
+                with self._request_stacks_lock:
+                    self.request_stacks[stack] += 1
+
+    def request_profile(self, reset: bool = False) -> str:
+        """Collapsed stacks sampled during profiled requests so far."""
+        with self._request_stacks_lock:
+            output = format_collapsed(self.request_stacks)
+            if reset:
+                self.request_stacks.clear()
+        return output
@@ -0,0 +1,66 @@
+"""Fast JSON serialization helpers for OC-Serve responses."""
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def json_dumps(content: Any, exclude_none: bool = False, exclude_unset: bool = False) -> bytes:
+    """Serialize `content` to UTF-8 JSON bytes.
+
+    Pydantic models (including the vLLM protocol models) are serialized
+    straight to bytes by pydantic-core, skipping the intermediate dict tree
+    built by `model_dump`. Plain Python objects go through orjson when it is
+    installed and fall back to the standard library otherwise.
+
+    Args:
+        content: A pydantic model or a JSON-serializable Python object.
+        exclude_none: Drop fields set to None (pydantic models only).
+        exclude_unset: Drop fields that were not explicitly set (pydantic models only).
+
+    Returns:
+        bytes: The JSON document.
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content, exclude_none=exclude_none,
+                                                       exclude_unset=exclude_unset)
+    if orjson is not None:
+        try:
+            return orjson.dumps(content)
+        except TypeError:
+            pass
+    return json.dumps(content, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Deserialize a JSON document, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def sse_event(content: Any, exclude_unset: bool = False) -> bytes:
+    """Frame `content` as a single server-sent event (`data: ...\\n\\n`)."""
+    if isinstance(content, str):
+        payload = content.encode("utf-8")
+    elif isinstance(content, bytes):
+        payload = content
+    else:
+        payload = json_dumps(content, exclude_unset=exclude_unset)
+    return b"data: " + payload + b"\n\n"
+
+
+async def encode_sse_stream(generator):
+    """Encode an SSE stream of `str` frames to bytes once, up front.
+
+    vLLM's streaming generators already render each chunk with pydantic-core,
+    so only the str -> bytes conversion is left for the response layer.
+    """
+    async for frame in generator:
+        yield frame.encode("utf-8") if isinstance(frame, str) else frame
@@ -0,0 +1,133 @@
+"""Encoding and metrics for streamed speech synthesis output."""
+import asyncio
+import struct
+import time
+from typing import AsyncIterator
+
+from prometheus_client import Histogram
+
+SPEECH_TIME_TO_FIRST_BYTE = Histogram(
+    "oc_serve_speech_time_to_first_byte_seconds",
+    "Time from a speech request reaching the server to its first audio byte being sent, by format.",
+    ["format"],
+    buckets=(0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10),
+)
+SPEECH_REAL_TIME_FACTOR = Histogram(
+    "oc_serve_speech_real_time_factor",
+    "Time to stream a speech response divided by the duration of its audio, by format.",
+    ["format"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5),
+)
+
+SPEECH_MEDIA_TYPES = {
+    "pcm": "audio/pcm",
+    "wav": "audio/wav",
+    "opus": "audio/ogg",
+}
+
+_BYTES_PER_SAMPLE = 2
+
+
+def wav_stream_header(sample_rate: int) -> bytes:
+    """
+    Header of a 16-bit mono WAV stream of unknown length.
+
+    The RIFF and data sizes are set to 0xFFFFFFFF, which players and
+    decoders treat as "read until the end of the stream".
+    """
+    byte_rate = sample_rate * _BYTES_PER_SAMPLE
+    return (b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, byte_rate,
+                                    _BYTES_PER_SAMPLE, 16)
+            + b"data" + struct.pack("<I", 0xFFFFFFFF))
+
+
+async def _ffmpeg_opus(pcm: AsyncIterator[bytes], sample_rate: int,
+                       ffmpeg_path: str) -> AsyncIterator[bytes]:
+    """Encode a PCM stream to Ogg Opus with ffmpeg, yielding pages as they are muxed."""
+    process = await asyncio.create_subprocess_exec(
+        ffmpeg_path, "-loglevel", "error",
+        "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "-i", "pipe:0",
+        "-c:a", "libopus", "-application", "voip", "-frame_duration", "20",
+        "-f", "ogg", "-page_duration", "20000", "-flush_packets", "1", "pipe:1",
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+    )
+
+    async def feed():
+        try:
+            async for chunk in pcm:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        finally:
+            process.stdin.close()
+
+    writer = asyncio.create_task(feed())
+    try:
+        while True:
+            data = await process.stdout.read(65536)
+            if not data:
+                break
+            yield data
+        await writer
+    finally:
+        writer.cancel()
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+
+
+async def encode_speech(pcm: AsyncIterator[bytes], response_format: str, sample_rate: int,
+                        ffmpeg_path: str = "ffmpeg") -> AsyncIterator[bytes]:
+    """
+    Encode synthesized 16-bit mono PCM chunks as they are produced.
+
+    `pcm` is passed through as-is, `wav` prefixes it with a streaming WAV
+    header and `opus` is encoded to Ogg Opus by an ffmpeg subprocess.
+    """
+    if response_format == "opus":
+        async for chunk in _ffmpeg_opus(pcm, sample_rate, ffmpeg_path):
+            yield chunk
+        return
+    if response_format == "wav":
+        yield wav_stream_header(sample_rate)
+    elif response_format != "pcm":
+        raise ValueError(f"Unsupported speech format: {response_format}")
+    async for chunk in pcm:
+        if chunk:
+            yield chunk
+
+
+async def measure_speech(pcm: AsyncIterator[bytes], response_format: str, sample_rate: int,
+                         started: float, ffmpeg_path: str = "ffmpeg") -> AsyncIterator[bytes]:
+    """
+    `encode_speech`, recording time to first byte and the real-time factor.
+
+    `started` is the `time.perf_counter()` at which the request reached the
+    server; the first-byte time is taken when the first encoded chunk (for
+    WAV, the header followed by the first audio) is handed to the response.
+    """
+    samples = 0
+
+    async def counted():
+        nonlocal samples
+        async for chunk in pcm:
+            samples += len(chunk) // _BYTES_PER_SAMPLE
+            yield chunk
+
+    first = True
+    header = b""
+    async for chunk in encode_speech(counted(), response_format, sample_rate, ffmpeg_path):
+        if first and response_format == "wav" and not samples:
+            # Hold the header back so the first byte measures synthesized audio.
+            header += chunk
+            continue
+        if first:
+            SPEECH_TIME_TO_FIRST_BYTE.labels(response_format).observe(time.perf_counter() - started)
+            first = False
+        yield header + chunk
+        header = b""
+    if header:
+        yield header
+    if samples:
+        SPEECH_REAL_TIME_FACTOR.labels(response_format).observe(
+            (time.perf_counter() - started) / (samples / sample_rate))
@@ -0,0 +1,44 @@
+"""Replica cold-start timing."""
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from prometheus_client import Gauge
+
+STARTUP_PHASE_SECONDS = Gauge(
+    "oc_serve_startup_phase_seconds",
+    "Time spent in each replica cold-start phase.",
+    ["phase"],
+    multiprocess_mode="liveall",
+)
+
+
+class StartupTimer:
+    """
+    Accumulates the duration of replica cold-start phases.
+
+    Phases used by OC-Serve are `import`, `config`, `artifacts`,
+    `engine_init` and `serving_setup`; durations of repeated phases are summed.
+    """
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Add `seconds` to `phase` and export the running total."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        STARTUP_PHASE_SECONDS.labels(phase).set(self.phases[phase])
+
+    @contextmanager
+    def phase(self, phase: str):
+        """Time the enclosed block as part of `phase`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def report(self) -> str:
+        """Return a one-line summary of all recorded phases."""
+        total = sum(self.phases.values())
+        parts = ", ".join(f"{name}={seconds:.2f}s" for name, seconds in self.phases.items())
+        return f"cold start {total:.2f}s ({parts})"
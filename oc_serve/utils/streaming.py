@@ -0,0 +1,242 @@
+"""Helpers for OpenAI-style server-sent event (SSE) token streams."""
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from prometheus_client import Counter, Histogram
+
+from .serialization import json_loads, sse_event
+from .timing import request_timer
+
+Frame = Union[str, bytes]
+
+STREAM_EVENTS = Histogram(
+    "oc_serve_stream_events",
+    "SSE events written per stream.",
+    ["endpoint"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+STREAM_BYTES = Histogram(
+    "oc_serve_stream_bytes",
+    "SSE bytes written per stream.",
+    ["endpoint"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+STREAM_CHUNKS_COALESCED = Counter(
+    "oc_serve_stream_chunks_coalesced",
+    "Engine chunks merged into a preceding SSE event instead of being sent on their own.",
+    ["endpoint"],
+)
+
+_DATA_PREFIX = "data: "
+_MERGEABLE_DELTA_KEYS = {"content", "reasoning_content"}
+_CONCAT_KEYS = ("text", "content", "reasoning_content")
+# Raw frame markers of chunks that are never merged, checked before any JSON decoding.
+_UNMERGEABLE_MARKERS = ('"tool_calls"', '"error"', '"choices":[]')
+_UNMERGEABLE_MARKERS_BYTES = tuple(marker.encode() for marker in _UNMERGEABLE_MARKERS)
+
+
+def _maybe_mergeable(frame: Frame) -> bool:
+    """Cheap check on the raw frame, without decoding it, that it may be a mergeable chunk."""
+    if isinstance(frame, bytes):
+        prefix, markers = b"data: {", _UNMERGEABLE_MARKERS_BYTES
+    else:
+        prefix, markers = "data: {", _UNMERGEABLE_MARKERS
+    if not frame.startswith(prefix) or frame.count(prefix[:6]) != 1:
+        return False
+    return not any(marker in frame for marker in markers)
+
+
+def _parse_frame(frame: Frame) -> Optional[Dict[str, Any]]:
+    """Return the JSON chunk carried by `frame`, or None if it must pass through."""
+    try:
+        chunk = json_loads(frame[len(_DATA_PREFIX):])
+    except ValueError:
+        return None
+    return chunk if isinstance(chunk, dict) and _is_mergeable(chunk) else None
+
+
+def _is_mergeable(chunk: Dict[str, Any]) -> bool:
+    """Only plain text/logprob deltas are merged; tool calls, errors and
+    usage-only chunks are forwarded untouched."""
+    choices = chunk.get("choices")
+    if not choices or "error" in chunk:
+        return False
+    for choice in choices:
+        delta = choice.get("delta")
+        if delta is None:
+            # Completion chunks carry `text` directly on the choice.
+            if "text" not in choice:
+                return False
+            continue
+        keys = {k for k, v in delta.items() if v is not None and k != "role"}
+        if not keys <= _MERGEABLE_DELTA_KEYS:
+            return False
+    return True
+
+
+def _merge_into(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    """Merge one choice (or delta / logprobs object) into another in place."""
+    for key, value in source.items():
+        if value is None:
+            continue
+        current = target.get(key)
+        if current is None:
+            target[key] = value
+        elif key in _CONCAT_KEYS and isinstance(current, str):
+            target[key] = current + value
+        elif isinstance(current, list) and isinstance(value, list):
+            current.extend(value)
+        elif isinstance(current, dict) and isinstance(value, dict):
+            _merge_into(current, value)
+        else:
+            target[key] = value
+
+
+def merge_chunks(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge consecutive OpenAI streaming chunks into one valid chunk.
+
+    Text deltas are concatenated per choice index, logprob and token id lists
+    are extended, and the latest finish reason and usage win. Envelope fields
+    (`id`, `created`, `model`, ...) are taken from the first chunk.
+    """
+    merged = dict(chunks[0])
+    choices: Dict[int, Dict[str, Any]] = {}
+    for chunk in chunks:
+        for choice in chunk["choices"]:
+            index = choice.get("index", 0)
+            if index not in choices:
+                choices[index] = {}
+            _merge_into(choices[index], choice)
+        if chunk.get("usage") is not None:
+            merged["usage"] = chunk["usage"]
+    merged["choices"] = [choices[i] for i in sorted(choices)]
+    return merged
+
+
+async def coalesce_sse(frames: AsyncIterator[Frame],
+                       flush_interval_s: float,
+                       max_chunks: int = 0,
+                       endpoint: str = "") -> AsyncIterator[Frame]:
+    """Merge SSE chunks produced within a flush window into single events.
+
+    The first buffered chunk opens a window of `flush_interval_s`; everything
+    that arrives before it closes (or until `max_chunks` chunks are buffered)
+    is sent as one event. Frames that cannot be merged flush the buffer and
+    are forwarded as-is, so ordering is preserved.
+
+    Frames are buffered raw and only decoded when a window holds several
+    chunks; a window with a single chunk forwards its frame unchanged. When
+    the consumer stops early, `frames` is closed, which aborts the engine
+    request.
+
+    Args:
+        frames: The engine's SSE frame generator (`data: {...}\\n\\n`).
+        flush_interval_s: Maximum time a chunk may wait in the buffer.
+        max_chunks: Flush once this many chunks are buffered (0 = no cap).
+        endpoint: Endpoint label for metrics.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = frames.__aiter__()
+    buffer: List[Frame] = []
+    deadline = 0.0
+    pending: Optional[asyncio.Future] = None
+
+    def flush() -> List[Frame]:
+        if len(buffer) == 1:
+            events = [buffer[0]]
+        else:
+            events = []
+            run: List[Tuple[Frame, Dict[str, Any]]] = []
+            for frame in buffer + [None]:
+                chunk = None if frame is None else _parse_frame(frame)
+                if chunk is not None:
+                    run.append((frame, chunk))
+                    continue
+                if len(run) == 1:
+                    events.append(run[0][0])
+                elif run:
+                    STREAM_CHUNKS_COALESCED.labels(endpoint).inc(len(run) - 1)
+                    events.append(sse_event(merge_chunks([chunk for _, chunk in run])))
+                run = []
+                if frame is not None:
+                    events.append(frame)
+        buffer.clear()
+        return events
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            timeout = max(0.0, deadline - loop.time()) if buffer else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                for event in flush():
+                    yield event
+                continue
+
+            task, pending = pending, None
+            try:
+                frame = task.result()
+            except StopAsyncIteration:
+                break
+
+            if not _maybe_mergeable(frame):
+                for event in flush():
+                    yield event
+                yield frame
+                continue
+
+            if not buffer:
+                deadline = loop.time() + flush_interval_s
+            buffer.append(frame)
+            if max_chunks and len(buffer) >= max_chunks:
+                for event in flush():
+                    yield event
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.wait({pending})
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    for event in flush() if buffer else ():
+        yield event
+
+
+async def measure_sse(frames: AsyncIterator[Frame], endpoint: str) -> AsyncIterator[bytes]:
+    """Encode frames to bytes and record events and bytes written per stream."""
+    events = 0
+    size = 0
+    try:
+        async for frame in frames:
+            if isinstance(frame, str):
+                frame = frame.encode("utf-8")
+            events += 1
+            size += len(frame)
+            yield frame
+    finally:
+        STREAM_EVENTS.labels(endpoint).observe(events)
+        STREAM_BYTES.labels(endpoint).observe(size)
+
+
+async def time_stream(frames: AsyncIterator[Frame], endpoint: str) -> AsyncIterator[Frame]:
+    """Record the time to the first frame (`ttft`) and between frames (`inter_token`).
+
+    The clock starts when the stream is first iterated, which is when the
+    engine request of a vLLM streaming generator is submitted.
+    """
+    observe_ttft = request_timer.observer(endpoint, "ttft")
+    observe_inter_token = request_timer.observer(endpoint, "inter_token")
+    last = time.perf_counter()
+    first = True
+    async for frame in frames:
+        now = time.perf_counter()
+        if first:
+            observe_ttft(now - last)
+            first = False
+        else:
+            observe_inter_token(now - last)
+        last = now
+        yield frame
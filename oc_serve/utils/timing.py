@@ -0,0 +1,62 @@
+"""Per-endpoint request stage timing."""
+import time
+from typing import Dict, Tuple
+
+from prometheus_client import Histogram
+
+REQUEST_STAGE_SECONDS = Histogram(
+    "oc_serve_request_stage_seconds",
+    "Time spent in each stage of a request, by endpoint and stage.",
+    ["endpoint", "stage"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+             0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+
+class _Stage:
+    """Context manager observing the time spent in its block."""
+    __slots__ = ("_observe", "_start")
+
+    def __init__(self, observe):
+        self._observe = observe
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._observe(time.perf_counter() - self._start)
+        return False
+
+
+class RequestTimer:
+    """
+    Records request stage durations in `oc_serve_request_stage_seconds`.
+
+    Stages used by OC-Serve are `parse`, `preprocess`, `admission`,
+    `template`, `tokenize`, `ttft`, `inter_token`, `serialize` and
+    `audio_decode`. Labelled histogram children are cached, so timing a
+    stage costs two `perf_counter` calls and one observation. The `with`
+    block may contain `await`s; it measures wall time, including time
+    other requests spent on the event loop.
+    """
+    def __init__(self):
+        self._observers: Dict[Tuple[str, str], object] = {}
+
+    def observer(self, endpoint: str, stage: str):
+        """Return the bound `observe(seconds)` of the `endpoint`/`stage` histogram."""
+        key = (endpoint, stage)
+        observe = self._observers.get(key)
+        if observe is None:
+            observe = self._observers[key] = REQUEST_STAGE_SECONDS.labels(endpoint, stage).observe
+        return observe
+
+    def observe(self, endpoint: str, stage: str, seconds: float) -> None:
+        self.observer(endpoint, stage)(seconds)
+
+    def stage(self, endpoint: str, stage: str) -> _Stage:
+        """Time the enclosed block as `stage` of an `endpoint` request."""
+        return _Stage(self.observer(endpoint, stage))
+
+
+request_timer = RequestTimer()
@@ -0,0 +1,35 @@
+"""Verification of prefetched artifacts by `oc_serve.utils.artifacts.ArtifactManager`."""
+import os
+
+import pytest
+
+from configs import ArtifactConfigs
+from oc_serve.utils.artifacts import ArtifactChecksumError, ArtifactManager
+
+
+def manager(tmp_path, **kwargs) -> ArtifactManager:
+    source = tmp_path / "source" / "org" / "model"
+    source.mkdir(parents=True)
+    (source / "config.json").write_text("{}")
+    (source / "weights.bin").write_bytes(b"\0" * 1024)
+    return ArtifactManager(ArtifactConfigs(enabled=True, source_dir=str(tmp_path / "source"),
+                                           cache_dir=str(tmp_path / "cache"), **kwargs))
+
+
+def test_prefetch_without_manifest_is_size_checked(tmp_path):
+    path = manager(tmp_path).resolve("org/model")
+    assert os.path.getsize(os.path.join(path, "weights.bin")) == 1024
+
+
+def test_prefetch_fails_without_required_manifest(tmp_path):
+    with pytest.raises(ArtifactChecksumError):
+        manager(tmp_path, require_manifest=True).resolve("org/model")
+
+
+def test_blob_size_mismatch_fails(tmp_path):
+    artifacts = manager(tmp_path)
+    os.makedirs(artifacts.tmp_dir)
+    os.makedirs(artifacts.blobs_dir)
+    with pytest.raises(ArtifactChecksumError):
+        artifacts._fetch_blob(str(tmp_path / "source" / "org" / "model" / "weights.bin"),
+                              2048, None)
@@ -0,0 +1,30 @@
+"""Stores of `oc_serve.api.idempotency`."""
+import asyncio
+import os
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from configs import IdempotencyConfigs
+from oc_serve.api.idempotency import DiskIdempotencyStore, StoredResponse
+
+
+def test_idempotency_is_disabled_by_default():
+    assert not IdempotencyConfigs().enabled
+
+
+def test_disk_stores_sharing_a_directory_share_its_bounds(tmp_path):
+    configs = IdempotencyConfigs(store="disk", disk_dir=str(tmp_path), max_entries=3)
+    replicas = [DiskIdempotencyStore(configs), DiskIdempotencyStore(configs)]
+    response = StoredResponse("fingerprint", 200, [], b"{}", time.time() + 60)
+
+    async def save_all():
+        for index in range(4):
+            await replicas[index % 2].save(f"key-{index}", response)
+            time.sleep(0.01)
+
+    asyncio.run(save_all())
+    assert sorted(os.listdir(tmp_path)) == ["key-1", "key-2", "key-3"]
+    assert asyncio.run(replicas[0].load("key-3")) == response
@@ -0,0 +1,35 @@
+"""Import-time dependencies of OC-Serve entry points.
+
+Each check imports a module in a fresh interpreter, so modules loaded by
+other tests do not leak into the result.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def loaded_packages(module: str) -> set:
+    """Top-level packages in `sys.modules` after importing `module`."""
+    code = (f"import sys, {module}\n"
+            "print(' '.join(sorted({name.split('.')[0] for name in sys.modules})))")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(
+        filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def test_ray_orchestrator_does_not_import_vllm():
+    pytest.importorskip("ray.serve")
+    assert "vllm" not in loaded_packages("oc_serve.orchestrators.ray")
+
+
+def test_simulated_server_does_not_import_vllm():
+    pytest.importorskip("fastapi")
+    loaded = loaded_packages("oc_serve.orchestrators.local, oc_serve.servers.sim.Sim")
+    assert "vllm" not in loaded
@@ -0,0 +1,48 @@
+"""Request sampling of `oc_serve.utils.profiler.Profiler`."""
+import asyncio
+import time
+
+import pytest
+
+from configs import ProfilerConfigs
+from oc_serve.utils.profiler import Profiler
+
+StreamingResponse = pytest.importorskip("starlette.responses").StreamingResponse
+
+
+def busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def stream_chunks():
+    for _ in range(5):
+        busy(0.02)
+        yield "data: {}\n\n"
+
+
+def test_streamed_request_is_sampled_until_body_is_sent():
+    profiler = Profiler(ProfilerConfigs(request_sample_every=1, sample_interval_ms=1))
+
+    async def handler():
+        return StreamingResponse(stream_chunks(), media_type="text/event-stream")
+
+    async def serve():
+        response = await profiler.profile_request(handler)
+        assert profiler._active_requests == 1
+        return [chunk async for chunk in response.body_iterator]
+
+    assert len(asyncio.run(serve())) == 5
+    assert profiler._active_requests == 0
+    assert any("stream_chunks" in stack for stack in profiler.request_stacks)
+
+
+def test_unsent_streamed_response_stops_sampling():
+    profiler = Profiler(ProfilerConfigs(request_sample_every=1))
+
+    async def handler():
+        return StreamingResponse(stream_chunks())
+
+    asyncio.run(profiler.profile_request(handler))
+    assert profiler._active_requests == 0